@@ -0,0 +1,65 @@
+"""Show that grouping report entries into days stays linear in the number of entries.
+
+    pipenv run python benchmarks/bench_group_days.py
+
+A small run is also timed with tracing on (``--trace``), which is what the per entry
+pretty printing of the day map used to cost on every download.
+"""
+# Standard Library
+import logging
+import timeit
+from datetime import datetime, timedelta, timezone
+
+from toggl2harvest.models import TogglReportEntry
+from toggl2harvest.toggl import iter_days
+from toggl2harvest.utils import TRACE
+
+
+SIZES = (25000, 50000, 100000)
+DAYS = 10
+KEYS_PER_DAY = 500
+TRACED_SIZE = 500
+
+
+def make_report_entries(count):
+    start = datetime(2019, 1, 1, 9, tzinfo=timezone(timedelta(hours=-7)))
+    per_day = count // DAYS
+    return [
+        TogglReportEntry(
+            client='Client',
+            project='Project',
+            task='Development',
+            description=f'PROJ-{i % KEYS_PER_DAY} Working on things',
+            is_billable=True,
+            start=start + timedelta(days=i // per_day, seconds=i % per_day),
+            end=start + timedelta(days=i // per_day, seconds=i % per_day + 30),
+        )
+        for i in range(count)
+    ]
+
+
+def group(report_entries):
+    for _ in iter_days(report_entries):
+        pass
+
+
+def time_grouping(report_entries, number=3):
+    return min(timeit.repeat(lambda: group(report_entries), number=1, repeat=number))
+
+
+def main():
+    logging.basicConfig(level=logging.WARNING)
+    print(f'{"entries":>8} {"seconds":>8} {"us/entry":>9}')
+    for size in SIZES:
+        seconds = time_grouping(make_report_entries(size))
+        print(f'{size:>8} {seconds:>8.3f} {seconds / size * 1e6:>9.2f}')
+
+    # The old eager dump, only paid now when tracing
+    logging.getLogger('toggl2harvest.toggl').setLevel(TRACE)
+    logging.getLogger().handlers[0].setLevel(logging.WARNING)
+    seconds = time_grouping(make_report_entries(TRACED_SIZE), number=1)
+    print(f'{TRACED_SIZE:>8} {seconds:>8.3f} {seconds / TRACED_SIZE * 1e6:>9.2f}  (tracing)')
+
+
+if __name__ == '__main__':
+    main()
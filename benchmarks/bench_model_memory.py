@@ -0,0 +1,131 @@
+"""Compare memory per loaded time log for __dict__ models and the slotted ones.
+
+    pipenv run python benchmarks/bench_model_memory.py
+
+The __dict__ classes here mirror the models before they used __slots__, TimeLog was a
+dict subclass with attribute access.
+"""
+# Standard Library
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from toggl2harvest import models
+from toggl2harvest.schemas import TimeLogSchema
+
+
+TIME_LOGS = 50000
+ENTRIES_PER_LOG = 3
+
+
+class objdict(dict):
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        self[name] = value
+
+
+class DictTimeEntry:
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+
+
+class DictTogglData:
+    def __init__(self, client=None, project=None, task=None, is_billable=None, description=None):
+        self.client = client
+        self.project = project
+        self.task = task
+        self.is_billable = is_billable
+        self.description = description
+
+
+class DictHarvestData:
+    def __init__(self, project_id=None, task_name=None, task_id=None, uploaded=None, time_entry_id=None):
+        self.project_id = project_id
+        self.task_name = task_name
+        self.task_id = task_id
+        self.uploaded = uploaded
+        self.time_entry_id = time_entry_id
+
+
+class DictTimeLog(objdict):
+    def __init__(self, project_code, description, is_billable, time_entries, toggl=None, harvest=None):
+        self.project_code = project_code
+        self.description = description
+        self.is_billable = is_billable
+        self.time_entries = time_entries
+        self.toggl = toggl or DictTogglData()
+        self.harvest = harvest or DictHarvestData()
+
+
+DICT_MODELS = (DictTimeLog, DictTimeEntry, DictTogglData, DictHarvestData)
+SLOTTED_MODELS = (models.TimeLog, models.TimeEntry, models.TogglData, models.HarvestData)
+
+
+def make_documents():
+    start = datetime(2019, 1, 1, 9, tzinfo=timezone(timedelta(hours=-7)))
+    return [
+        {
+            'project_code': None,
+            'description': f'PROJ-{i % 500} Working on things',
+            'is_billable': True,
+            'time_entries': [
+                {'s': str(start + timedelta(minutes=10 * j)), 'e': str(start + timedelta(minutes=10 * j + 5))}
+                for j in range(ENTRIES_PER_LOG)
+            ],
+            'toggl': {'client': 'Client', 'project': 'Project', 'task': 'Development', 'is_billable': True},
+            'harvest': {'project_id': 123, 'task_name': None, 'task_id': 5, 'uploaded': None},
+        }
+        for i in range(TIME_LOGS)
+    ]
+
+
+def build(loaded, time_log_cls, time_entry_cls, toggl_cls, harvest_cls):
+    return [
+        time_log_cls(
+            project_code=time_log.project_code,
+            description=time_log.description,
+            is_billable=time_log.is_billable,
+            time_entries=[time_entry_cls(entry.start, entry.end) for entry in time_log.time_entries],
+            toggl=toggl_cls(
+                client=time_log.toggl.client,
+                project=time_log.toggl.project,
+                task=time_log.toggl.task,
+                is_billable=time_log.toggl.is_billable,
+            ),
+            harvest=harvest_cls(
+                project_id=time_log.harvest.project_id,
+                task_name=time_log.harvest.task_name,
+                task_id=time_log.harvest.task_id,
+                uploaded=time_log.harvest.uploaded,
+            ),
+        )
+        for time_log in loaded
+    ]
+
+
+def measure(loaded, classes):
+    # Field values are shared with the loaded logs, only the model objects are counted
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    time_logs = build(loaded, *classes)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del time_logs
+    return used
+
+
+def main():
+    loaded = TimeLogSchema(many=True).load(make_documents())
+    print(f'{TIME_LOGS} time logs, {ENTRIES_PER_LOG} time entries each')
+    for name, classes in [('__dict__', DICT_MODELS), ('__slots__', SLOTTED_MODELS)]:
+        used = measure(loaded, classes)
+        print(f'{name:>10} {used / 2 ** 20:>8.1f} MiB {used / TIME_LOGS:>8.0f} bytes/log')
+
+
+if __name__ == '__main__':
+    main()
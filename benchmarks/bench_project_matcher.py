@@ -0,0 +1,54 @@
+"""Compare the project code matcher against the regex it replaced.
+
+    pipenv run python benchmarks/bench_project_matcher.py
+"""
+# Standard Library
+import random
+import re
+import string
+import timeit
+
+from toggl2harvest.matcher import ProjectCodeMatcher
+
+
+def make_codes(count, rng):
+    codes = set()
+    while len(codes) < count:
+        codes.add(''.join(rng.choice(string.ascii_uppercase) for _ in range(rng.randint(3, 6))))
+    return list(codes)
+
+
+def make_descriptions(codes, count, rng):
+    words = ['fix', 'meeting', 'review', 'deploy', 'planning', 'bug', 'call']
+    descriptions = []
+    for _ in range(count):
+        text = ' '.join(rng.choice(words) for _ in range(rng.randint(2, 8)))
+        if rng.random() < 0.8:
+            text = f'{rng.choice(codes)}-{rng.randint(1, 999)} {text}'
+        descriptions.append(text)
+    return descriptions
+
+
+def main():
+    rng = random.Random(0)
+    print(f'{"codes":>6} {"regex build":>12} {"ac build":>10} {"regex match":>12} {"ac match":>10}')
+    for count in (10, 1000, 10000):
+        codes = make_codes(count, rng)
+        descriptions = make_descriptions(codes, 2000, rng)
+
+        regex_build = timeit.timeit(
+            lambda: re.compile(f'({"|".join(codes)})(-[0-9]+)?'), number=1)
+        ac_build = timeit.timeit(lambda: ProjectCodeMatcher(codes), number=1)
+
+        project_re = re.compile(f'({"|".join(codes)})(-[0-9]+)?')
+        matcher = ProjectCodeMatcher(codes)
+        regex_match = timeit.timeit(
+            lambda: [project_re.search(d) for d in descriptions], number=1)
+        ac_match = timeit.timeit(
+            lambda: [matcher.search(d) for d in descriptions], number=1)
+
+        print(f'{count:>6} {regex_build:>11.4f}s {ac_build:>9.4f}s {regex_match:>11.4f}s {ac_match:>9.4f}s')
+
+
+if __name__ == '__main__':
+    main()
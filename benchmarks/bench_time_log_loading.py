@@ -0,0 +1,48 @@
+"""Compare TimeLogSchema and FastTimeLogSchema loading a year of day file documents.
+
+    pipenv run python benchmarks/bench_time_log_loading.py
+"""
+# Standard Library
+import timeit
+from datetime import date, timedelta
+
+from toggl2harvest.schemas import FastTimeLogSchema, TimeLogSchema
+
+
+DAYS = 365
+DAY_ENTRIES = 12
+TIME_ENTRIES = 3
+
+
+def make_documents():
+    documents = []
+    day = date(2019, 1, 1)
+    for _ in range(DAYS):
+        documents.extend(
+            {
+                'project_code': None,
+                'description': f'PROJ-{i} Working on things',
+                'is_billable': True,
+                'time_entries': [
+                    {'s': f'{day}T{9 + j:02}:00:00-07:00', 'e': f'{day}T{9 + j:02}:30:00-07:00'}
+                    for j in range(TIME_ENTRIES)
+                ],
+                'toggl': {'client': 'Client', 'project': 'Project', 'task': 'Development', 'is_billable': True},
+                'harvest': {'project_id': 123, 'task_name': None, 'task_id': 5, 'uploaded': None},
+            }
+            for i in range(DAY_ENTRIES)
+        )
+        day += timedelta(days=1)
+    return documents
+
+
+def main():
+    documents = make_documents()
+    print(f'{len(documents)} documents, {TIME_ENTRIES} time entries each')
+    for schema in [TimeLogSchema(), FastTimeLogSchema()]:
+        seconds = min(timeit.repeat(lambda: [schema.load(data) for data in documents], number=1, repeat=3))
+        print(f'{type(schema).__name__:>18} {seconds:>7.3f}s {len(documents) / seconds:>9.0f} documents/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Compare summing time logs entry by entry with the columnar TimeEntries.
+
+    pipenv run python benchmarks/bench_total_time.py
+
+The columns are filled once when a day is loaded, ``build`` is that cost.
+"""
+# Standard Library
+import timeit
+from datetime import datetime, timedelta, timezone
+
+from toggl2harvest.models import TimeEntries, TimeEntry
+
+
+TIME_LOGS = 2000
+ENTRIES_PER_LOG = (1, 10, 100)
+
+
+def make_time_entries(count):
+    start = datetime(2019, 1, 1, 9, tzinfo=timezone(timedelta(hours=-7)))
+    return [
+        TimeEntry(start + timedelta(minutes=2 * i), start + timedelta(minutes=2 * i + 1))
+        for i in range(count)
+    ]
+
+
+def loop_total_time(time_entries):
+    # TimeLog.total_time before the columns
+    total_time = timedelta()
+    for entry in time_entries:
+        assert entry.start < entry.end
+        total_time += entry.end - entry.start
+    return total_time
+
+
+def columns_total_time(time_entries):
+    assert time_entries.in_order()
+    return time_entries.total_time()
+
+
+def main():
+    print(f'{TIME_LOGS} time logs')
+    print(f'{"entries":>8} {"loop":>8} {"columns":>8} {"build":>8}')
+    for count in ENTRIES_PER_LOG:
+        lists = [make_time_entries(count) for _ in range(TIME_LOGS)]
+        columns = [TimeEntries(time_entries) for time_entries in lists]
+        assert list(map(loop_total_time, lists)) == list(map(columns_total_time, columns))
+
+        loop = min(timeit.repeat(lambda: list(map(loop_total_time, lists)), number=1, repeat=5))
+        vectorized = min(timeit.repeat(lambda: list(map(columns_total_time, columns)), number=1, repeat=5))
+        build = min(timeit.repeat(lambda: list(map(TimeEntries, lists)), number=1, repeat=5))
+        print(f'{count:>8} {loop:>8.4f} {vectorized:>8.4f} {build:>8.4f}')
+
+
+if __name__ == '__main__':
+    main()
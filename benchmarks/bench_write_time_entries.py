@@ -0,0 +1,55 @@
+"""Compare the day file emitter against dumping TimeLogSchema output through ruamel.
+
+    pipenv run python benchmarks/bench_write_time_entries.py
+"""
+# Standard Library
+import io
+import timeit
+from datetime import datetime, timedelta, timezone
+
+# Third Party Packages
+from ruamel.yaml import YAML
+
+from toggl2harvest.emitter import dump_time_logs
+from toggl2harvest.models import TimeEntry, TimeLog, TogglData
+from toggl2harvest.schemas import TimeLogSchema
+
+
+LOGS = 5000
+
+
+def make_time_logs():
+    start = datetime(2019, 1, 1, 9, tzinfo=timezone(timedelta(hours=-7)))
+    return [
+        TimeLog(
+            project_code=None,
+            description=f'PROJ-{i} Working on things',
+            is_billable=True,
+            time_entries=[TimeEntry(start, start + timedelta(minutes=30)) for _ in range(3)],
+            toggl=TogglData(client='Client', project='Project', task='Development', is_billable=True),
+        )
+        for i in range(LOGS)
+    ]
+
+
+def ruamel_dump(time_logs):
+    schema = TimeLogSchema()
+    output = io.StringIO()
+    with YAML(output=output) as yaml:
+        for time_log in time_logs:
+            yaml.dump(schema.dump(time_log))
+    return output.getvalue()
+
+
+def main():
+    time_logs = make_time_logs()
+    ruamel = timeit.timeit(lambda: ruamel_dump(time_logs), number=1)
+    emitter = timeit.timeit(lambda: dump_time_logs(time_logs), number=1)
+
+    print(f'{LOGS} time logs')
+    print(f'schema + ruamel: {ruamel:.3f}s')
+    print(f'emitter:         {emitter:.3f}s ({ruamel / emitter:.0f}x)')
+
+
+if __name__ == '__main__':
+    main()
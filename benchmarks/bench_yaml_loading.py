@@ -0,0 +1,61 @@
+"""Compare round trip and libyaml backed loading over a year of day files.
+
+    pipenv run python benchmarks/bench_yaml_loading.py
+"""
+# Standard Library
+import tempfile
+import timeit
+from datetime import date, timedelta
+from pathlib import Path
+
+# Third Party Packages
+from ruamel.yaml import YAML
+
+from toggl2harvest.utils import fast_yaml
+
+
+DAY_ENTRIES = 12
+
+
+def write_year(data_dir):
+    yaml = YAML()
+    day = date(2019, 1, 1)
+    for _ in range(365):
+        documents = [
+            {
+                'project_code': None,
+                'description': f'PROJ-{i} Working on things',
+                'is_billable': True,
+                'time_entries': [
+                    {'s': f'{day}T{9 + i % 8:02}:00:00-07:00', 'e': f'{day}T{9 + i % 8:02}:30:00-07:00'},
+                ],
+                'toggl': {'client': 'Client', 'project': 'Project', 'task': 'Development', 'is_billable': True},
+                'harvest': {'project_id': 123, 'task_name': None, 'task_id': 5, 'uploaded': None},
+            }
+            for i in range(DAY_ENTRIES)
+        ]
+        yaml.dump_all(documents, Path(data_dir, f'{day}.yml'))
+        day += timedelta(days=1)
+
+
+def load_all(make_yaml, files):
+    for day_file in files:
+        with make_yaml() as yaml:
+            list(yaml.load_all(day_file))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_year(data_dir)
+        files = sorted(Path(data_dir).iterdir())
+
+        round_trip = timeit.timeit(lambda: load_all(YAML, files), number=1)
+        fast = timeit.timeit(lambda: load_all(fast_yaml, files), number=1)
+
+    print(f'{len(files)} day files, {DAY_ENTRIES} entries each')
+    print(f'round trip: {round_trip:.3f}s')
+    print(f'libyaml:    {fast:.3f}s ({round_trip / fast:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,20 +1,25 @@
 # Standard Library
 import os
 from datetime import datetime as dt
+from datetime import timedelta as td
+from datetime import timezone as tz
 from inspect import cleandoc as trim_multiline
 from pathlib import Path
 
 # Third Party Packages
 import pytest
 
-from toggl2harvest.app import TogglHarvestApp
+from toggl2harvest.app import TogglHarvestApp, _init_validation_worker, _validate_day_in_worker
 from toggl2harvest.exceptions import (
+    InvalidFileError,
     InvalidHarvestProject,
     InvalidHarvestTask,
+    MissingHarvestCacheError,
     MissingHarvestProject,
     MissingHarvestTask,
 )
-from toggl2harvest.models import HarvestCache, ProjectMapping, TimeLog
+from toggl2harvest.models import HarvestCache, ProjectMapping, TimeLog, TogglReportEntry
+from toggl2harvest.sqlite_cache import SqliteHarvestCache
 
 
 @pytest.fixture
@@ -147,6 +152,125 @@ class TestProjectMapping:
 
         assert isinstance(app.project_mapping, ProjectMapping)
 
+    mapping_contents = trim_multiline("""
+    TEST:
+      harvest:
+        project: 123
+        default_task: Development
+    """) + '\n'
+
+    def test_uses_compiled_snapshot(self, mocker, app):
+        with open(app.project_file, 'w') as f:
+            f.write(self.mapping_contents)
+        TogglHarvestApp().project_mapping
+        assert app._project_mapping_snapshot_file.is_file()
+
+        init_mock = mocker.patch.object(ProjectMapping, '__init__')
+        project_mapping = TogglHarvestApp().project_mapping
+
+        assert init_mock.call_count == 0
+        assert project_mapping.harvest_project('TEST') == 123
+        assert project_mapping.project_in_description('TEST-12 work') == 'TEST'
+
+    def test_changed_mapping_rebuilds(self, app):
+        with open(app.project_file, 'w') as f:
+            f.write(self.mapping_contents)
+        TogglHarvestApp().project_mapping
+
+        with open(app.project_file, 'w') as f:
+            f.write(self.mapping_contents.replace('TEST', 'OTHER'))
+        project_mapping = TogglHarvestApp().project_mapping
+
+        assert project_mapping.harvest_project('TEST') is None
+        assert project_mapping.project_in_description('OTHER-12 work') == 'OTHER'
+
+
+class TestHarvestCache:
+    cache_contents = trim_multiline("""
+    id: 123
+    name: Test project
+    active: true
+    client:
+      id: 5
+      name: Client
+    tasks:
+      15:
+        name: Development
+    """) + '\n'
+
+    def test_loads_and_snapshots_yaml(self, mocker, app):
+        with open(app._harvest_cache_file, 'w') as f:
+            f.write(self.cache_contents)
+
+        assert app.harvest_cache.get_task_id(123, 'Development') == 15
+        assert app._harvest_cache_snapshot_file.is_file()
+
+    def test_uses_snapshot_without_validating(self, mocker, app):
+        with open(app._harvest_cache_file, 'w') as f:
+            f.write(self.cache_contents)
+        TogglHarvestApp().harvest_cache
+
+        schema_mock = mocker.patch('toggl2harvest.schemas.HarvestCacheEntrySchema')
+        harvest_cache = TogglHarvestApp().harvest_cache
+
+        assert schema_mock.call_count == 0
+        assert harvest_cache.get_task_id(123, 'Development') == 15
+        assert harvest_cache.task_in_project(123, 15)
+
+    def test_changed_yaml_rebuilds(self, mocker, app):
+        with open(app._harvest_cache_file, 'w') as f:
+            f.write(self.cache_contents)
+        TogglHarvestApp().harvest_cache
+
+        with open(app._harvest_cache_file, 'w') as f:
+            f.write(self.cache_contents.replace('Development', 'Design'))
+        harvest_cache = TogglHarvestApp().harvest_cache
+
+        assert harvest_cache.get_task_id(123, 'Design') == 15
+
+
+class TestSqliteHarvestCache:
+    @pytest.fixture
+    def app(self, credentials_file):
+        return TogglHarvestApp(harvest_cache_backend='sqlite')
+
+    def test_populated_by_cache_harvest_projects(self, mocker, app):
+        mock_api = mocker.PropertyMock()
+        app.harvest_api = mock_api
+        mock_api.cache_projects_via_api.return_value = [
+            {'id': 123, 'name': 'Test project', 'tasks': {15: {'name': 'Development'}}},
+        ]
+
+        app.cache_harvest_projects()
+
+        assert TogglHarvestApp(harvest_cache_backend='sqlite').harvest_cache.get_task_id(123, 'Development') == 15
+
+    def test_filled_from_existing_yaml(self, app):
+        with open(app._harvest_cache_file, 'w') as f:
+            f.write(TestHarvestCache.cache_contents)
+
+        assert app.harvest_cache.get_task_id(123, 'Development') == 15
+
+    def test_refilled_when_yaml_changes(self, app, mocker):
+        with open(app._harvest_cache_file, 'w') as f:
+            f.write(TestHarvestCache.cache_contents)
+        TogglHarvestApp(harvest_cache_backend='sqlite').harvest_cache
+        populate = mocker.spy(SqliteHarvestCache, 'populate')
+
+        TogglHarvestApp(harvest_cache_backend='sqlite').harvest_cache
+        assert populate.call_count == 0
+
+        with open(app._harvest_cache_file, 'w') as f:
+            f.write(TestHarvestCache.cache_contents.replace('Development', 'Design'))
+        harvest_cache = TogglHarvestApp(harvest_cache_backend='sqlite').harvest_cache
+
+        assert populate.call_count == 1
+        assert harvest_cache.get_task_id(123, 'Design') == 15
+
+    def test_never_filled(self, app):
+        with pytest.raises(MissingHarvestCacheError):
+            app.harvest_cache
+
 
 class TestCacheHarvestProjects:
     def test_calls_correct_function(self, mocker, app):
@@ -177,6 +301,28 @@ class TestCacheHarvestProjects:
 
         mock_api.cache_projects_via_api.assert_called_with()
 
+    def test_refreshes_incrementally(self, mocker, app):
+        mock_api = mocker.PropertyMock()
+        app.harvest_api = mock_api
+        mock_api.cache_projects_via_api.return_value = [{'id': 123, 'name': 'Test project', 'tasks': {}}]
+
+        app.cache_harvest_projects()
+        app.cache_harvest_projects()
+
+        _, kwargs = mock_api.cache_projects_via_api.call_args
+        assert kwargs['updated_since'].endswith('Z')
+        assert kwargs['cached_projects'] == [{'id': 123, 'name': 'Test project', 'tasks': {}}]
+
+    def test_full_rebuild(self, mocker, app):
+        mock_api = mocker.PropertyMock()
+        app.harvest_api = mock_api
+        mock_api.cache_projects_via_api.return_value = []
+
+        app.cache_harvest_projects()
+        app.cache_harvest_projects(full=True)
+
+        mock_api.cache_projects_via_api.assert_called_with()
+
 
 class TestDownloadTogglData:
     def test_calls_correct_function(self, mocker, app):
@@ -186,13 +332,13 @@ class TestDownloadTogglData:
         app.data_dir = mock_data_dir
         mock_api = mocker.PropertyMock()
         mock_api.toggl_download_params.return_value = {'fake': 'params'}
-        mock_api.retrieve_time_entries.return_value = [{'entry': 1}, {'entry': 2}]
+        mock_api.iter_time_entries.return_value = iter([{'entry': 1}, {'entry': 2}])
         app.toggl_api = mock_api
 
         app.download_toggl_data(dt(2019, 1, 1), dt(2019, 1, 1))
 
         mock_api.toggl_download_params.assert_called_with(mock_cred_file)
-        mock_api.retrieve_time_entries.assert_called_with(
+        mock_api.iter_time_entries.assert_called_with(
             dt(2019, 1, 1),
             dt(2019, 1, 1),
             params={'fake': 'params'},
@@ -241,6 +387,14 @@ class TestWriteTimeEntries:
             data_file = Path(tmpdir / 'data' / f'{day:%Y-%m-%d}.yml')
             assert data_file.is_file()
 
+    @pytest.mark.parametrize('time_entries', potential_time_entries)
+    def test_writes_day_pairs(self, app, tmpdir, time_entries):
+        results = list(app.write_time_entries(iter(time_entries.items())))
+
+        assert [result.day for result in results] == list(time_entries)
+        for day in time_entries.keys():
+            assert Path(tmpdir / 'data' / f'{day:%Y-%m-%d}.yml').is_file()
+
     @pytest.mark.parametrize('time_entries', potential_time_entries)
     def test_does_not_overwrite_file(self, app, tmpdir, time_entries):
         jan_1 = Path(tmpdir / 'data' / '2019-01-01.yml')
@@ -265,6 +419,91 @@ class TestWriteTimeEntries:
 
         assert file_contents == 'Valuable Garbage'
 
+    def make_time_log(self, description, *hours):
+        mst = tz(td(hours=-7))
+        time_log = None
+        for hour in hours:
+            entry = TogglReportEntry(
+                client='Client', project='Project', task=None, description=description, is_billable=True,
+                start=dt(2019, 1, 1, hour, tzinfo=mst), end=dt(2019, 1, 1, hour, 30, tzinfo=mst))
+            if time_log is None:
+                time_log = TimeLog.build_from_toggl_entry(entry)
+            else:
+                time_log.add_to_time_entries(entry)
+        return time_log
+
+    def test_merge_adds_new_entries(self, app):
+        list(app.write_time_entries({dt(2019, 1, 1): [self.make_time_log('First', 9)]}))
+        day_file = app.data_file('2019-01-01')
+        # User edits survive the merge
+        with open(day_file, 'r') as f:
+            contents = f.read().replace('  project_id:\n', '  project_id: 123  # Mine\n')
+        with open(day_file, 'w') as f:
+            f.write(contents)
+
+        results = list(app.write_time_entries({
+            dt(2019, 1, 1): [self.make_time_log('First', 9, 10), self.make_time_log('Second', 11)],
+        }, merge=True))
+
+        assert [result.written for result in results] == [True]
+        documents = app.day_store.read_day('2019-01-01')
+        assert [data['description'] for data in documents] == ['First', 'Second']
+        assert [entry['s'] for entry in documents[0]['time_entries']] == [
+            '2019-01-01T09:00:00-07:00', '2019-01-01T10:00:00-07:00']
+        assert [entry['s'] for entry in documents[1]['time_entries']] == ['2019-01-01T11:00:00-07:00']
+        with open(day_file, 'r') as f:
+            assert 'project_id: 123  # Mine' in f.read()
+
+    def test_merge_keeps_uploaded_logs_closed(self, app):
+        list(app.write_time_entries({dt(2019, 1, 1): [self.make_time_log('First', 9)]}))
+        with app.day_store.update_day('2019-01-01') as documents:
+            documents[0]['harvest']['uploaded'] = '2019-01-01T17:00:00+00:00'
+
+        results = list(app.write_time_entries({
+            dt(2019, 1, 1): [self.make_time_log('First', 9, 10, 11)],
+        }, merge=True))
+
+        assert [result.written for result in results] == [True]
+        documents = app.day_store.read_day('2019-01-01')
+        assert [data['description'] for data in documents] == ['First', 'First']
+        assert [entry['s'] for entry in documents[0]['time_entries']] == ['2019-01-01T09:00:00-07:00']
+        assert [entry['s'] for entry in documents[1]['time_entries']] == [
+            '2019-01-01T10:00:00-07:00', '2019-01-01T11:00:00-07:00']
+        assert documents[1]['harvest']['uploaded'] is None
+
+    def test_merge_without_new_entries_leaves_day(self, app, mocker):
+        list(app.write_time_entries({dt(2019, 1, 1): [self.make_time_log('First', 9, 10)]}))
+        rename_mock = mocker.patch('toggl2harvest.utils.os.rename')
+
+        results = list(app.write_time_entries({
+            dt(2019, 1, 1): [self.make_time_log('First', 10)],
+        }, merge=True))
+
+        assert [result.written for result in results] == [False]
+        assert rename_mock.call_count == 0
+
+    def test_merge_into_sqlite_day_store(self, app):
+        app.day_store_backend = 'sqlite'
+        list(app.write_time_entries({dt(2019, 1, 1): [self.make_time_log('First', 9)]}))
+
+        list(app.write_time_entries({
+            dt(2019, 1, 1): [self.make_time_log('First', 9, 10), self.make_time_log('Second', 11)],
+        }, merge=True))
+
+        documents = app.day_store.read_day('2019-01-01')
+        assert [len(data['time_entries']) for data in documents] == [2, 1]
+
+    def test_merge_skips_unparseable_day(self, app):
+        day_file = app.data_file('2019-01-01')
+        with open(day_file, 'w') as f:
+            f.write('Valuable Garbage\n')
+
+        results = list(app.write_time_entries({dt(2019, 1, 1): [self.make_time_log('First', 9)]}, merge=True))
+
+        assert [result.written for result in results] == [False]
+        with open(day_file, 'r') as f:
+            assert f.read() == 'Valuable Garbage\n'
+
 
 class TestValidateFile:
     @pytest.fixture
@@ -396,6 +635,50 @@ class TestValidateFile:
 
         assert file_contents == contents
 
+    def test_unchanged_file_is_not_rewritten(self, app, mocker):
+        test_file = app.data_file('2019-01-01')
+        with open(test_file, 'w') as f:
+            f.write(trim_multiline(
+                """
+                project_code:
+                description:
+                is_billable: true
+                time_entries:
+                harvest:
+                  project_id: 123
+                  task_id: 5
+                """
+            ))
+        afu_mock = mocker.patch('toggl2harvest.day_store.AtomicFileUpdate')
+
+        errors = app.validate_file(test_file)
+
+        assert errors == 0
+        assert afu_mock.call_count == 0
+
+    def test_resolved_ids_are_written_back(self, app):
+        test_file = app.data_file('2019-01-01')
+        with open(test_file, 'w') as f:
+            f.write(trim_multiline(
+                """
+                project_code:
+                description:
+                is_billable: true
+                time_entries:
+                harvest:
+                  project_id: 123  # Comment
+                  task_name: Development
+                """
+            ) + '\n')
+
+        errors = app.validate_file(test_file)
+
+        assert errors == 0
+        with open(test_file, 'r') as f:
+            file_contents = f.read()
+        assert 'task_id: 5' in file_contents
+        assert '# Comment' in file_contents
+
 
 class TestUpdateEntryErrors:
     @pytest.fixture
@@ -418,6 +701,447 @@ class TestUpdateEntryErrors:
 
         data, valid = app._update_entry(3, data_mock, tl_mock)
 
-        uht_mock.assert_called_with(app.project_mapping, app.harvest_cache)
+        uht_mock.assert_called_with(app.project_mapping, app.harvest_cache, resolver=app.harvest_resolver)
         assert data == data_mock
         assert valid is False
+
+
+upload_day_contents = trim_multiline(
+    """
+    project_code:
+    description: First
+    is_billable: true
+    time_entries:
+    - s: '2019-01-01T12:00:00-07:00'
+      e: '2019-01-01T13:00:00-07:00'
+    harvest:
+      project_id: 123
+      task_id: 5  # Comment
+    ---
+    project_code:
+    description: Not billable
+    is_billable: false
+    time_entries:
+    harvest:
+      project_id: 123
+      task_id: 5
+    ---
+    project_code:
+    description: Invalid
+    is_billable: true
+    time_entries:
+    harvest:
+      project_id: 999
+    """
+) + '\n'
+
+
+unresolved_day_contents = trim_multiline(
+    """
+    project_code: ABC
+    description: First
+    is_billable: true
+    time_entries:
+    - s: '2019-01-01T12:00:00-07:00'
+      e: '2019-01-01T13:00:00-07:00'
+    harvest:
+      project_id:
+      task_id:
+    """
+) + '\n'
+
+
+@pytest.fixture
+def make_upload_app(credentials_file, tmpdir, mocker):
+    """Builds apps with an empty project mapping, a single cached Harvest project and a mocked Harvest API."""
+    def make_upload_app(**kwargs):
+        app = TogglHarvestApp(config_dir=str(tmpdir), **kwargs)
+        os.mkdir(app.data_dir)
+
+        app.project_mapping = ProjectMapping({})
+        app.harvest_cache = HarvestCache([
+            {
+                'id': 123,
+                'name': 'Test Project',
+                'client': {
+                    'id': 5000,
+                    'name': 'Test Client',
+                },
+                'tasks': {
+                    5: {'name': 'Development'},
+                },
+            },
+        ])
+        app.harvest_api = mocker.MagicMock()
+        app.harvest_api.create_time_entry.return_value = {'id': 4242}
+        return app
+    return make_upload_app
+
+
+class TestUploadToHarvest:
+    @pytest.fixture
+    def app(self, make_upload_app):
+        return make_upload_app()
+
+    def write_day(self, app, day, contents=upload_day_contents):
+        with open(app.data_file(day), 'w') as f:
+            f.write(contents)
+
+    def test_missing_file(self, app):
+        assert app.upload_to_harvest('2019-01-01') == []
+
+    def test_uploads_billable_entries(self, app):
+        self.write_day(app, '2019-01-01')
+
+        results = app.upload_to_harvest('2019-01-01')
+
+        assert results == ['Uploaded', 'Not billable, skipping.', 'Entry invalid, skipping']
+        assert app.harvest_api.create_time_entry.call_count == 1
+
+        with open(app.data_file('2019-01-01'), 'r') as f:
+            file_contents = f.read()
+        assert 'task_id: 5  # Comment' in file_contents
+        documents = file_contents.split('---')
+        assert 'uploaded:' in documents[0]
+        assert 'time_entry_id: 4242' in documents[0]
+        assert 'uploaded:' not in documents[1]
+        # The stamp is written, so the journal doesn't need the record anymore
+        assert app.upload_journal.records() == []
+
+    def test_upload_days_empties_journal(self, app):
+        self.write_day(app, '2019-01-01')
+        self.write_day(app, '2019-01-02')
+
+        list(app.upload_days_to_harvest(['2019-01-01', '2019-01-02'], jobs=2))
+
+        assert app.harvest_api.create_time_entry.call_count == 2
+        assert app.upload_journal.records() == []
+
+    def test_replay_drops_records_of_stamped_entries(self, app, mocker):
+        self.write_day(app, '2019-01-01')
+        mocker.patch.object(app, '_forget_uploads')
+        app.upload_to_harvest('2019-01-01')
+        assert len(app.upload_journal.records()) == 1
+
+        app.replay_upload_journal()
+
+        assert app.upload_journal.records() == []
+
+    def test_does_not_upload_twice(self, app):
+        self.write_day(app, '2019-01-01')
+
+        app.upload_to_harvest('2019-01-01')
+        results = app.upload_to_harvest('2019-01-01')
+
+        assert results[0] == 'Already uploaded, skipping.'
+        assert app.harvest_api.create_time_entry.call_count == 1
+
+    def test_uploaded_day_is_not_rewritten(self, app, mocker):
+        self.write_day(app, '2019-01-01')
+        app.upload_to_harvest('2019-01-01')
+        afu_mock = mocker.patch('toggl2harvest.day_store.AtomicFileUpdate')
+
+        results = app.upload_to_harvest('2019-01-01')
+
+        assert results == ['Already uploaded, skipping.', 'Not billable, skipping.', 'Entry invalid, skipping']
+        assert afu_mock.call_count == 0
+
+    def test_unparseable_file_uploads_nothing(self, app):
+        self.write_day(app, '2019-01-01', upload_day_contents + '---\ngarbage entry\n')
+
+        with pytest.raises(InvalidFileError):
+            app.upload_to_harvest('2019-01-01')
+
+        assert app.harvest_api.create_time_entry.call_count == 0
+
+    def test_upload_days_concurrently_in_order(self, app):
+        days = ['2019-01-01', '2019-01-02', '2019-01-03', '2019-01-04']
+        for day in days[:3]:
+            self.write_day(app, day)
+        self.write_day(app, '2019-01-03', 'garbage file\n')
+
+        results = list(app.upload_days_to_harvest(days, jobs=3))
+
+        # The missing day has nothing to report
+        assert [r.day for r in results] == days[:3]
+        assert results[0].messages == ['Uploaded', 'Not billable, skipping.', 'Entry invalid, skipping']
+        assert results[1].messages == results[0].messages
+        assert isinstance(results[2].error, InvalidFileError)
+        assert app.harvest_api.create_time_entry.call_count == 2
+
+    def test_upload_days_without_stored_days(self, credentials_file, tmpdir):
+        app = TogglHarvestApp(config_dir=tmpdir)
+        os.mkdir(Path(tmpdir, 'data'))
+
+        # Nothing to upload, so the missing project mapping is never read
+        assert list(app.upload_days_to_harvest(['2019-01-01', '2019-01-02'])) == []
+
+    def test_replays_journal_after_crash(self, app, mocker):
+        self.write_day(app, '2019-01-01')
+        mocker.patch.object(app, '_stamp_uploaded', side_effect=KeyboardInterrupt)
+
+        with pytest.raises(KeyboardInterrupt):
+            app.upload_to_harvest('2019-01-01')
+
+        # The day file never got its stamp, but the journal did
+        with open(app.data_file('2019-01-01'), 'r') as f:
+            assert 'uploaded:' not in f.read()
+        assert len(app.upload_journal.records()) == 1
+
+        mocker.stopall()
+        app.harvest_api.create_time_entry.reset_mock()
+        results = list(app.upload_days_to_harvest(['2019-01-01']))
+
+        # Nothing is left to upload once the journal is replayed, so the day is skipped
+        assert results == []
+        assert app.upload_to_harvest('2019-01-01')[0] == 'Already uploaded, skipping.'
+        assert app.harvest_api.create_time_entry.call_count == 0
+        assert app.upload_journal.records() == []
+        with open(app.data_file('2019-01-01'), 'r') as f:
+            assert 'time_entry_id: 4242' in f.read()
+
+    def test_replays_journal_of_unresolved_entry(self, app, mocker):
+        self.write_day(app, '2019-01-01', unresolved_day_contents)
+        app.project_mapping = ProjectMapping({
+            'ABC': {'harvest': {'project': 123, 'default_task': 'Development'}},
+        })
+        mocker.patch.object(app, '_stamp_uploaded', side_effect=KeyboardInterrupt)
+
+        with pytest.raises(KeyboardInterrupt):
+            app.upload_to_harvest('2019-01-01')
+
+        # The day file still has no Harvest ids, only the upload resolved them
+        with open(app.data_file('2019-01-01'), 'r') as f:
+            assert 'project_id:\n' in f.read()
+        assert len(app.upload_journal.records()) == 1
+
+        mocker.stopall()
+        app.harvest_api.create_time_entry.reset_mock()
+        results = list(app.upload_days_to_harvest(['2019-01-01']))
+
+        assert results == []
+        assert app.harvest_api.create_time_entry.call_count == 0
+        assert app.upload_journal.records() == []
+        with open(app.data_file('2019-01-01'), 'r') as f:
+            assert 'time_entry_id: 4242' in f.read()
+
+    def test_journaled_upload_is_not_posted_again(self, app, mocker):
+        self.write_day(app, '2019-01-01')
+        mocker.patch.object(app, '_stamp_uploaded', side_effect=KeyboardInterrupt)
+        with pytest.raises(KeyboardInterrupt):
+            app.upload_to_harvest('2019-01-01')
+        mocker.stopall()
+        app.harvest_api.create_time_entry.reset_mock()
+
+        # Without replaying the journal first
+        results = app.upload_to_harvest('2019-01-01')
+
+        assert results[0] == 'Already uploaded, stamped from the upload journal.'
+        assert app.harvest_api.create_time_entry.call_count == 0
+        assert app.upload_journal.records() == []
+        with open(app.data_file('2019-01-01'), 'r') as f:
+            assert 'time_entry_id: 4242' in f.read()
+
+    def test_unmatched_journal_records_are_kept(self, app):
+        app.upload_journal.record('2019-01-01', 'not-a-real-fingerprint', 1, '2019-01-01T12:00:00')
+        self.write_day(app, '2019-01-01')
+
+        app.replay_upload_journal()
+
+        assert len(app.upload_journal.records()) == 1
+
+
+class TestSqliteDayStore:
+    @pytest.fixture
+    def app(self, make_upload_app):
+        app = make_upload_app(day_store_backend='sqlite')
+        app.day_store.import_day('2019-01-01', upload_day_contents)
+        return app
+
+    def test_writes_no_day_files(self, app):
+        assert not app.data_file('2019-01-01').exists()
+        assert Path(app.data_dir, 'time_logs.sqlite3').is_file()
+
+    def test_validate_day(self, app):
+        assert app.validate_day('2019-01-01') == 1
+        assert app.validate_day('2019-01-02') == 0
+
+    def test_upload_to_harvest(self, app):
+        results = list(app.upload_days_to_harvest(['2019-01-01', '2019-01-01']))
+
+        assert results[0].messages == ['Uploaded', 'Not billable, skipping.', 'Entry invalid, skipping']
+        assert results[1].messages[0] == 'Already uploaded, skipping.'
+        assert app.harvest_api.create_time_entry.call_count == 1
+        documents = app.day_store.read_day('2019-01-01')
+        assert documents[0]['harvest']['time_entry_id'] == 4242
+        assert 'uploaded' not in documents[1]['harvest']
+
+    def test_export_import_round_trip(self, app, tmpdir):
+        export_dir = Path(tmpdir, 'export')
+        export_dir.mkdir()
+
+        assert list(app.export_days(['2019-01-01', '2019-01-02'], export_dir)) == ['2019-01-01']
+        day_file = Path(export_dir, '2019-01-01.yml')
+        day_file.write_text(day_file.read_text().replace('project_id: 999', 'project_id: 123'))
+        assert list(app.import_days(['2019-01-01', '2019-01-02'], export_dir)) == ['2019-01-01']
+
+        assert app.day_store.read_day('2019-01-01')[2]['harvest'] == {'project_id': 123}
+
+
+class TestValidateDays:
+    @pytest.fixture
+    def app(self, credentials_file, tmpdir):
+        app = TogglHarvestApp(config_dir=str(tmpdir))
+        os.mkdir(app.data_dir)
+        with open(app.project_file, 'w') as f:
+            f.write('{}\n')
+        with open(app._harvest_cache_file, 'w') as f:
+            f.write(trim_multiline(
+                """
+                id: 123
+                name: Test Project
+                client:
+                  id: 5000
+                  name: Test Client
+                tasks:
+                  5:
+                    name: Development
+                """
+            ) + '\n')
+        for day in ['2019-01-01', '2019-01-03']:
+            with open(app.data_file(day), 'w') as f:
+                f.write(upload_day_contents)
+        with open(app.data_file('2019-01-04'), 'w') as f:
+            f.write(upload_day_contents.replace('project_id: 999', 'project_id: 123\n  task_id: 5'))
+        return app
+
+    @pytest.mark.parametrize('jobs', [1, 2])
+    def test_results_in_order(self, app, jobs):
+        days = ['2019-01-01', '2019-01-02', '2019-01-03', '2019-01-04']
+
+        results = list(app.validate_days(days, jobs=jobs))
+
+        assert [(r.day, r.errors) for r in results] == [('2019-01-01', 1), ('2019-01-03', 1), ('2019-01-04', 0)]
+        # Lookups made in the worker processes are counted too
+        assert app.harvest_resolver.hits + app.harvest_resolver.misses == 9
+
+    def test_worker_loads_state_once(self, app, mocker):
+        _init_validation_worker(app.config_dir, 'yaml', 'yaml', 'full')
+        load_mock = mocker.patch('toggl2harvest.app.fast_yaml')
+
+        result, index_updates, lookups = _validate_day_in_worker('2019-01-04')
+
+        assert result == ('2019-01-04', 0)
+        assert [day for day, _, _ in index_updates] == ['2019-01-04']
+        assert sum(lookups) == 3
+        # The day is read through the fast loader, mapping and cache were loaded up front
+        assert load_mock.call_count == 0
+
+    def test_unchanged_valid_days_are_skipped(self, app, mocker):
+        list(app.validate_days(['2019-01-01', '2019-01-04']))
+        app = TogglHarvestApp(config_dir=app.config_dir)
+        vd_spy = mocker.spy(app, '_validate_day')
+
+        results = list(app.validate_days(['2019-01-01', '2019-01-04']))
+
+        assert [(r.day, r.errors) for r in results] == [('2019-01-01', 1), ('2019-01-04', 0)]
+        # Only the invalid day is parsed again
+        assert [args for args, _ in vd_spy.call_args_list] == [('2019-01-01',)]
+        assert app.validate_day('2019-01-04') == 0
+        assert vd_spy.call_count == 1
+
+    @pytest.mark.parametrize('changed_file', ['day', 'project_mapping', 'harvest_cache'])
+    def test_changes_revalidate(self, app, mocker, changed_file):
+        list(app.validate_days(['2019-01-04']))
+        changed_path = {
+            'day': app.data_file('2019-01-04'),
+            'project_mapping': app.project_file,
+            'harvest_cache': app._harvest_cache_file,
+        }[changed_file]
+        with open(changed_path, 'a') as f:
+            f.write('# Edited\n')
+        app = TogglHarvestApp(config_dir=app.config_dir)
+        vd_spy = mocker.spy(app, '_validate_day')
+
+        assert app.validate_day('2019-01-04') == 0
+        assert vd_spy.call_count == 1
+
+
+class TestDurability:
+    @pytest.fixture
+    def app(self, make_upload_app):
+        app = make_upload_app(durability='file')
+        with open(app.data_file('2019-01-01'), 'w') as f:
+            f.write(upload_day_contents)
+        return app
+
+    def test_day_store_durability(self, app):
+        assert app.day_store.durability == 'file'
+
+    def test_batched_upload_reads_pending_days(self, app):
+        results = list(app.upload_days_to_harvest(['2019-01-01', '2019-01-01']))
+
+        assert results[1].messages[0] == 'Already uploaded, skipping.'
+        assert app.harvest_api.create_time_entry.call_count == 1
+        with open(app.data_file('2019-01-01'), 'r') as f:
+            assert 'time_entry_id: 4242' in f.read()
+
+
+class TestDayIndex:
+    @pytest.fixture
+    def app(self, make_upload_app):
+        app = make_upload_app()
+        for day in ['2019-01-01', '2019-01-02']:
+            with open(app.data_file(day), 'w') as f:
+                f.write(upload_day_contents)
+        return app
+
+    def index_entry(self, app, day):
+        return TogglHarvestApp(config_dir=app.config_dir)._day_index_entry(day)
+
+    def test_written_days_are_indexed(self, app):
+        mst = tz(td(hours=-7))
+        time_log = TimeLog.build_from_toggl_entry(TogglReportEntry(
+            client='Client', project='Project', task=None, description='New', is_billable=True,
+            start=dt(2019, 1, 3, 9, tzinfo=mst), end=dt(2019, 1, 3, 10, 30, tzinfo=mst)))
+
+        list(app.write_time_entries({dt(2019, 1, 3): [time_log]}))
+
+        entry = self.index_entry(app, '2019-01-03')
+        assert (entry.entries, entry.billable_hours, entry.uploaded, entry.not_uploaded) == (1, 1.5, 0, 1)
+
+    def test_upload_updates_index(self, app):
+        list(app.upload_days_to_harvest(['2019-01-01']))
+
+        entry = self.index_entry(app, '2019-01-01')
+        assert (entry.entries, entry.billable_hours, entry.uploaded, entry.not_uploaded) == (3, 1, 1, 0)
+        assert self.index_entry(app, '2019-01-02') is None
+
+    def test_upload_skips_uploaded_days_without_reading_them(self, app, mocker):
+        list(app.upload_days_to_harvest(['2019-01-01']))
+        app = TogglHarvestApp(config_dir=app.config_dir)
+        app.harvest_api = mocker.MagicMock()
+        read_spy = mocker.spy(app.day_store, 'read_day')
+        digest_spy = mocker.spy(app.day_store, 'digest')
+
+        results = list(app.upload_days_to_harvest(['2019-01-01']))
+
+        assert results == []
+        assert read_spy.call_count == 0
+        # The file's mtime and size are unchanged, so it isn't hashed either
+        assert digest_spy.call_count == 0
+
+    def test_edited_day_needs_work_again(self, app):
+        list(app.upload_days_to_harvest(['2019-01-01']))
+        with open(app.data_file('2019-01-01'), 'a') as f:
+            f.write('# Edited\n')
+
+        assert self.index_entry(app, '2019-01-01') is None
+        assert TogglHarvestApp(config_dir=app.config_dir)._needs_upload('2019-01-01')
+
+    def test_validation_keeps_upload_counts(self, app):
+        assert app.validate_day('2019-01-02') == 1
+
+        entry = self.index_entry(app, '2019-01-02')
+        assert entry.not_uploaded == 1
+        assert entry.validation is None  # No mapping or cache files to sign it against
@@ -23,7 +23,22 @@ def test_cli_links_to_app(cli_runner, app_mock, mocker):
 
     today = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0)
     assert mocker.call().download_toggl_data(today, today) in app_mock.mock_calls
-    assert mocker.call().write_time_entries(mocker.ANY) in app_mock.mock_calls
+    assert mocker.call().write_time_entries(mocker.ANY, merge=False) in app_mock.mock_calls
+
+
+def test_cli_merge(cli_runner, app_mock, mocker):
+    app_mock.return_value.write_time_entries.return_value = [
+        mocker.Mock(day='2019-01-01', written=True),
+        mocker.Mock(day='2019-01-02', written=False),
+    ]
+
+    result = cli_runner.invoke(
+        cli,
+        ['download-toggl-data', '--start=2019-01-01', '--end=2019-01-02', '--merge'])
+
+    assert result.exit_code == 0, result.output
+    assert mocker.call().write_time_entries(mocker.ANY, merge=True) in app_mock.mock_calls
+    assert result.output == '2019-01-02 has no new entries, unchanged.\n'
 
 
 def test_cli_links_to_app_takes_start_end(cli_runner, app_mock, mocker):
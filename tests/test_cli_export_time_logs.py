@@ -0,0 +1,55 @@
+# Third Party Packages
+import pytest
+
+from toggl2harvest.exceptions import InvalidFileError
+from toggl2harvest.scripts.toggl2harvest import cli
+
+
+@pytest.fixture
+def app_mock(mocker):
+    return mocker.patch(
+        'toggl2harvest.scripts.toggl2harvest.TogglHarvestApp'
+    )
+
+
+def test_cli_day_store_option(cli_runner, app_mock, tmpdir):
+    result = cli_runner.invoke(cli, ['--day-store=sqlite', 'info'])
+
+    assert result.exit_code == 0, result.output
+    app_mock.assert_called_with(
+        config_dir=None, harvest_cache_backend='yaml', day_store_backend='sqlite', durability='full')
+
+
+def test_export_time_logs(cli_runner, app_mock, tmpdir):
+    app_mock.return_value.export_days.return_value = ['2019-01-01']
+
+    result = cli_runner.invoke(
+        cli,
+        ['export-time-logs', '--start=2019-01-01', '--end=2019-01-02', str(tmpdir)])
+
+    assert result.exit_code == 0, result.output
+    app_mock.return_value.export_days.assert_called_with(['2019-01-01', '2019-01-02'], str(tmpdir))
+    assert result.output == '2019-01-01 exported.\n'
+
+
+def test_import_time_logs(cli_runner, app_mock, tmpdir):
+    app_mock.return_value.import_days.return_value = ['2019-01-02']
+
+    result = cli_runner.invoke(
+        cli,
+        ['import-time-logs', '--start=2019-01-01', '--end=2019-01-02', str(tmpdir)])
+
+    assert result.exit_code == 0, result.output
+    app_mock.return_value.import_days.assert_called_with(['2019-01-01', '2019-01-02'], str(tmpdir))
+    assert result.output == '2019-01-02 imported.\n'
+
+
+def test_import_time_logs_invalid_day(cli_runner, app_mock, tmpdir):
+    app_mock.return_value.import_days.side_effect = InvalidFileError('2019-01-01 has a value that cannot be stored')
+
+    result = cli_runner.invoke(
+        cli,
+        ['import-time-logs', '--start=2019-01-01', '--end=2019-01-01', str(tmpdir)])
+
+    assert result.exit_code == 1
+    assert 'Error: 2019-01-01 has a value that cannot be stored' in result.output
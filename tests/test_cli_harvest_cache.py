@@ -20,4 +20,14 @@ def test_cli_links_to_app(cli_runner, app_mock, mocker):
 
     assert result.exit_code == 0, result.output
 
-    assert mocker.call().cache_harvest_projects() in app_mock.mock_calls
+    assert mocker.call().cache_harvest_projects(full=False) in app_mock.mock_calls
+
+
+def test_cli_full_rebuild(cli_runner, app_mock, mocker):
+    result = cli_runner.invoke(
+        cli,
+        ['harvest-cache', '--full'])
+
+    assert result.exit_code == 0, result.output
+
+    assert mocker.call().cache_harvest_projects(full=True) in app_mock.mock_calls
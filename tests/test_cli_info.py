@@ -21,3 +21,13 @@ def test_can_set_config_dir_with_env_var(cli_runner, credentials_file):
     full_path = expanduser('~/.some_dot_folder')
     assert result.exit_code == 0, result.output
     assert f'Configuration Directory: "{full_path}"' in result.output
+
+
+@pytest.mark.parametrize('args,trace', [([], False), (['--trace'], True)])
+def test_trace_switch(cli_runner, credentials_file, mocker, args, trace):
+    configure_mock = mocker.patch('toggl2harvest.scripts.toggl2harvest.configure_logging')
+
+    result = cli_runner.invoke(cli, args + ['info'])
+
+    assert result.exit_code == 0, result.output
+    configure_mock.assert_called_with(trace=trace)
@@ -0,0 +1,64 @@
+# Standard Library
+from datetime import datetime
+
+# Third Party Packages
+import pytest
+
+from toggl2harvest.app import UploadResult
+from toggl2harvest.exceptions import InvalidFileError, MissingHarvestCacheError
+from toggl2harvest.scripts.toggl2harvest import _upload_to_harvest, cli
+
+
+@pytest.fixture
+def app_mock(mocker):
+    return mocker.patch(
+        'toggl2harvest.scripts.toggl2harvest.TogglHarvestApp'
+    )
+
+
+def test_cli_links_to_app(cli_runner, app_mock, mocker):
+    uth_mock = mocker.patch('toggl2harvest.scripts.toggl2harvest'
+                            '._upload_to_harvest')
+
+    result = cli_runner.invoke(
+        cli,
+        ['upload-to-harvest', '--jobs=4'])
+
+    assert result.exit_code == 0, result.output
+
+    today = datetime.today()
+    uth_mock.assert_called_with(mocker.ANY, [f'{today:%Y-%m-%d}'], jobs=4)
+
+
+def test_cli_rejects_zero_jobs(cli_runner, app_mock):
+    result = cli_runner.invoke(
+        cli,
+        ['upload-to-harvest', '--jobs=0'])
+
+    assert result.exit_code == 2, result.output
+
+
+def test_upload_reports_in_order(mocker, capsys):
+    app = mocker.MagicMock()
+    app.upload_days_to_harvest.return_value = iter([
+        UploadResult(day='2019-01-01', messages=['Uploaded', 'Not billable, skipping.'], error=None),
+        UploadResult(day='2019-01-02', messages=[], error=InvalidFileError('00 entry is not parseable')),
+    ])
+
+    _upload_to_harvest(app, ['2019-01-01', '2019-01-02'], jobs=2)
+
+    app.upload_days_to_harvest.assert_called_with(['2019-01-01', '2019-01-02'], jobs=2)
+    assert capsys.readouterr().out.splitlines() == [
+        '2019-01-01#00: Uploaded',
+        '2019-01-01#01: Not billable, skipping.',
+        '2019-01-02#00 entry is not parseable',
+    ]
+
+
+def test_upload_without_harvest_cache(cli_runner, app_mock):
+    app_mock.return_value.upload_days_to_harvest.side_effect = MissingHarvestCacheError('The Harvest cache is empty')
+
+    result = cli_runner.invoke(cli, ['upload-to-harvest'])
+
+    assert result.exit_code == 1
+    assert 'Error: The Harvest cache is empty' in result.output
@@ -26,7 +26,19 @@ def test_cli_links_to_app(cli_runner, app_mock, mocker):
     assert result.exit_code == 0, result.output
 
     today = datetime.today()
-    vtl_mock.assert_called_with(mocker.ANY, [f'{today:%Y-%m-%d}'])
+    vtl_mock.assert_called_with(mocker.ANY, [f'{today:%Y-%m-%d}'], jobs=1)
+
+
+def test_cli_jobs(cli_runner, app_mock, mocker):
+    vtl_mock = mocker.patch('toggl2harvest.scripts.toggl2harvest'
+                            '._validate_time_logs')
+
+    result = cli_runner.invoke(
+        cli,
+        ['validate-time-logs', '--start=2019-01-01', '--end=2019-01-02', '--jobs=4'])
+
+    assert result.exit_code == 0, result.output
+    vtl_mock.assert_called_with(mocker.ANY, ['2019-01-01', '2019-01-02'], jobs=4)
 
 
 def test_cli_handles_bad_start(cli_runner, app_mock, mocker):
@@ -55,11 +67,14 @@ def test_cli_handles_bad_end(cli_runner, app_mock, mocker):
 
 @pytest.fixture
 def app(tmpdir):
-    return TogglHarvestApp(config_dir=tmpdir)
+    app = TogglHarvestApp(config_dir=tmpdir)
+    app.data_dir.mkdir()
+    app.data_file('2019-01-01').write_text('')
+    return app
 
 
 def test_validate_time_log_interior(app, mocker):
-    vf_mock = mocker.patch.object(app, 'validate_file', return_value=0)
+    vf_mock = mocker.patch.object(app, '_validate_day', return_value=0)
 
     _validate_time_logs(app, ['2019-01-01'])
 
@@ -71,10 +86,38 @@ def test_validate_time_log_interior_error_edits_file(app, mocker):
     confirm_mock = mocker.patch(
         'toggl2harvest.scripts.toggl2harvest.click.confirm',
         return_value=True)
-    vf_mock = mocker.patch.object(app, 'validate_file', side_effect=[1, 0])
+    vf_mock = mocker.patch.object(app, '_validate_day', side_effect=[1, 0])
 
     _validate_time_logs(app, ['2019-01-01'])
 
     assert edit_mock.call_count == 1
     assert confirm_mock.call_count == 1
     assert vf_mock.call_count == 2
+
+
+def test_validate_time_log_interior_skips_missing_days(app, mocker):
+    vf_mock = mocker.patch.object(app, '_validate_day', return_value=0)
+
+    _validate_time_logs(app, ['2019-01-02'])
+
+    assert vf_mock.call_count == 0
+
+
+def test_validate_time_log_interior_edits_after_validating(app, mocker):
+    app.data_file('2019-01-02').write_text('')
+    app.data_file('2019-01-03').write_text('')
+    events = []
+    mocker.patch.object(app, '_validate_day', side_effect=lambda day: events.append(('validate', day)) or 1)
+    mocker.patch('toggl2harvest.scripts.toggl2harvest.click.confirm',
+                 side_effect=lambda text: events.append(('confirm', text)) or False)
+
+    _validate_time_logs(app, ['2019-01-01', '2019-01-02', '2019-01-03'])
+
+    assert events == [
+        ('validate', '2019-01-01'),
+        ('validate', '2019-01-02'),
+        ('validate', '2019-01-03'),
+        ('confirm', '2019-01-01 | Edit file?'),
+        ('confirm', '2019-01-02 | Edit file?'),
+        ('confirm', '2019-01-03 | Edit file?'),
+    ]
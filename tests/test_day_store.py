@@ -0,0 +1,142 @@
+# Standard Library
+from datetime import datetime, timedelta, timezone
+
+# Third Party Packages
+import pytest
+
+from toggl2harvest.day_store import SqliteDayStore, YamlDayStore
+from toggl2harvest.exceptions import InvalidFileError
+from toggl2harvest.models import HarvestData, TimeEntry, TimeLog, TogglData
+
+
+def make_time_log(description):
+    start = datetime(2019, 1, 1, 12, tzinfo=timezone(timedelta(hours=-7)))
+    return TimeLog(
+        project_code='ABC-1',
+        description=description,
+        is_billable=True,
+        time_entries=[TimeEntry(start=start, end=start + timedelta(hours=1))],
+        toggl=TogglData(client='Client', project='Project', task=None, is_billable=True),
+        harvest=HarvestData(project_id=None, task_id=None, task_name=None, uploaded=None),
+    )
+
+
+@pytest.fixture(params=['yaml', 'sqlite'])
+def store(request, tmpdir):
+    if request.param == 'sqlite':
+        store = SqliteDayStore(tmpdir.join('time_logs.sqlite3'))
+        yield store
+        store.close()
+    else:
+        yield YamlDayStore(tmpdir)
+
+
+class TestDayStore:
+    def test_missing_day(self, store):
+        assert not store.exists('2019-01-01')
+
+    def test_write_and_read_day(self, store):
+        store.write_day('2019-01-01', [make_time_log('First'), make_time_log('Second')])
+
+        assert store.exists('2019-01-01')
+        documents = store.read_day('2019-01-01')
+        assert [data['description'] for data in documents] == ['First', 'Second']
+        assert documents[0]['time_entries'][0]['s'] == '2019-01-01T12:00:00-07:00'
+
+    def test_update_day(self, store):
+        store.write_day('2019-01-01', [make_time_log('First'), make_time_log('Second')])
+
+        with store.update_day('2019-01-01') as documents:
+            documents[1]['harvest']['project_id'] = 123
+
+        documents = store.read_day('2019-01-01')
+        assert documents[0]['harvest']['project_id'] is None
+        assert documents[1]['harvest']['project_id'] == 123
+
+    def test_update_day_rolls_back_on_error(self, store):
+        store.write_day('2019-01-01', [make_time_log('First')])
+
+        with pytest.raises(KeyError):
+            with store.update_day('2019-01-01') as documents:
+                documents[0]['harvest']['project_id'] = 123
+                raise KeyError('project_id')
+
+        assert store.read_day('2019-01-01')[0]['harvest']['project_id'] is None
+
+    def test_export_import(self, store):
+        store.write_day('2019-01-01', [make_time_log('First')])
+
+        text = store.export_day('2019-01-01').replace('First', 'Edited')
+        store.import_day('2019-01-01', text)
+
+        assert store.read_day('2019-01-01')[0]['description'] == 'Edited'
+
+
+class TestSqliteDayStore:
+    def test_update_only_writes_changed_rows(self, tmpdir, mocker):
+        store = SqliteDayStore(tmpdir.join('time_logs.sqlite3'))
+        store.write_day('2019-01-01', [make_time_log('First'), make_time_log('Second')])
+        store.connection = mocker.MagicMock(wraps=store.connection)
+
+        with store.update_day('2019-01-01') as documents:
+            documents[1]['description'] = 'Changed'
+
+        (sql, rows), _ = store.connection.executemany.call_args
+        assert sql.startswith('UPDATE')
+        assert [position for _, _, position in rows] == [1]
+
+    def test_unchanged_update_writes_nothing(self, tmpdir, mocker):
+        store = SqliteDayStore(tmpdir.join('time_logs.sqlite3'))
+        store.write_day('2019-01-01', [make_time_log('First')])
+        store.connection = mocker.MagicMock(wraps=store.connection)
+
+        with store.update_day('2019-01-01'):
+            pass
+
+        assert store.connection.executemany.call_count == 0
+
+    def test_import_keeps_quoted_timestamps(self, tmpdir):
+        store = SqliteDayStore(tmpdir.join('time_logs.sqlite3'))
+        store.write_day('2019-01-01', [make_time_log('First')])
+
+        store.import_day('2019-01-01', store.export_day('2019-01-01'))
+
+        assert store.read_day('2019-01-01')[0]['time_entries'][0]['s'] == '2019-01-01T12:00:00-07:00'
+
+    def test_import_refuses_unquoted_timestamps(self, tmpdir):
+        store = SqliteDayStore(tmpdir.join('time_logs.sqlite3'))
+        store.write_day('2019-01-01', [make_time_log('First')])
+        text = store.export_day('2019-01-01').replace("'2019-01-01T12:00:00-07:00'", '2019-01-01T12:00:00-07:00')
+        assert 's: 2019-01-01T12:00:00-07:00\n' in text
+
+        with pytest.raises(InvalidFileError):
+            store.import_day('2019-01-01', text)
+
+        assert store.read_day('2019-01-01')[0]['time_entries'][0]['s'] == '2019-01-01T12:00:00-07:00'
+
+
+class TestYamlDayStore:
+    @pytest.mark.parametrize('durability,fsyncs', [('none', 0), ('file', 1), ('full', 2)])
+    def test_write_day_durability(self, tmpdir, mocker, durability, fsyncs):
+        fsync_mock = mocker.patch('toggl2harvest.utils.os.fsync')
+        store = YamlDayStore(tmpdir, durability=durability)
+
+        store.write_day('2019-01-01', [make_time_log('First')])
+
+        assert store.read_day('2019-01-01')[0]['description'] == 'First'
+        assert not tmpdir.join('2019-01-01.yml.tmp').exists()
+        assert fsync_mock.call_count == fsyncs
+
+    def test_write_day_joins_batch(self, tmpdir, mocker):
+        fsync_mock = mocker.patch('toggl2harvest.utils.os.fsync')
+        store = YamlDayStore(tmpdir)
+
+        with store.batch():
+            store.write_day('2019-01-01', [make_time_log('First')])
+            store.write_day('2019-01-02', [make_time_log('Second')])
+            assert not tmpdir.join('2019-01-01.yml').exists()
+            assert store.exists('2019-01-01')
+
+        assert store.read_day('2019-01-02')[0]['description'] == 'Second'
+        # Both day files, then their directory once
+        assert fsync_mock.call_count == 3
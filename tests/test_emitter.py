@@ -0,0 +1,140 @@
+# Standard Library
+import io
+import random
+from datetime import datetime as dt
+from datetime import timedelta as td
+from datetime import timezone as tz
+
+# Third Party Packages
+import pytest
+from ruamel.yaml import YAML
+
+from toggl2harvest.emitter import dump_time_logs
+from toggl2harvest.models import HarvestData, TimeEntry, TimeLog, TogglData
+from toggl2harvest.schemas import TimeLogSchema
+from toggl2harvest.utils import fast_yaml
+
+
+def ruamel_dump(time_logs):
+    schema = TimeLogSchema()
+    output = io.StringIO()
+    with YAML(output=output) as yaml:
+        for time_log in time_logs:
+            yaml.dump(schema.dump(time_log))
+    return output.getvalue()
+
+
+def load_all(make_yaml, text):
+    return [dict(d) for d in make_yaml().load_all(text)]
+
+
+TRICKY_STRINGS = [
+    '', ' ', 'true', 'False', 'null', '~', 'yes', 'No', 'on', 'y', '123', '1.5', '0x1F', '.inf',
+    '-', '- item', '? key', 'key: value', 'a #comment', '#comment', ' leading', 'trailing ',
+    "it's", '"quoted"', 'back\\slash', 'new\nline', 'tab\there', '2019-01-01', 'é', 'Ünïcödé',
+    'emoji 😀', 'nul\x00', 'del\x7f', 'line\u2028sep', 'bom\ufeff', '[list]', '{map}',
+    '&anchor', '*alias', '!tag', '|', '>', '%directive', '@at', '`tick`', 'PROJ-123 Fix it',
+]
+
+
+def random_string(rng):
+    if rng.random() < 0.5:
+        return rng.choice(TRICKY_STRINGS)
+    return ''.join(rng.choice(TRICKY_STRINGS) for _ in range(rng.randint(1, 3)))
+
+
+def random_datetime(rng):
+    offset = tz(td(minutes=rng.choice([-420, -360, 0, 330, 600])))
+    return dt(2019, 1, 1, tzinfo=offset) + td(
+        seconds=rng.randint(0, 86400 * 365),
+        microseconds=rng.choice([0, rng.randint(0, 999999)]))
+
+
+def random_time_log(rng):
+    maybe = lambda make: None if rng.random() < 0.3 else make()  # noqa: E731
+    time_entries = maybe(lambda: [
+        TimeEntry(random_datetime(rng), random_datetime(rng))
+        for _ in range(rng.randint(0, 3))
+    ])
+    return TimeLog(
+        project_code=maybe(lambda: random_string(rng)),
+        description=maybe(lambda: random_string(rng)),
+        is_billable=rng.choice([True, False]),
+        time_entries=time_entries,
+        toggl=TogglData(
+            client=maybe(lambda: random_string(rng)),
+            project=maybe(lambda: random_string(rng)),
+            task=maybe(lambda: random_string(rng)),
+            is_billable=maybe(lambda: rng.choice([True, False])),
+        ),
+        harvest=HarvestData(
+            project_id=maybe(lambda: rng.randint(1, 10 ** 9)),
+            task_name=maybe(lambda: random_string(rng)),
+            task_id=maybe(lambda: rng.randint(1, 10 ** 9)),
+            uploaded=maybe(lambda: random_datetime(rng)),
+        ),
+    )
+
+
+class TestDumpTimeLogs:
+    def test_empty_day(self):
+        assert dump_time_logs([]) == ''
+
+    def test_layout(self):
+        time_log = TimeLog(
+            project_code=None,
+            description='PROJ-1 Work',
+            is_billable=True,
+            time_entries=[TimeEntry(
+                dt(2019, 1, 1, 12, tzinfo=tz(td(hours=-7))),
+                dt(2019, 1, 1, 13, tzinfo=tz(td(hours=-7))),
+            )],
+            toggl=TogglData(client='Client', project='Project', task=None, is_billable=True),
+        )
+
+        assert dump_time_logs([time_log]) == (
+            'project_code:\n'
+            'description: PROJ-1 Work\n'
+            'is_billable: true\n'
+            'time_entries:\n'
+            '- s: "2019-01-01T12:00:00-07:00"\n'
+            '  e: "2019-01-01T13:00:00-07:00"\n'
+            'toggl:\n'
+            '  client: Client\n'
+            '  project: Project\n'
+            '  task:\n'
+            '  is_billable: true\n'
+            'harvest:\n'
+            '  project_id:\n'
+            '  task_name:\n'
+            '  task_id:\n'
+            '  uploaded:\n'
+        )
+
+    @pytest.mark.parametrize('seed', range(20))
+    @pytest.mark.parametrize('make_yaml', [YAML, fast_yaml])
+    def test_loads_like_ruamel_output(self, seed, make_yaml):
+        rng = random.Random(seed)
+        time_logs = [random_time_log(rng) for _ in range(rng.randint(1, 10))]
+
+        emitted = load_all(make_yaml, dump_time_logs(time_logs))
+
+        assert emitted == load_all(make_yaml, ruamel_dump(time_logs))
+
+    @pytest.mark.parametrize('make_yaml', [YAML, fast_yaml])
+    @pytest.mark.parametrize('description', ['nel\x85', 'line\u2028sep', 'bom\ufeff'])
+    def test_keeps_unicode_line_breaks(self, make_yaml, description):
+        # ruamel's own dump turns a NEL into a space, so it isn't part of the comparison above
+        time_log = TimeLog(None, description, True, [])
+
+        loaded = load_all(make_yaml, dump_time_logs([time_log]))
+
+        assert loaded[0]['description'] == description
+
+    def test_round_trips_through_schema(self):
+        rng = random.Random(1234)
+        time_logs = [random_time_log(rng) for _ in range(50)]
+        schema = TimeLogSchema()
+
+        for time_log, data in zip(time_logs, YAML().load_all(dump_time_logs(time_logs))):
+            assert schema.dump(schema.load(data)) == schema.dump(time_log)
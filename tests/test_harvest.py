@@ -0,0 +1,236 @@
+# Standard Library
+from concurrent.futures import ThreadPoolExecutor
+
+# Third Party Packages
+import pytest
+
+from toggl2harvest import harvest
+
+
+@pytest.fixture
+def harvest_credentials():
+    return harvest.HarvestCredentials(
+        account_id='123',
+        token='token',
+        user_agent='user@example.com',
+    )
+
+
+@pytest.fixture(autouse=True)
+def sleep_mock(mocker):
+    return mocker.patch('time.sleep')
+
+
+@pytest.fixture
+def harvest_session(harvest_credentials):
+    return harvest.HarvestSession(harvest_credentials)
+
+
+class MockResponse:
+    def __init__(self, status_code, json_data):
+        self.status_code = status_code
+        self.json_data = json_data
+
+    def json(self):
+        return self.json_data
+
+    def raise_for_status(self):
+        pass
+
+
+def list_page(list_name, objects, next_url=None):
+    return MockResponse(200, {
+        list_name: objects,
+        'links': {'next': next_url},
+    })
+
+
+class TestIterList:
+    def test_follows_next_links(self, mocker, harvest_session):
+        session_mock = mocker.patch.object(harvest_session, 'session', autospec=True)
+        mocker.patch.object(
+            session_mock, 'get',
+            side_effect=[
+                list_page('projects', [{'id': 1}, {'id': 2}], next_url='page-2'),
+                list_page('projects', [{'id': 3}]),
+            ])
+
+        projects = harvest_session.iter_list('projects')
+
+        assert session_mock.get.call_count == 0  # Nothing fetched until consumed
+        assert list(projects) == [{'id': 1}, {'id': 2}, {'id': 3}]
+        assert session_mock.get.call_count == 2
+
+    def test_fans_out_pages(self, mocker, harvest_session):
+        def get_page(url, params):
+            page = params['page']
+            return MockResponse(200, {
+                'projects': [{'id': page * 10}, {'id': page * 10 + 1}],
+                'total_pages': 4,
+                'links': {'next': None},
+            })
+
+        session_mock = mocker.patch.object(harvest_session, 'session', autospec=True)
+        mocker.patch.object(session_mock, 'get', side_effect=get_page)
+
+        projects = list(harvest_session.iter_list('projects', params={'is_active': 'true'}))
+
+        assert projects == [{'id': p * 10 + i} for p in range(1, 5) for i in range(2)]
+        assert session_mock.get.call_count == 4
+        session_mock.get.assert_any_call(
+            'https://api.harvestapp.com/api/v2/projects',
+            params={'is_active': 'true', 'per_page': 2000, 'page': 3})
+
+    def test_pages_only_fetched_ahead_by_workers(self, mocker, harvest_credentials):
+        harvest_session = harvest.HarvestSession(harvest_credentials, max_workers=2)
+        submitted = []
+
+        class RecordingExecutor(ThreadPoolExecutor):
+            def submit(self, fn, *args, **kwargs):
+                submitted.append(args)
+                return super().submit(fn, *args, **kwargs)
+
+        def get_page(url, params):
+            return MockResponse(200, {
+                'projects': [{'page': params['page']}, {'page': params['page']}],
+                'total_pages': 10,
+                'links': {'next': None},
+            })
+
+        mocker.patch('toggl2harvest.harvest.ThreadPoolExecutor', RecordingExecutor)
+        session_mock = mocker.patch.object(harvest_session, 'session', autospec=True)
+        mocker.patch.object(session_mock, 'get', side_effect=get_page)
+
+        projects = harvest_session.iter_list('projects')
+        for _ in range(4):
+            next(projects)
+
+        # Reading the second page, with at most one page per worker requested past it
+        assert len(submitted) <= 3
+        assert list(projects)[-1] == {'page': 10}
+        assert len(submitted) == 9
+        projects.close()
+
+    def test_retrieve_list(self, mocker, harvest_session):
+        session_mock = mocker.patch.object(harvest_session, 'session', autospec=True)
+        mocker.patch.object(
+            session_mock, 'get',
+            side_effect=[list_page('task_assignments', [{'id': 1}])])
+
+        assert harvest_session.retrieve_task_assignments() == [{'id': 1}]
+
+
+class TestCacheProjectsViaApi:
+    def test_builds_cache(self, mocker, harvest_session):
+        def iter_list(list_name, params=None):
+            if list_name == 'projects':
+                yield {
+                    'id': 1,
+                    'name': 'B Project',
+                    'is_active': True,
+                    'client': {'id': 5, 'name': 'Client'},
+                    'code': 'B',
+                }
+                yield {
+                    'id': 2,
+                    'name': 'A Project',
+                    'is_active': False,
+                    'client': {'id': 5, 'name': 'Client'},
+                    'code': 'A',
+                }
+            else:
+                yield {
+                    'project': {'id': 1},
+                    'task': {'id': 7, 'name': 'Development'},
+                    'is_active': True,
+                }
+
+        mocker.patch.object(harvest_session, 'iter_list', side_effect=iter_list)
+
+        cache = harvest_session.cache_projects_via_api()
+
+        assert [p['id'] for p in cache] == [1, 2]  # Active projects first
+        assert cache[0]['tasks'] == {7: {'name': 'Development', 'link_active': True}}
+        assert cache[1]['tasks'] == {}
+
+
+class TestIncrementalCache:
+    cached_projects = [
+        {
+            'id': 1,
+            'name': 'Old Name',
+            'active': True,
+            'client': {'id': 5, 'name': 'Client'},
+            'code': 'OLD',
+            'tasks': {7: {'name': 'Development', 'link_active': True}},
+        },
+        {
+            'id': 2,
+            'name': 'Untouched',
+            'active': True,
+            'client': {'id': 5, 'name': 'Client'},
+            'code': 'SAME',
+            'tasks': {},
+        },
+    ]
+
+    def test_merges_changes(self, mocker, harvest_session):
+        calls = []
+
+        def iter_list(list_name, params=None):
+            calls.append((list_name, params))
+            if list_name == 'projects':
+                yield {
+                    'id': 1,
+                    'name': 'New Name',
+                    'is_active': True,
+                    'client': {'id': 5, 'name': 'Client'},
+                    'code': 'NEW',
+                }
+            else:
+                yield {
+                    'id': 100,
+                    'project': {'id': 2},
+                    'task': {'id': 8, 'name': 'Design'},
+                    'is_active': True,
+                }
+                yield {
+                    'id': 101,
+                    'project': {'id': 404},
+                    'task': {'id': 9, 'name': 'Orphan'},
+                    'is_active': True,
+                }
+
+        mocker.patch.object(harvest_session, 'iter_list', side_effect=iter_list)
+
+        cache = harvest_session.cache_projects_via_api(
+            updated_since='2019-01-01T00:00:00Z',
+            cached_projects=self.cached_projects,
+        )
+
+        assert sorted(calls) == [
+            ('projects', {'updated_since': '2019-01-01T00:00:00Z'}),
+            ('task_assignments', {'updated_since': '2019-01-01T00:00:00Z'}),
+        ]
+        by_id = {p['id']: p for p in cache}
+        assert set(by_id) == {1, 2}
+        assert by_id[1]['name'] == 'New Name'
+        assert by_id[1]['tasks'] == {7: {'name': 'Development', 'link_active': True}}
+        assert by_id[2]['tasks'] == {8: {'name': 'Design', 'link_active': True}}
+
+
+class TestCreateTimeEntry:
+    def test_retries_throttled_upload(self, mocker, harvest_session):
+        throttled = MockResponse(429, {})
+        throttled.headers = {'Retry-After': '1'}
+        session_mock = mocker.patch.object(harvest_session, 'session', autospec=True)
+        mocker.patch.object(
+            session_mock, 'post',
+            side_effect=[throttled, MockResponse(201, {'id': 99})])
+        entry = mocker.Mock(
+            project_id=1, task_id=7, spent_date='2019-01-01', hours=1.0, notes='notes')
+
+        result = harvest_session.create_time_entry(entry)
+
+        assert result == {'id': 99}
+        assert session_mock.post.call_count == 2
@@ -0,0 +1,69 @@
+# Standard Library
+import os
+from datetime import datetime, timedelta, timezone
+
+from toggl2harvest.journal import UploadJournal, entry_fingerprint
+from toggl2harvest.models import HarvestData, TimeEntry, TimeLog, TogglData
+
+
+def make_time_log(project_id=None, description='Notes'):
+    start = datetime(2019, 1, 1, 12, tzinfo=timezone(timedelta(hours=-7)))
+    return TimeLog(
+        project_code='ABC',
+        description=description,
+        is_billable=True,
+        time_entries=[TimeEntry(start=start, end=start + timedelta(hours=1))],
+        toggl=TogglData(client='Client', project='Project', task=None, is_billable=True),
+        harvest=HarvestData(project_id=project_id, task_id=None, task_name=None, uploaded=None),
+    )
+
+
+class TestEntryFingerprint:
+    def test_same_entry_same_fingerprint(self):
+        assert entry_fingerprint('2019-01-01', make_time_log()) == entry_fingerprint('2019-01-01', make_time_log())
+
+    def test_different_entry_different_fingerprint(self):
+        assert entry_fingerprint('2019-01-01', make_time_log()) != \
+            entry_fingerprint('2019-01-01', make_time_log(description='Other'))
+
+    def test_different_day_different_fingerprint(self):
+        assert entry_fingerprint('2019-01-01', make_time_log()) != entry_fingerprint('2019-01-02', make_time_log())
+
+    def test_resolved_ids_keep_fingerprint(self):
+        assert entry_fingerprint('2019-01-01', make_time_log()) == \
+            entry_fingerprint('2019-01-01', make_time_log(project_id=123))
+
+
+class TestUploadJournal:
+    def test_missing_journal_is_empty(self, tmpdir):
+        journal = UploadJournal(tmpdir.join('journal.jsonl'))
+
+        assert journal.records() == []
+
+    def test_records_round_trip(self, tmpdir):
+        journal = UploadJournal(tmpdir.join('journal.jsonl'))
+
+        journal.record('2019-01-01', 'abc', 12, '2019-01-01T12:00:00')
+
+        assert journal.records() == [{
+            'day': '2019-01-01',
+            'fingerprint': 'abc',
+            'time_entry_id': 12,
+            'uploaded': '2019-01-01T12:00:00',
+        }]
+
+    def test_ignores_torn_final_line(self, tmpdir):
+        journal = UploadJournal(tmpdir.join('journal.jsonl'))
+        journal.record('2019-01-01', 'abc', 12, '2019-01-01T12:00:00')
+        with open(journal.path, 'a') as f:
+            f.write('{"day": "2019-')
+
+        assert len(journal.records()) == 1
+
+    def test_rewrite_empty_removes_journal(self, tmpdir):
+        journal = UploadJournal(tmpdir.join('journal.jsonl'))
+        journal.record('2019-01-01', 'abc', 12, '2019-01-01T12:00:00')
+
+        journal.rewrite([])
+
+        assert not os.path.exists(journal.path)
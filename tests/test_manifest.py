@@ -0,0 +1,118 @@
+# Standard Library
+from datetime import datetime, timedelta, timezone
+
+# Third Party Packages
+import pytest
+
+from toggl2harvest.manifest import DayIndex, DaySummary, summarize_day
+from toggl2harvest.models import HarvestData, TimeEntry, TimeLog
+
+
+summary = DaySummary(entries=3, billable_hours=1.5, uploaded=1, not_uploaded=1)
+validation = ['mapping-digest', 'cache-digest', 0]
+
+
+@pytest.fixture
+def day_index(tmpdir):
+    return DayIndex(tmpdir.join('manifest.json'))
+
+
+def make_time_log(is_billable, hours, uploaded=None):
+    start = datetime(2019, 1, 1, 9, tzinfo=timezone.utc)
+    return TimeLog(
+        project_code=None,
+        description=None,
+        is_billable=is_billable,
+        time_entries=[TimeEntry(start, start + timedelta(hours=hours))] if hours else [],
+        harvest=HarvestData(uploaded=uploaded),
+    )
+
+
+class TestSummarizeDay:
+    def test_empty_day(self):
+        assert summarize_day([]) == (0, 0, 0, 0)
+
+    def test_counts_billable_logs_with_time(self):
+        time_logs = [
+            make_time_log(True, 1, uploaded=datetime(2019, 1, 2)),
+            make_time_log(True, 0.5),
+            make_time_log(True, 0),
+            make_time_log(False, 2),
+        ]
+
+        assert summarize_day(time_logs) == DaySummary(
+            entries=4, billable_hours=1.5, uploaded=1, not_uploaded=1)
+
+
+class TestDayIndex:
+    signature = [1546300800000000000, 100]
+
+    def test_empty(self, day_index):
+        assert day_index.get('2019-01-01', self.signature, lambda: 'aaa') is None
+
+    def test_record(self, day_index, tmpdir):
+        day_index.record('2019-01-01', 'aaa', self.signature, summary, validation)
+        day_index.save()
+
+        day_index = DayIndex(tmpdir.join('manifest.json'))
+        entry = day_index.get('2019-01-01', self.signature, lambda: 'aaa')
+        assert entry.not_uploaded == 1
+        assert entry.billable_hours == 1.5
+        assert entry.validation == validation
+        # Changed since it was indexed
+        assert day_index.get('2019-01-01', [2, 100], lambda: 'bbb') is None
+        assert day_index.get('2019-01-02', self.signature, lambda: 'aaa') is None
+
+    def test_same_signature_skips_digest(self, day_index, mocker):
+        day_index.record('2019-01-01', 'aaa', self.signature, summary)
+        digest = mocker.Mock(return_value='aaa')
+
+        assert day_index.get('2019-01-01', self.signature, digest) is not None
+        assert digest.call_count == 0
+
+    def test_touched_day_is_digested(self, day_index, tmpdir):
+        day_index.record('2019-01-01', 'aaa', self.signature, summary, validation)
+        day_index.save()
+
+        entry = day_index.get('2019-01-01', [2, 100], lambda: 'aaa')
+
+        assert entry.validation == validation
+        assert entry.signature == [2, 100]
+        day_index.save()
+        assert DayIndex(tmpdir.join('manifest.json')).days['2019-01-01']['signature'] == [2, 100]
+
+    def test_without_signature_always_digests(self, day_index):
+        day_index.record('2019-01-01', 'aaa', None, summary)
+
+        assert day_index.get('2019-01-01', None, lambda: 'aaa') is not None
+        assert day_index.get('2019-01-01', None, lambda: 'bbb') is None
+
+    def test_unchanged_day_keeps_validation(self, day_index):
+        day_index.record('2019-01-01', 'aaa', self.signature, summary, validation)
+        day_index.record('2019-01-01', 'aaa', [2, 100], summary._replace(uploaded=2, not_uploaded=0))
+
+        entry = day_index.get('2019-01-01', [2, 100], lambda: 'aaa')
+        assert entry.validation == validation
+        assert entry.not_uploaded == 0
+
+    def test_changed_day_drops_validation(self, day_index):
+        day_index.record('2019-01-01', 'aaa', self.signature, summary, validation)
+        day_index.record('2019-01-01', 'bbb', [2, 101], summary)
+
+        assert day_index.get('2019-01-01', [2, 101], lambda: 'bbb').validation is None
+
+    def test_record_without_summary(self, day_index):
+        day_index.record('2019-01-01', 'aaa', self.signature, None)
+
+        assert day_index.get('2019-01-01', self.signature, lambda: 'aaa').entries is None
+
+    def test_save_without_changes_writes_nothing(self, day_index, tmpdir):
+        day_index.save()
+
+        assert not tmpdir.join('manifest.json').exists()
+
+    @pytest.mark.parametrize('contents', ['not json', '[]', '{"version": 2, "days": {}}'])
+    def test_unreadable_manifest_is_ignored(self, day_index, tmpdir, contents):
+        tmpdir.join('manifest.json').write(contents)
+
+        assert day_index.days == {}
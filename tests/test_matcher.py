@@ -0,0 +1,53 @@
+# Standard Library
+import random
+import re
+
+# Third Party Packages
+import pytest
+
+from toggl2harvest.matcher import ProjectCodeMatch, ProjectCodeMatcher
+
+
+class TestProjectCodeMatcher:
+    @pytest.mark.parametrize('codes,text,result', [
+        (['TEST'], 'TEST', ProjectCodeMatch('TEST', None)),
+        (['TEST'], 'TEST-123 Other text', ProjectCodeMatch('TEST', '-123')),
+        (['TEST'], 'Other text TEST-', ProjectCodeMatch('TEST', None)),
+        (['TEST', 'OTHER'], 'OTHER then TEST', ProjectCodeMatch('OTHER', None)),
+        # A shorter code doesn't shadow a longer one starting at the same place
+        (['AB', 'ABC'], 'ABC-1', ProjectCodeMatch('ABC', '-1')),
+        (['ABC', 'AB'], 'ABC-1', ProjectCodeMatch('ABC', '-1')),
+        # Leftmost wins over longest
+        (['BCDE', 'AB'], 'ABCDE', ProjectCodeMatch('AB', None)),
+        # Found through a fail link
+        (['ABCX', 'BC'], 'ABCD', ProjectCodeMatch('BC', None)),
+        # Codes are literal, not regular expressions
+        (['A.C'], 'ABC', None),
+        (['A.C'], 'xA.C', ProjectCodeMatch('A.C', None)),
+        # The original key is returned, not its string form
+        ([1234], 'Ticket 1234-5', ProjectCodeMatch(1234, '-5')),
+        ([], 'TEST', None),
+        (['TEST'], None, None),
+    ])
+    def test_search(self, codes, text, result):
+        assert ProjectCodeMatcher(codes).search(text) == result
+
+    def test_agrees_with_regex_for_prefix_free_codes(self):
+        rng = random.Random(1234)
+        alphabet = 'ABCD-1 '
+        for _ in range(200):
+            # The old regex is only leftmost-longest when no code is a prefix of another
+            codes = set()
+            while len(codes) < rng.randint(1, 8):
+                code = ''.join(rng.choice('ABCD') for _ in range(rng.randint(1, 4)))
+                if not any(c.startswith(code) or code.startswith(c) for c in codes):
+                    codes.add(code)
+            codes = sorted(codes)
+            project_re = re.compile(f'({"|".join(codes)})(-[0-9]+)?')
+            matcher = ProjectCodeMatcher(codes)
+
+            for _ in range(20):
+                text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 20)))
+                expected = project_re.search(text)
+                expected = (expected.group(1), expected.group(2)) if expected else None
+                assert matcher.search(text) == expected, (codes, text)
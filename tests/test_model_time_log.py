@@ -1,8 +1,22 @@
+# Standard Library
+from datetime import datetime as dt
+from datetime import timedelta as td
+from datetime import timezone
+
 # Third Party Packages
 import pytest
 
-from toggl2harvest.exceptions import InvalidHarvestProject, InvalidHarvestTask
-from toggl2harvest.models import HarvestCache, HarvestData, ProjectMapping, TimeLog, TogglData
+from toggl2harvest.exceptions import InvalidHarvestProject, InvalidHarvestTask, MissingHarvestProject
+from toggl2harvest.models import (
+    HarvestCache,
+    HarvestData,
+    HarvestResolver,
+    ProjectMapping,
+    TimeEntries,
+    TimeEntry,
+    TimeLog,
+    TogglData,
+)
 
 
 class TestUpdateHarvestTasks:
@@ -218,3 +232,155 @@ class TestUpdateHarvestTasks:
 
         assert time_log.harvest.project_id == 123
         assert time_log.harvest.task_id == 16
+
+
+class TestHarvestResolver:
+    @pytest.fixture
+    def project_mapping(self):
+        return ProjectMapping({
+            'TEST': {
+                'harvest': {
+                    'project': 123,
+                    'default_task': 'Development',
+                },
+                'task_mapping': {
+                    'Special Task': 'Task 6',
+                },
+            },
+        })
+
+    @pytest.fixture
+    def harvest_cache(self):
+        return HarvestCache([
+            {
+                'id': 123,
+                'name': 'Test project',
+                'tasks': {
+                    15: {'name': 'Development'},
+                    16: {'name': 'Task 6'},
+                },
+            },
+        ])
+
+    @pytest.fixture
+    def resolver(self):
+        return HarvestResolver()
+
+    def make_time_log(self, description='TEST-1 description', task=None, project_id=None):
+        return TimeLog(
+            project_code=None,
+            description=description,
+            is_billable=True,
+            time_entries=[],
+            toggl=TogglData(task=task),
+            harvest=HarvestData(project_id=project_id),
+        )
+
+    def test_resolves_like_uncached(self, resolver, project_mapping, harvest_cache):
+        for task in (None, 'Special Task'):
+            cached = self.make_time_log(task=task)
+            uncached = self.make_time_log(task=task)
+
+            cached.update_harvest_tasks(project_mapping, harvest_cache, resolver=resolver)
+            uncached.update_harvest_tasks(project_mapping, harvest_cache)
+
+            assert cached.harvest.project_id == uncached.harvest.project_id
+            assert cached.harvest.task_id == uncached.harvest.task_id
+
+    def test_repeats_are_hits(self, resolver, project_mapping, harvest_cache):
+        for _ in range(3):
+            time_log = self.make_time_log()
+            time_log.update_harvest_tasks(project_mapping, harvest_cache, resolver=resolver)
+            assert time_log.harvest.task_id == 15
+
+        assert resolver.hits == 2
+        assert resolver.misses == 1
+        assert resolver.stats() == '2 hits, 1 misses (67% hit rate)'
+
+    def test_caches_misses(self, resolver, project_mapping, harvest_cache):
+        for _ in range(2):
+            time_log = self.make_time_log(project_id=987)
+            with pytest.raises(InvalidHarvestProject):
+                time_log.update_harvest_tasks(project_mapping, harvest_cache, resolver=resolver)
+            assert time_log.harvest.project_id == 987
+            assert time_log.harvest.task_id is None
+
+        assert resolver.hits == 1
+
+    def test_caches_missing_project(self, resolver, project_mapping, harvest_cache):
+        for _ in range(2):
+            time_log = self.make_time_log(description='no code')
+            with pytest.raises(MissingHarvestProject):
+                time_log.update_harvest_tasks(project_mapping, harvest_cache, resolver=resolver)
+
+        assert resolver.hits == 1
+
+    def test_new_sources_invalidate(self, resolver, project_mapping, harvest_cache):
+        self.make_time_log().update_harvest_tasks(project_mapping, harvest_cache, resolver=resolver)
+
+        other_cache = HarvestCache([
+            {'id': 123, 'name': 'Test project', 'tasks': {25: {'name': 'Development'}}},
+        ])
+        time_log = self.make_time_log()
+        time_log.update_harvest_tasks(project_mapping, other_cache, resolver=resolver)
+
+        assert time_log.harvest.task_id == 25
+        assert resolver.misses == 2
+
+
+class TestTimeEntries:
+    mountain = timezone(td(hours=-7))
+    central = timezone(td(hours=-6))
+
+    def make_time_entries(self):
+        return TimeEntries([
+            TimeEntry(dt(2019, 1, 1, 9, tzinfo=self.mountain), dt(2019, 1, 1, 9, 30, 15, tzinfo=self.mountain)),
+            TimeEntry(dt(2019, 1, 1, 9, 45, tzinfo=self.mountain), dt(2019, 1, 1, 11, 0, tzinfo=self.central)),
+        ])
+
+    def test_entries_keep_their_offsets(self):
+        time_entries = self.make_time_entries()
+
+        assert len(time_entries) == 2
+        assert [(e.start.isoformat(), e.end.isoformat()) for e in time_entries] == [
+            ('2019-01-01T09:00:00-07:00', '2019-01-01T09:30:15-07:00'),
+            ('2019-01-01T09:45:00-07:00', '2019-01-01T11:00:00-06:00'),
+        ]
+        assert time_entries[-1].end == dt(2019, 1, 1, 10, tzinfo=self.mountain)
+
+    def test_keeps_microseconds_and_naive_datetimes(self):
+        entry = TimeEntry(dt(2019, 1, 1, 9, 0, 0, 500), dt(2019, 1, 1, 10))
+        time_entries = TimeEntries([entry])
+
+        assert time_entries[0].start == entry.start
+        assert time_entries[0].end.tzinfo is None
+
+    def test_durations(self):
+        time_entries = self.make_time_entries()
+
+        assert list(time_entries.durations()) == [1815 * 10 ** 6, 900 * 10 ** 6]
+        assert time_entries.total_time() == td(seconds=2715)
+
+    def test_append(self):
+        time_entries = TimeEntries()
+        assert not time_entries
+
+        time_entries.append(TimeEntry(dt(2019, 1, 1, 9, tzinfo=timezone.utc), dt(2019, 1, 1, 10, tzinfo=timezone.utc)))
+
+        assert time_entries.total_time() == td(hours=1)
+
+    @pytest.mark.parametrize('time_entries', [
+        lambda entries: entries,
+        lambda entries: list(entries),
+    ])
+    def test_time_log_total_time(self, time_entries):
+        time_log = TimeLog(None, None, True, time_entries(self.make_time_entries()))
+
+        assert time_log.total_time == td(seconds=2715)
+
+    def test_time_log_total_time_out_of_order(self):
+        start = dt(2019, 1, 1, 9, tzinfo=timezone.utc)
+        time_log = TimeLog(None, None, True, TimeEntries([TimeEntry(start, start)]))
+
+        with pytest.raises(AssertionError):
+            time_log.total_time
@@ -0,0 +1,113 @@
+# Third Party Packages
+import pytest
+
+from toggl2harvest.ratelimit import RateLimiter, TokenBucket, retry_after
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class MockResponse:
+    def __init__(self, status_code, headers={}):
+        self.status_code = status_code
+        self.headers = headers
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture(autouse=True)
+def sleep_mock(mocker):
+    return mocker.patch('time.sleep')
+
+
+class TestTokenBucket:
+    def test_burst_up_to_capacity(self, clock):
+        bucket = TokenBucket(rate=1, capacity=3, clock=clock)
+
+        waits = [bucket.reserve() for _ in range(3)]
+
+        assert waits == [0, 0, 0]
+
+    def test_reservations_queue_at_rate(self, clock):
+        bucket = TokenBucket(rate=2, capacity=1, clock=clock)
+
+        waits = [bucket.reserve() for _ in range(4)]
+
+        assert waits == [0, 0.5, 1.0, 1.5]
+
+    def test_refills_over_time(self, clock):
+        bucket = TokenBucket(rate=1, capacity=2, clock=clock)
+        bucket.reserve()
+        bucket.reserve()
+
+        clock.now += 2
+
+        assert bucket.reserve() == 0
+
+    def test_pause_holds_callers(self, clock):
+        bucket = TokenBucket(rate=10, capacity=10, clock=clock)
+
+        bucket.pause(5)
+
+        assert bucket.reserve() == 5
+
+
+class TestRetryAfter:
+    @pytest.mark.parametrize('headers,result', [
+        ({}, None),
+        ({'Retry-After': '7'}, 7),
+        ({'Retry-After': '-1'}, 0),
+        ({'Retry-After': 'garbage'}, None),
+    ])
+    def test_retry_after(self, headers, result):
+        assert retry_after(MockResponse(429, headers)) == result
+
+
+class TestRateLimiter:
+    def test_for_url_uses_host_quota(self):
+        limiter = RateLimiter.for_url('https://api.harvestapp.com/api/v2')
+
+        assert limiter.bucket.capacity == 100
+        assert limiter.bucket.rate == 100 / 15
+
+    def test_retries_throttled_requests(self, mocker, clock, sleep_mock):
+        limiter = RateLimiter(rate=100, capacity=100, clock=clock)
+        send = mocker.Mock(side_effect=[
+            MockResponse(429, {'Retry-After': '3'}),
+            MockResponse(200),
+        ])
+
+        r = limiter.request(send, 'url', json={})
+
+        assert r.status_code == 200
+        assert send.call_count == 2
+        send.assert_called_with('url', json={})
+        sleep_mock.assert_any_call(3.0)
+
+    def test_backs_off_without_retry_after(self, mocker, clock, sleep_mock):
+        limiter = RateLimiter(rate=100, capacity=100, backoff_base=1, clock=clock)
+        send = mocker.Mock(side_effect=[MockResponse(429), MockResponse(429), MockResponse(200)])
+
+        limiter.request(send)
+
+        delays = [c[0][0] for c in sleep_mock.call_args_list]
+        assert len(delays) == 2
+        assert 0 <= delays[0] <= 1
+        assert 0 <= delays[1] <= 2
+
+    def test_gives_up_after_max_retries(self, mocker, clock):
+        limiter = RateLimiter(rate=100, capacity=100, max_retries=2, clock=clock)
+        send = mocker.Mock(return_value=MockResponse(429))
+
+        r = limiter.request(send)
+
+        assert r.status_code == 429
+        assert send.call_count == 3
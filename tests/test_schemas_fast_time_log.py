@@ -0,0 +1,176 @@
+# Standard Library
+import copy
+import json
+import random
+
+# Third Party Packages
+import pytest
+from marshmallow.exceptions import ValidationError
+from ruamel.yaml import YAML
+
+from test_emitter import random_time_log
+from toggl2harvest import models
+from toggl2harvest.emitter import dump_time_logs
+from toggl2harvest.schemas import FastTimeLogSchema, TimeLogSchema
+from toggl2harvest.utils import fast_yaml
+
+
+def as_tuple(time_log):
+    time_entries = time_log.time_entries
+    if isinstance(time_entries, models.TimeEntries):
+        time_entries = (list(time_entries.starts), list(time_entries.ends), list(time_entries.offsets))
+    toggl, harvest = time_log.toggl, time_log.harvest
+    return (
+        time_log.project_code,
+        time_log.description,
+        time_log.is_billable,
+        time_entries,
+        (toggl.client, toggl.project, toggl.task, toggl.is_billable, toggl.description),
+        (harvest.project_id, harvest.task_name, harvest.task_id, harvest.uploaded, harvest.time_entry_id),
+    )
+
+
+def load(schema, data):
+    try:
+        time_log = schema.load(copy.deepcopy(data))
+    except ValidationError as e:
+        return ValidationError, e.messages
+    except TypeError:
+        return TypeError, None
+    assert type(time_log.project_code) in (str, type(None))
+    return models.TimeLog, as_tuple(time_log)
+
+
+def day_documents(seed, make_yaml):
+    rng = random.Random(seed)
+    time_logs = [random_time_log(rng) for _ in range(rng.randint(1, 10))]
+    return list(make_yaml().load_all(dump_time_logs(time_logs)))
+
+
+VALID = {
+    'project_code': 'PROJ',
+    'description': 'PROJ-1 Work',
+    'is_billable': True,
+    'time_entries': [{'s': '2019-01-01T09:00:00-07:00', 'e': '2019-01-01T10:00:00.000500+05:30'}],
+    'toggl': {'client': 'Client', 'project': 'Project', 'task': None, 'is_billable': False},
+    'harvest': {'project_id': 123, 'task_name': None, 'task_id': 5, 'uploaded': '2019-01-02T03:04:05+00:00'},
+}
+
+# (path, value) changes to VALID, a value of KeyError removes the key
+CHANGES = [
+    ((), []),
+    ((), 'text'),
+    (('extra',), 1),
+    (('project_code',), KeyError),
+    (('project_code',), 12),
+    (('description',), b'bytes'),
+    (('is_billable',), None),
+    (('is_billable',), 'true'),
+    (('is_billable',), 1),
+    (('is_billable',), KeyError),
+    (('time_entries',), KeyError),
+    (('time_entries',), {}),
+    (('time_entries',), [None]),
+    (('time_entries', 0, 's'), KeyError),
+    (('time_entries', 0, 'x'), '2019-01-01T09:00:00-07:00'),
+    (('time_entries', 0, 's'), None),
+    (('time_entries', 0, 's'), ''),
+    (('time_entries', 0, 's'), '2019-01-01T09:00:00'),
+    (('time_entries', 0, 's'), '2019-01-01T09:00:00Z'),
+    (('time_entries', 0, 's'), '2019-01-01 09:00:00-07:00'),
+    (('time_entries', 0, 's'), '2019-01-01T09:00:00.5-07:00'),
+    (('time_entries', 0, 's'), '2019-01-01T09:00-07:00'),
+    (('time_entries', 0, 's'), '2019-01-01T24:00:00-07:00'),
+    (('time_entries', 0, 's'), '2019-01-01T09:60:00-07:00'),
+    (('time_entries', 0, 's'), '2019-02-29T09:00:00-07:00'),
+    (('time_entries', 0, 's'), '2020-02-29T09:00:00-00:00'),
+    (('time_entries', 0, 's'), '2019-01-01T09:00:00-0700'),
+    (('time_entries', 0, 's'), '2019-01-01T09:00:00-24:00'),
+    (('time_entries', 0, 's'), '٢٠١٩-01-01T09:00:00-07:00'),
+    (('time_entries', 0, 's'), '2019-01-01T09:00:00-07:00\n'),
+    (('time_entries', 0, 'e'), '2019-01-01T10:00:00.000500+05:30\n'),
+    (('toggl',), None),
+    (('toggl',), KeyError),
+    (('toggl', 'description'), 'x'),
+    (('toggl', 'client'), 5),
+    (('toggl', 'is_billable'), None),
+    (('toggl', 'is_billable'), 'no'),
+    (('harvest',), 'x'),
+    (('harvest',), {}),
+    (('harvest', 'project_id'), '123'),
+    (('harvest', 'project_id'), 12.5),
+    (('harvest', 'task_id'), True),
+    (('harvest', 'time_entry_id'), 99),
+    (('harvest', 'uploaded'), None),
+    (('harvest', 'uploaded'), 'yesterday'),
+    (('harvest', 'uploaded'), '2019-01-02T03:04:05'),
+]
+
+
+def changed(data, path, value):
+    if not path:
+        return value
+    data = copy.deepcopy(data)
+    *parents, key = path
+    target = data
+    for parent in parents:
+        target = target[parent]
+    if value is KeyError:
+        del target[key]
+    else:
+        target[key] = value
+    return data
+
+
+class TestFastTimeLogSchema:
+    @pytest.fixture
+    def schema(self):
+        return FastTimeLogSchema()
+
+    @pytest.mark.parametrize('seed', range(20))
+    @pytest.mark.parametrize('make_yaml', [YAML, fast_yaml])
+    def test_loads_day_files_like_marshmallow(self, schema, seed, make_yaml):
+        for data in day_documents(seed, make_yaml):
+            assert load(schema, data) == load(TimeLogSchema(), data)
+
+    @pytest.mark.parametrize('seed', range(5))
+    def test_loads_sqlite_documents_like_marshmallow(self, schema, seed):
+        rng = random.Random(seed)
+        for time_log in [random_time_log(rng) for _ in range(10)]:
+            data = json.loads(json.dumps(TimeLogSchema().dump(time_log)))
+
+            assert load(schema, data) == load(TimeLogSchema(), data)
+
+    @pytest.mark.parametrize('path,value', CHANGES)
+    def test_changed_documents_like_marshmallow(self, schema, path, value):
+        data = changed(VALID, path, value)
+
+        assert load(schema, data) == load(TimeLogSchema(), data)
+
+    def test_valid_document(self, schema):
+        time_log = schema.load(VALID)
+
+        assert isinstance(time_log.time_entries, models.TimeEntries)
+        assert [e.end.isoformat() for e in time_log.time_entries] == ['2019-01-01T10:00:00.000500+05:30']
+        assert time_log.harvest.uploaded.isoformat() == '2019-01-02T03:04:05+00:00'
+
+    def test_invalid_document_raises_marshmallow_errors(self, schema):
+        with pytest.raises(ValidationError) as excinfo:
+            schema.load(changed(VALID, ('is_billable',), None))
+
+        assert excinfo.value.messages == {'is_billable': ['Field may not be null.']}
+
+    def test_uses_marshmallow_when_loading_many(self, schema, mocker):
+        fast_load = mocker.patch('toggl2harvest.schemas._time_log', autospec=True)
+
+        assert len(schema.load([VALID, VALID], many=True)) == 2
+        fast_load.assert_not_called()
+
+    @pytest.mark.parametrize('make_yaml', [YAML, fast_yaml])
+    def test_day_files_skip_marshmallow(self, schema, mocker, make_yaml):
+        marshmallow_load = mocker.patch.object(TimeLogSchema, 'load', autospec=True)
+
+        for data in day_documents(0, make_yaml):
+            schema.load(data)
+
+        marshmallow_load.assert_not_called()
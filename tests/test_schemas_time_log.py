@@ -1,6 +1,7 @@
 # Standard Library
 import collections
 from datetime import datetime as dt
+from datetime import timedelta as td
 from datetime import timezone
 
 # Third Party Packages
@@ -151,3 +152,19 @@ class TestTimeEntrySchema:
     def test_deserialize_invalid_data(self, schema, invalid_data):
         with pytest.raises(ValidationError):
             schema.load(invalid_data)
+
+    @pytest.mark.parametrize('valid_data,time_log', valid_data)
+    def test_deserialize_slotted_models(self, schema, valid_data, time_log):
+        new_obj = schema.load(valid_data)
+
+        for obj in [new_obj, new_obj.toggl, new_obj.harvest, *(new_obj.time_entries or [])]:
+            assert not hasattr(obj, '__dict__')
+        with pytest.raises(AttributeError):
+            new_obj.project = 'TEST'
+
+    def test_deserialize_columnar_time_entries(self, schema):
+        new_obj = schema.load(self.valid_data[3][0])
+
+        assert isinstance(new_obj.time_entries, models.TimeEntries)
+        assert new_obj.total_time == td(hours=1)
+        assert schema.dump(new_obj) == self.valid_data[3][0]
@@ -0,0 +1,59 @@
+# Standard Library
+import os
+
+from toggl2harvest.snapshot import load_snapshot, source_signature, write_snapshot
+
+
+def write(path, contents):
+    with open(path, 'w') as f:
+        f.write(contents)
+
+
+class TestSnapshot:
+    def test_round_trip(self, tmpdir):
+        source = tmpdir.join('source.yml')
+        write(source, 'a: 1\n')
+
+        write_snapshot(source_signature(source), tmpdir.join('source.pickle'), 'test', {'a': 1})
+
+        assert load_snapshot(source, tmpdir.join('source.pickle'), 'test') == {'a': 1}
+
+    def test_missing_snapshot(self, tmpdir):
+        source = tmpdir.join('source.yml')
+        write(source, 'a: 1\n')
+
+        assert load_snapshot(source, tmpdir.join('source.pickle'), 'test') is None
+
+    def test_corrupt_snapshot(self, tmpdir):
+        source = tmpdir.join('source.yml')
+        write(source, 'a: 1\n')
+        write(tmpdir.join('source.pickle'), 'garbage')
+
+        assert load_snapshot(source, tmpdir.join('source.pickle'), 'test') is None
+
+    def test_wrong_kind(self, tmpdir):
+        source = tmpdir.join('source.yml')
+        write(source, 'a: 1\n')
+
+        write_snapshot(source_signature(source), tmpdir.join('source.pickle'), 'test', {'a': 1})
+
+        assert load_snapshot(source, tmpdir.join('source.pickle'), 'other') is None
+
+    def test_changed_source(self, tmpdir):
+        source = tmpdir.join('source.yml')
+        write(source, 'a: 1\n')
+        write_snapshot(source_signature(source), tmpdir.join('source.pickle'), 'test', {'a': 1})
+
+        write(source, 'a: 2\n')
+        os.utime(source, ns=(0, 0))
+
+        assert load_snapshot(source, tmpdir.join('source.pickle'), 'test') is None
+
+    def test_touched_source_with_same_contents(self, tmpdir):
+        source = tmpdir.join('source.yml')
+        write(source, 'a: 1\n')
+        write_snapshot(source_signature(source), tmpdir.join('source.pickle'), 'test', {'a': 1})
+
+        os.utime(source, ns=(0, 0))
+
+        assert load_snapshot(source, tmpdir.join('source.pickle'), 'test') == {'a': 1}
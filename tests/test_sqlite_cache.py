@@ -0,0 +1,99 @@
+# Third Party Packages
+import pytest
+
+from toggl2harvest.models import HarvestCache
+from toggl2harvest.sqlite_cache import SqliteHarvestCache
+
+
+harvest_cache = [
+    {
+        'id': 1,
+        'name': 'Awesome project',
+        'active': True,
+        'client': {
+            'id': 5,
+            'name': 'Amazing Client',
+        },
+        'code': 'AWE',
+        'tasks': {
+            7: {'name': 'Project Management', 'link_active': True},
+            8: {'name': 'Development', 'link_active': True},
+        }
+    },
+    {
+        'id': 2,
+        'name': 'Taskless project',
+        'active': True,
+        'client': {
+            'id': 5,
+            'name': 'Amazing Client',
+        },
+        'code': None,
+        'tasks': {},
+    },
+]
+
+
+@pytest.fixture
+def cache(tmpdir):
+    cache = SqliteHarvestCache(tmpdir.join('harvest_cache.sqlite3'))
+    cache.populate(harvest_cache)
+    yield cache
+    cache.close()
+
+
+class TestSqliteHarvestCache:
+    def test_project_in_cache(self, cache):
+        assert cache.project_in_cache(1) == {'Project Management': 7, 'Development': 8}
+        assert cache.project_in_cache(2) == {}
+        assert cache.project_in_cache(3) is None
+
+    def test_get_task_id(self, cache):
+        assert cache.get_task_id(1, 'Development') == 8
+        assert cache.get_task_id(1, 'Something thats not there') is None
+        assert cache.get_task_id(3, 'Development') is None
+
+    def test_task_in_project(self, cache):
+        assert cache.task_in_project(1, 7) is True
+        assert cache.task_in_project(1, 1) is False
+        assert cache.task_in_project(3, 7) is False
+
+    def test_repeated_task_name(self, tmpdir):
+        projects = [{'id': 1, 'tasks': {9: {'name': 'Development'}, 8: {'name': 'Development'}}}]
+        cache = SqliteHarvestCache(tmpdir.join('repeated.sqlite3'))
+        cache.populate(projects)
+
+        # Both tasks belong to the project, the name resolves like HarvestCache does
+        assert cache.task_in_project(1, 8) is True
+        assert cache.task_in_project(1, 9) is True
+        assert cache.get_task_id(1, 'Development') == HarvestCache(projects).get_task_id(1, 'Development')
+        cache.close()
+
+    def test_persists_between_connections(self, cache, tmpdir):
+        reopened = SqliteHarvestCache(tmpdir.join('harvest_cache.sqlite3'))
+
+        assert reopened.get_task_id(1, 'Project Management') == 7
+
+    def test_populate_replaces_and_clears_lru(self, cache):
+        assert cache.get_task_id(1, 'Development') == 8
+
+        cache.populate([{**harvest_cache[0], 'tasks': {9: {'name': 'Development'}}}])
+
+        assert cache.get_task_id(1, 'Development') == 9
+        assert cache.project_in_cache(2) is None
+
+    def test_source_digest(self, cache):
+        assert cache.source_digest() is None
+
+        cache.populate(harvest_cache, 'abc')
+
+        assert cache.source_digest() == 'abc'
+
+    def test_lookups_are_cached(self, cache):
+        cache.get_task_id(1, 'Development')
+        cache.task_in_project(1, 7)
+        cache.project_in_cache(1)
+
+        info = cache._project_tasks.cache_info()
+        assert info.misses == 1
+        assert info.hits == 2
@@ -9,6 +9,7 @@ from requests.exceptions import HTTPError
 
 from toggl2harvest import toggl
 from toggl2harvest.models import TimeLog
+from toggl2harvest.utils import TRACE
 
 
 @pytest.fixture
@@ -20,6 +21,11 @@ def toggl_credentials():
     )
 
 
+@pytest.fixture(autouse=True)
+def sleep_mock(mocker):
+    return mocker.patch('time.sleep')
+
+
 @pytest.fixture
 def toggl_session(toggl_credentials):
     return toggl.TogglSession(toggl_credentials)
@@ -106,8 +112,7 @@ class TestRetrieveTimeEntries:
         assert session_mock.get.call_count == 1
         assert time_entries == [{'toggl': 'response'}]
 
-    def test_pages_data(self, mocker, toggl_session):
-        sleep_mock = mocker.patch('time.sleep')
+    def test_pages_data(self, mocker, toggl_session, sleep_mock):
         session_mock = mocker.patch.object(toggl_session, 'session', autospec=True)
         mocker.patch.object(
             session_mock, 'get',
@@ -129,7 +134,80 @@ class TestRetrieveTimeEntries:
 
         assert session_mock.get.call_count == 2
         assert time_entries == [{'toggl': 'response'}, {'toggl': 'response'}]
-        assert sleep_mock.call_count == 1
+        assert sleep_mock.call_count == 1  # Paced to the Toggl quota
+
+    def test_pages_reassembled_in_order(self, mocker, toggl_session):
+        def get_page(url, params):
+            page = params['page']
+            return MockResponse(200, {
+                'total_count': 10,
+                'per_page': 2,
+                'data': [{'page': page, 'i': 0}, {'page': page, 'i': 1}],
+            })
+
+        session_mock = mocker.patch.object(toggl_session, 'session', autospec=True)
+        mocker.patch.object(session_mock, 'get', side_effect=get_page)
+
+        time_entries = toggl_session.retrieve_time_entries(
+            start_date=dt(2019, 1, 1),
+            end_date=dt(2019, 1, 1),
+        )
+
+        assert session_mock.get.call_count == 5
+        assert time_entries == [
+            {'page': page, 'i': i}
+            for page in range(1, 6)
+            for i in range(2)
+        ]
+
+    def test_requests_oldest_first(self, mocker, toggl_session):
+        session_mock = mocker.patch.object(toggl_session, 'session', autospec=True)
+        mocker.patch.object(
+            session_mock, 'get',
+            return_value=MockResponse(200, {'total_count': 0, 'data': []}))
+
+        toggl_session.retrieve_time_entries(start_date=dt(2019, 1, 1), end_date=dt(2019, 1, 1))
+
+        _, kwargs = session_mock.get.call_args
+        assert kwargs['params']['order_field'] == 'date'
+        assert kwargs['params']['order_desc'] == 'off'
+
+    def test_pages_only_fetched_ahead_by_workers(self, mocker, toggl_credentials):
+        toggl_session = toggl.TogglSession(toggl_credentials, max_workers=2)
+
+        def get_page(url, params):
+            return MockResponse(200, {
+                'total_count': 20,
+                'per_page': 2,
+                'data': [{'page': params['page']}, {'page': params['page']}],
+            })
+
+        session_mock = mocker.patch.object(toggl_session, 'session', autospec=True)
+        mocker.patch.object(session_mock, 'get', side_effect=get_page)
+
+        entries = toggl_session.iter_time_entries(dt(2019, 1, 1), dt(2019, 1, 1))
+        for _ in range(4):
+            next(entries)
+
+        # The first two pages, then at most one page per worker past the one being read
+        assert session_mock.get.call_count <= 5
+        assert list(entries)[-1] == {'page': 10}
+        entries.close()
+
+    def test_bad_password_on_later_page(self, mocker, toggl_session):
+        session_mock = mocker.patch.object(toggl_session, 'session', autospec=True)
+        mocker.patch.object(
+            session_mock, 'get',
+            side_effect=[
+                MockResponse(200, {'total_count': 2, 'data': [{'toggl': 'response'}]}),
+                HTTPError(response=MockResponse(401, 'Unauthorized')),
+            ])
+
+        with pytest.raises(toggl.InvalidCredentialsError):
+            toggl_session.retrieve_time_entries(
+                start_date=dt(2019, 1, 1),
+                end_date=dt(2019, 1, 1),
+            )
 
     def test_bad_password(self, mocker, toggl_session):
         session_mock = mocker.patch.object(toggl_session, 'session', autospec=True)
@@ -217,3 +295,87 @@ class TestCreateTimeEntries:
         for entry in day_entries:
             assert isinstance(entry, TimeLog)
             assert len(entry.time_entries) == 1
+
+
+def report_entry(start, end, **fields):
+    return {**basic_data, 'start': start, 'end': end, **fields}
+
+
+class TestStreamTimeEntries:
+    def test_days_yielded_as_stream_moves_past_them(self, toggl_session):
+        consumed = []
+
+        def report_data():
+            for entry in [
+                report_entry('2019-01-01T12:00:00-07:00', '2019-01-01T12:30:00-07:00'),
+                report_entry('2019-01-01T13:00:00-07:00', '2019-01-01T13:30:00-07:00'),
+                report_entry('2019-01-02T09:00:00-07:00', '2019-01-02T09:30:00-07:00'),
+                report_entry('2019-01-02T10:00:00-07:00', '2019-01-02T10:30:00-07:00', task='Other'),
+            ]:
+                consumed.append(entry)
+                yield entry
+
+        days = toggl_session.stream_time_entries(report_data())
+
+        day, time_logs = next(days)
+        assert day == dt(2019, 1, 1).date()
+        assert [len(time_log.time_entries) for time_log in time_logs] == [2]
+        # Only read up to the first entry of the next day
+        assert len(consumed) == 3
+
+        day, time_logs = next(days)
+        assert day == dt(2019, 1, 2).date()
+        assert len(time_logs) == 2
+        assert list(days) == []
+
+    def test_matches_create_time_entries(self, toggl_session):
+        report_data = [
+            report_entry('2019-01-01T12:00:00-07:00', '2019-01-01T12:30:00-07:00'),
+            report_entry('2019-01-01T12:30:00-07:00', '2019-01-01T13:00:00-07:00', client='Other'),
+            report_entry('2019-01-01T13:00:00-07:00', '2019-01-01T13:30:00-07:00'),
+            report_entry('2019-01-03T09:00:00-07:00', '2019-01-03T09:30:00-07:00'),
+        ]
+
+        streamed = dict(toggl_session.stream_time_entries(report_data))
+        created = toggl_session.create_time_entries(report_data)
+
+        assert list(streamed) == list(created)
+        for day in created:
+            assert [time_log.toggl_key() for time_log in streamed[day]] == \
+                [time_log.toggl_key() for time_log in created[day]]
+
+    def test_unordered_report_raises(self, toggl_session):
+        report_data = [
+            report_entry('2019-01-02T12:00:00-07:00', '2019-01-02T12:30:00-07:00'),
+            report_entry('2019-01-01T12:00:00-07:00', '2019-01-01T12:30:00-07:00'),
+        ]
+
+        with pytest.raises(ValueError):
+            list(toggl_session.stream_time_entries(report_data))
+
+
+class TestGroupDay:
+    def report_entries(self, toggl_session, count):
+        schema = toggl.TogglReportEntrySchema()
+        return [
+            schema.load(report_entry(
+                '2019-01-01T12:00:00-07:00', '2019-01-01T12:30:00-07:00', description=f'Task {i}'))
+            for i in range(count)
+        ]
+
+    def test_map_not_formatted_unless_tracing(self, mocker, toggl_session):
+        pformat_mock = mocker.patch('toggl2harvest.toggl.pformat')
+
+        time_logs = toggl.group_day(self.report_entries(toggl_session, 3))
+
+        assert len(time_logs) == 3
+        assert pformat_mock.call_count == 0
+
+    def test_map_formatted_when_tracing(self, mocker, caplog, toggl_session):
+        caplog.set_level(TRACE, logger='toggl2harvest.toggl')
+        pformat_mock = mocker.patch('toggl2harvest.toggl.pformat', return_value='{}')
+
+        toggl.group_day(self.report_entries(toggl_session, 3))
+
+        assert pformat_mock.call_count == 3
+        assert 'days_unqiue_map' in caplog.text
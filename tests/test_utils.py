@@ -1,5 +1,6 @@
 # Standard Library
 import io
+import logging
 from datetime import datetime as dt
 from datetime import timedelta as td
 from datetime import timezone as tz
@@ -181,3 +182,106 @@ class TestOperateOnDayData:
             output_value = output.getvalue()
 
         assert output_value == file_contents
+
+
+class TestAtomicFileUpdate:
+    @pytest.fixture
+    def day_file(self, tmpdir):
+        day_file = tmpdir.join('2019-01-01.yml')
+        day_file.write('original\n')
+        return day_file
+
+    @pytest.fixture
+    def fsync_mock(self, mocker):
+        return mocker.patch('toggl2harvest.utils.os.fsync', wraps=utils.os.fsync)
+
+    def test_commit_replaces_file(self, day_file, fsync_mock):
+        with utils.AtomicFileUpdate(str(day_file)) as file:
+            assert file.input.read() == 'original\n'
+            file.output.write('updated\n')
+            file.commit()
+
+        assert day_file.read() == 'updated\n'
+        assert not day_file.new(basename='2019-01-01.yml.tmp').exists()
+        # The new contents, then the directory for the rename
+        assert fsync_mock.call_count == 2
+
+    def test_no_commit_leaves_file(self, day_file, fsync_mock):
+        with utils.AtomicFileUpdate(str(day_file)) as file:
+            file.output.write('updated\n')
+
+        assert day_file.read() == 'original\n'
+        assert fsync_mock.call_count == 0
+
+    def test_identical_output_is_not_written(self, day_file, mocker, fsync_mock):
+        rename_mock = mocker.patch('toggl2harvest.utils.os.rename')
+
+        with utils.AtomicFileUpdate(str(day_file)) as file:
+            file.output.write(file.input.read())
+            file.commit()
+
+        assert rename_mock.call_count == 0
+        assert fsync_mock.call_count == 0
+
+    @pytest.mark.parametrize('durability,fsyncs', [('none', 0), ('file', 1), ('full', 2)])
+    def test_durability(self, day_file, fsync_mock, durability, fsyncs):
+        with utils.AtomicFileUpdate(str(day_file), durability=durability) as file:
+            file.output.write('updated\n')
+            file.commit()
+
+        assert day_file.read() == 'updated\n'
+        assert fsync_mock.call_count == fsyncs
+
+    def test_missing_file_is_created(self, tmpdir):
+        day_file = tmpdir.join('2019-01-02.yml')
+
+        with utils.AtomicFileUpdate(str(day_file)) as file:
+            assert file.input.read() == ''
+            file.output.write('created\n')
+            file.commit()
+
+        assert day_file.read() == 'created\n'
+
+
+class TestFsyncBatch:
+    def test_group_commit(self, tmpdir, mocker):
+        day_files = [tmpdir.join(f'2019-01-0{day}.yml') for day in range(1, 4)]
+        for day_file in day_files:
+            day_file.write('original\n')
+        fsync_mock = mocker.patch('toggl2harvest.utils.os.fsync', wraps=utils.os.fsync)
+
+        with utils.FsyncBatch() as batch:
+            for day_file in day_files:
+                with utils.AtomicFileUpdate(str(day_file), batch=batch) as file:
+                    file.output.write('updated\n')
+                    file.commit()
+            # Nothing lands before the batch ends
+            assert [day_file.read() for day_file in day_files] == ['original\n'] * 3
+            assert fsync_mock.call_count == 0
+
+        assert [day_file.read() for day_file in day_files] == ['updated\n'] * 3
+        # One per file and a single one for their directory
+        assert fsync_mock.call_count == 4
+
+    def test_pending_file_is_flushed_before_update(self, tmpdir):
+        day_file = tmpdir.join('2019-01-01.yml')
+        day_file.write('original\n')
+
+        with utils.FsyncBatch() as batch:
+            for contents in ['first\n', 'second\n']:
+                with utils.AtomicFileUpdate(str(day_file), batch=batch) as file:
+                    file.output.write(file.input.read() + contents)
+                    file.commit()
+
+        assert day_file.read() == 'original\nfirst\nsecond\n'
+
+
+class TestConfigureLogging:
+    @pytest.mark.parametrize('trace,level', [(False, logging.WARNING), (True, utils.TRACE)])
+    def test_level(self, mocker, trace, level):
+        basic_config_mock = mocker.patch('toggl2harvest.utils.logging.basicConfig')
+
+        utils.configure_logging(trace=trace)
+
+        _, kwargs = basic_config_mock.call_args
+        assert kwargs['level'] == level
@@ -2,7 +2,9 @@
 import logging
 import os
 from collections import namedtuple
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from os.path import expanduser
 from pathlib import Path
 
@@ -11,23 +13,34 @@ from boltons.cacheutils import cachedproperty
 from marshmallow.exceptions import ValidationError as MarshmallowValidationError
 from requests.exceptions import HTTPError
 from ruamel.yaml import YAML
+from ruamel.yaml.error import YAMLError
 
 from . import harvest, schemas, toggl
+from .day_store import SqliteDayStore, YamlDayStore
+from .emitter import dump_time_logs
 from .exceptions import (
     IncompleteHarvestData,
     InvalidFileError,
     InvalidHarvestProject,
     InvalidHarvestTask,
+    MissingHarvestCacheError,
     MissingHarvestProject,
     MissingHarvestTask,
 )
-from .models import HarvestCache, HarvestEntry, ProjectMapping
-from .utils import AtomicFileUpdate, iso_timestamp
+from .journal import UploadJournal, entry_fingerprint
+from .manifest import DayIndex, summarize_day
+from .models import HarvestCache, HarvestEntry, HarvestResolver, ProjectMapping
+from .snapshot import file_digest, load_snapshot, source_signature, write_snapshot
+from .sqlite_cache import SqliteHarvestCache
+from .utils import fast_yaml, iso_timestamp
 
 
 log = logging.getLogger(__name__)
 
 
+HARVEST_CACHE_BACKENDS = ('yaml', 'sqlite')
+DAY_STORE_BACKENDS = ('yaml', 'sqlite')
+
 TimeEntryWriteResult = namedtuple(
     'TimeEntryWriteResult',
     ' '.join([
@@ -37,10 +50,34 @@ TimeEntryWriteResult = namedtuple(
 )
 
 
+ValidationResult = namedtuple(
+    'ValidationResult',
+    ' '.join([
+        'day',
+        'errors',
+    ])
+)
+
+
+UploadResult = namedtuple(
+    'UploadResult',
+    ' '.join([
+        'day',
+        'messages',
+        'error',
+    ])
+)
+
+
 class TogglHarvestApp(object):
 
-    def __init__(self, config_dir=None):
+    def __init__(self, config_dir=None, harvest_cache_backend='yaml', day_store_backend='yaml', durability='full'):
         self.config_dir = expanduser(config_dir or '.')
+        self.harvest_cache_backend = harvest_cache_backend
+        self.day_store_backend = day_store_backend
+        self.durability = durability
+        self._index_updates = None
+        self._committed_uploads = None
 
     @cachedproperty
     def cred_file(self):
@@ -56,6 +93,12 @@ class TogglHarvestApp(object):
         """Data file for this application."""
         return Path(self.data_dir, file_name + '.yml')
 
+    @cachedproperty
+    def day_store(self):
+        if self.day_store_backend == 'sqlite':
+            return SqliteDayStore(Path(self.data_dir, 'time_logs.sqlite3'), durability=self.durability)
+        return YamlDayStore(self.data_dir, durability=self.durability)
+
     @cachedproperty
     def toggl_cred(self):
         return toggl.TogglCredentials.read_from_file(self.cred_file)
@@ -76,132 +119,676 @@ class TogglHarvestApp(object):
     def _harvest_cache_file(self):
         return Path(os.path.join(self.config_dir, 'harvest_cache.yml'))
 
+    @cachedproperty
+    def _harvest_cache_state_file(self):
+        return Path(os.path.join(self.config_dir, 'harvest_cache_state.yml'))
+
+    @cachedproperty
+    def _harvest_cache_snapshot_file(self):
+        return Path(os.path.join(self.config_dir, 'harvest_cache.pickle'))
+
+    @cachedproperty
+    def _harvest_cache_db_file(self):
+        return Path(os.path.join(self.config_dir, 'harvest_cache.sqlite3'))
+
     @cachedproperty
     def harvest_cache(self):
+        if self.harvest_cache_backend == 'sqlite':
+            return self._sqlite_harvest_cache()
+
+        indexes = load_snapshot(self._harvest_cache_file, self._harvest_cache_snapshot_file, 'harvest_cache')
+        if indexes is not None:
+            return HarvestCache.from_indexes(*indexes)
+
+        signature = source_signature(self._harvest_cache_file)
+        harvest_cache = HarvestCache(self._load_harvest_cache_file())
+        self._snapshot_harvest_cache(signature, harvest_cache)
+        return harvest_cache
+
+    def _load_harvest_cache_file(self):
         schema = schemas.HarvestCacheEntrySchema()
-        harvest_projects = []
-        with YAML() as yaml:
-            for i, entry in enumerate(yaml.load_all(self._harvest_cache_file)):
-                harvest_projects.append(schema.load(entry))
-        return HarvestCache(harvest_projects)
+        with fast_yaml() as yaml:
+            return [schema.load(entry) for entry in yaml.load_all(self._harvest_cache_file)]
+
+    def _sqlite_harvest_cache(self):
+        """The SQLite Harvest cache, first filled from harvest_cache.yml when it's empty or out of date."""
+        harvest_cache = SqliteHarvestCache(self._harvest_cache_db_file)
+        try:
+            digest = file_digest(self._harvest_cache_file)
+        except FileNotFoundError:
+            digest = None
+
+        if digest is None:
+            if harvest_cache.source_digest() is None:
+                raise MissingHarvestCacheError(
+                    'The Harvest cache is empty, run "toggl2harvest harvest-cache" to fill it')
+        elif digest != harvest_cache.source_digest():
+            log.info('Filling the SQLite Harvest cache from %s', self._harvest_cache_file)
+            harvest_cache.populate(self._load_harvest_cache_file(), digest)
+        return harvest_cache
+
+    def _snapshot_harvest_cache(self, signature, harvest_cache):
+        write_snapshot(
+            signature,
+            self._harvest_cache_snapshot_file,
+            'harvest_cache',
+            (harvest_cache.tasks_by_name, harvest_cache.project_tasks),
+        )
 
     @cachedproperty
     def project_file(self):
         return Path(os.path.join(self.config_dir, 'project_mapping.yml'))
 
+    @cachedproperty
+    def _project_mapping_snapshot_file(self):
+        return Path(os.path.join(self.config_dir, 'project_mapping.pickle'))
+
     @cachedproperty
     def project_mapping(self):
-        with YAML() as yaml:
-            return ProjectMapping(yaml.load(self.project_file))
+        project_mapping = load_snapshot(self.project_file, self._project_mapping_snapshot_file, 'project_mapping')
+        if project_mapping is not None:
+            return project_mapping
+
+        signature = source_signature(self.project_file)
+        with fast_yaml() as yaml:
+            project_mapping = ProjectMapping(yaml.load(self.project_file))
+        write_snapshot(signature, self._project_mapping_snapshot_file, 'project_mapping', project_mapping)
+        return project_mapping
+
+    @cachedproperty
+    def upload_journal(self):
+        return UploadJournal(Path(self.config_dir, 'upload_journal.jsonl'))
+
+    @cachedproperty
+    def day_index(self):
+        return DayIndex(Path(self.data_dir, 'manifest.json'))
+
+    @cachedproperty
+    def _validation_sources(self):
+        """Digests of the project mapping and Harvest cache files, None when either can't be read."""
+        try:
+            return file_digest(self.project_file), file_digest(self._harvest_cache_file)
+        except OSError:
+            return None
+
+    def _validation(self, file_errors):
+        if self._validation_sources is None:
+            return None
+        return [*self._validation_sources, file_errors]
+
+    def _day_index_entry(self, day):
+        """Index entry of a stored day, None when the day is missing or changed since it was indexed."""
+        if not self.day_store.exists(day):
+            return None
+        return self.day_index.get(day, self.day_store.signature(day), lambda: self.day_store.digest(day))
+
+    def _is_validated(self, day):
+        entry = self._day_index_entry(day)
+        return entry is not None and self._validation_sources is not None and \
+            entry.validation == self._validation(0)
+
+    def _needs_upload(self, day):
+        entry = self._day_index_entry(day)
+        return entry is None or entry.not_uploaded is None or entry.not_uploaded > 0
+
+    def _index_day(self, day, summary, validation=None):
+        """Record a day that was just written or checked in the day index."""
+        if self._index_updates is not None:
+            # Applied once the batch has written the day
+            self._index_updates.append((day, summary, validation))
+            return
+        self._apply_index_updates([(day, summary, validation)])
+
+    def _apply_index_updates(self, updates):
+        for day, summary, validation in updates:
+            if self.day_store.exists(day):
+                # Signed before digesting, so a write in between can't be trusted as unchanged
+                signature = self.day_store.signature(day)
+                self.day_index.record(day, self.day_store.digest(day), signature, summary, validation)
+        self.day_index.save()
+
+    @contextmanager
+    def _batch(self):
+        """Group commit the day store writes inside the block, then index the days written."""
+        self._index_updates = []
+        self._committed_uploads = []
+        try:
+            with self.day_store.batch():
+                yield
+            # The batch has written the stamps, their journal records aren't needed anymore
+            self._drop_journal_records(self._committed_uploads)
+        finally:
+            updates, self._index_updates = self._index_updates, None
+            self._committed_uploads = None
+            self._apply_index_updates(updates)
+
+    @cachedproperty
+    def harvest_resolver(self):
+        return HarvestResolver()
 
     @cachedproperty
     def time_log_schema(self):
-        return schemas.TimeLogSchema()
+        return schemas.FastTimeLogSchema()
+
+    def cache_harvest_projects(self, full=False):
+        """Refresh the Harvest cache, only fetching changes since the last sync unless ``full``."""
+        synced_at = f'{datetime.now(timezone.utc):%Y-%m-%dT%H:%M:%SZ}'
+        updated_since = None if full else self._harvest_cache_synced_at()
+
+        if updated_since is None:
+            harvest_projects = self.harvest_api.cache_projects_via_api()
+        else:
+            with fast_yaml() as yaml:
+                cached_projects = list(yaml.load_all(self._harvest_cache_file))
+            harvest_projects = self.harvest_api.cache_projects_via_api(
+                updated_since=updated_since,
+                cached_projects=cached_projects,
+            )
 
-    def cache_harvest_projects(self):
-        harvest_projects = self.harvest_api.cache_projects_via_api()
         yaml = YAML()
         yaml.dump_all(harvest_projects, self._harvest_cache_file)
+        yaml.dump({'updated_since': synced_at}, self._harvest_cache_state_file)
+        if self.harvest_cache_backend == 'sqlite':
+            harvest_cache = SqliteHarvestCache(self._harvest_cache_db_file)
+            harvest_cache.populate(harvest_projects, file_digest(self._harvest_cache_file))
+            harvest_cache.close()
+        else:
+            self._snapshot_harvest_cache(
+                source_signature(self._harvest_cache_file),
+                HarvestCache(harvest_projects))
+
+    def _harvest_cache_synced_at(self):
+        if not self._harvest_cache_file.is_file():
+            return None
+        try:
+            with fast_yaml() as yaml:
+                return yaml.load(self._harvest_cache_state_file)['updated_since']
+        except (OSError, TypeError, KeyError):
+            return None
 
     def download_toggl_data(self, start, end):
-        toggl_time_entries = self.toggl_api.retrieve_time_entries(
+        toggl_time_entries = self.toggl_api.iter_time_entries(
             start,
             end,
             params=self.toggl_api.toggl_download_params(self.cred_file)
         )
-        return self.toggl_api.create_time_entries(toggl_time_entries)
+        return self.toggl_api.stream_time_entries(toggl_time_entries)
+
+    def write_time_entries(self, time_entries, merge=False):
+        """Write each day of TimeLogs, yielding a TimeEntryWriteResult per day.
+
+        ``time_entries`` is a dict or an iterable of ``(day, time_logs)``, such as the stream from
+        download_toggl_data. Days already stored are skipped, or with ``merge`` have the new time
+        entries added.
+        """
+        if isinstance(time_entries, dict):
+            time_entries = time_entries.items()
+
+        with self._batch():
+            for day, day_entries in time_entries:
+                day_key = f'{day:%Y-%m-%d}'
+                # TODO: Check that date hasn't been opened before
+                if self.day_store.exists(day_key):
+                    written = merge and self._merge_day(day_key, day_entries)
+                    yield TimeEntryWriteResult(day=day, written=written)
+                    continue  # Don't overwrite existing data
+
+                self.day_store.write_day(day_key, day_entries)
+                self._index_day(day_key, summarize_day(day_entries))
+
+                yield TimeEntryWriteResult(day=day, written=True)
+
+    def _merge_day(self, day, time_logs):
+        """Add the time entries in ``time_logs`` that the stored day doesn't have yet.
+
+        New entries go to the stored log with the same Toggl key, or a new log when there is
+        none or it was already uploaded. Stored logs, user edits and Harvest fields included,
+        are otherwise left alone.
+        Returns whether the day changed.
+        """
+        changed = False
+        try:
+            with self.day_store.update_day(day) as documents:
+                stored_time_logs = []
+                stored_logs = {}
+                stored_entries = set()
+                for data in documents:
+                    time_log = self.time_log_schema.load(data)
+                    stored_time_logs.append(time_log)
+                    if time_log.harvest.uploaded is None:
+                        # Time added to an uploaded log would never reach Harvest
+                        stored_logs.setdefault(time_log.toggl_key(), (data, time_log))
+                    stored_entries.update((entry.start, entry.end) for entry in time_log.time_entries or ())
+
+                for time_log in time_logs:
+                    new_entries = [
+                        entry for entry in time_log.time_entries
+                        if (entry.start, entry.end) not in stored_entries
+                    ]
+                    if not new_entries:
+                        continue
+                    changed = True
+
+                    # Written like a freshly downloaded day would be
+                    time_log.time_entries = new_entries
+                    yaml = YAML()
+                    yaml.preserve_quotes = True
+                    new_data = yaml.load(dump_time_logs([time_log]))
+
+                    data, stored_log = stored_logs.get(time_log.toggl_key(), (None, None))
+                    if data is None:
+                        documents.append(new_data)
+                        stored_time_logs.append(time_log)
+                        stored_logs[time_log.toggl_key()] = (new_data, time_log)
+                    elif data.get('time_entries') is None:
+                        data['time_entries'] = new_data['time_entries']
+                        stored_log.time_entries = list(new_entries)
+                    else:
+                        data['time_entries'].extend(new_data['time_entries'])
+                        stored_log.time_entries.extend(new_entries)
+        except MarshmallowValidationError:
+            log.warning('%s has unparseable entries, not merging into it', day)
+            return False
+
+        self._index_day(day, summarize_day(stored_time_logs))
+        return changed
+
+    def export_days(self, days, directory):
+        """Write the stored ``days`` out as YAML day files in ``directory``, yielding the days written."""
+        for day in days:
+            if not self.day_store.exists(day):
+                continue
+            with open(Path(directory, day + '.yml'), 'w') as f:
+                f.write(self.day_store.export_day(day))
+            yield day
+
+    def import_days(self, days, directory):
+        """Replace the stored ``days`` with the YAML day files in ``directory``, yielding the days read."""
+        for day in days:
+            day_file = Path(directory, day + '.yml')
+            if not day_file.is_file():
+                continue
+            with open(day_file, 'r') as f:
+                self.day_store.import_day(day, f.read())
+            # Imported as edited, checked again on the next validation
+            self._index_day(day, None)
+            yield day
+
+    def validate_days(self, days, jobs=1):
+        """Validate the stored days among ``days``, yielding a ValidationResult per day in the order given.
+
+        With more than one job the days are validated in a pool of ``jobs`` processes, each
+        loading the project mapping and Harvest cache once.
+        """
+        days = [day for day in days if self.day_store.exists(day)]
+        # Days unchanged since they were last found valid are skipped without parsing them
+        pending = [day for day in days if not self._is_validated(day)]
+
+        with self._batch():
+            yield from self._validation_results(days, pending, jobs)
+
+        log.info('Harvest resolution cache: %s', self.harvest_resolver.stats())
+
+    def _validation_results(self, days, pending, jobs):
+        if jobs == 1:
+            results = (ValidationResult(day=day, errors=self._validate_day(day)) for day in pending)
+            yield from self._merge_validation_results(days, results)
+            return
+
+        if self.harvest_cache_backend == 'sqlite':
+            # Brought up to date once here rather than by every worker at the same time
+            self._sqlite_harvest_cache().close()
+
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_validation_worker,
+            initargs=(self.config_dir, self.harvest_cache_backend, self.day_store_backend, self.durability),
+        ) as workers:
+            yield from self._merge_validation_results(
+                days, self._worker_results(workers.map(_validate_day_in_worker, pending)))
+
+    def _worker_results(self, results):
+        for result, index_updates, (hits, misses) in results:
+            # Workers leave the day index to this process, and count their lookups towards its resolver
+            self._index_updates.extend(index_updates)
+            self.harvest_resolver.hits += hits
+            self.harvest_resolver.misses += misses
+            yield result
+
+    def _merge_validation_results(self, days, results):
+        results = iter(results)
+        pending = next(results, None)
+        for day in days:
+            if pending is not None and pending.day == day:
+                yield pending
+                pending = next(results, None)
+            else:
+                yield ValidationResult(day=day, errors=0)
 
-    def write_time_entries(self, time_entries):
-        schema = schemas.TimeLogSchema()
-        for day, day_entries in time_entries.items():
-            day_file = Path(self.data_dir, f'{day:%Y-%m-%d}.yml')
-            # TODO: Check that date hasn't been opened before
-            if day_file.exists():
-                yield TimeEntryWriteResult(day=day, written=False)
-                continue  # Don't overwrite existing data
+    def validate_file(self, day_file):
+        """Validate the day stored as ``day_file`` in the data directory."""
+        return self.validate_day(Path(day_file).stem)
 
-            with YAML(output=day_file) as yaml:
-                for entry in day_entries:
-                    yaml.dump(schema.dump(entry))
+    def validate_day(self, day):
+        if not self.day_store.exists(day):
+            return 0
 
-            yield TimeEntryWriteResult(day=day, written=True)
+        if self._is_validated(day):
+            return 0
 
-    def validate_file(self, day_file):
+        return self._validate_day(day)
+
+    def _validate_day(self, day):
         file_errors = 0
 
-        if not day_file.is_file():
+        entries = self._read_only_pass(day)
+        if entries is not None:
+            file_errors = sum(not valid for _, valid in entries)
+            self._index_day(day, summarize_day([time_log for time_log, _ in entries]), self._validation(file_errors))
             return file_errors
 
-        with AtomicFileUpdate(day_file) as file, YAML(output=file.output) as yaml:
-            try:
-                for i, data in enumerate(yaml.load_all(file.input)):
+        time_logs = []
+        try:
+            with self.day_store.update_day(day) as documents:
+                for i, data in enumerate(documents):
                     time_log = self.time_log_schema.load(data)
-                    updated_data, valid, = self._update_entry(i, data, time_log)
+                    _, valid, = self._update_entry(i, data, time_log)
                     file_errors += not valid
-                    yaml.dump(updated_data)
-                file.commit()
-            except MarshmallowValidationError:
-                file_errors += 1
-                pass  # Atomic File Update will rollback any changes to the file
-
+                    time_logs.append(time_log)
+        except MarshmallowValidationError:
+            file_errors += 1
+            time_logs = None
+            pass  # Raising out of the update leaves the stored day untouched
+
+        summary = None if time_logs is None else summarize_day(time_logs)
+        self._index_day(day, summary, self._validation(file_errors))
         return file_errors
 
+    def _read_only_pass(self, day):
+        """Resolve a day with the fast loader, without writing it back.
+
+        Returns ``(time_log, valid)`` per entry, or None when the day has to go through
+        the update path: an entry doesn't parse or resolving it would change the day.
+        """
+        entries = []
+        try:
+            for i, data in enumerate(self.day_store.read_day(day)):
+                time_log = self.time_log_schema.load(data)
+                harvest = data.get('harvest')
+                if not isinstance(harvest, dict):
+                    return None
+                before = (harvest.get('project_id'), harvest.get('task_id'))
+                data, valid, = self._update_entry(i, data, time_log)
+                if before != (harvest.get('project_id'), harvest.get('task_id')):
+                    return None
+                entries.append((time_log, valid))
+        except (MarshmallowValidationError, YAMLError, AttributeError):
+            return None
+        return entries
+
+    def _upload_results_without_uploading(self, day):
+        """Upload messages for a day with nothing to upload or write back, otherwise None."""
+        entries = self._read_only_pass(day)
+        if entries is None:
+            return None
+        self._index_day(day, summarize_day([time_log for time_log, _ in entries]))
+
+        results = []
+        for time_log, valid in entries:
+            if not valid:
+                results.append('Entry invalid, skipping')
+            elif not time_log.is_billable:
+                results.append('Not billable, skipping.')
+            elif time_log.harvest.uploaded is not None:
+                results.append('Already uploaded, skipping.')
+            else:
+                return None
+        return results
+
     def _update_entry(self, i, data, time_log):
         valid = True
         try:
             time_log.update_harvest_tasks(
-                self.project_mapping, self.harvest_cache)
+                self.project_mapping, self.harvest_cache, resolver=self.harvest_resolver)
             data['harvest']['project_id'] = time_log.harvest.project_id
             data['harvest']['task_id'] = time_log.harvest.task_id
         except IncompleteHarvestData as e:
             if isinstance(e, MissingHarvestProject):
-                log.debug(f'Harvest Project missing for entry {i}')
+                log.debug('Harvest Project missing for entry %d', i)
             elif isinstance(e, MissingHarvestTask):
-                log.debug(f'Harvest Task missing for entry {i}')
+                log.debug('Harvest Task missing for entry %d', i)
             elif isinstance(e, InvalidHarvestTask):
-                log.debug(f'Harvest Task invalid for entry {i}')
+                log.debug('Harvest Task invalid for entry %d', i)
             elif isinstance(e, InvalidHarvestProject):
-                log.debug(f'Harvest Project invalid for entry {i}')
+                log.debug('Harvest Project invalid for entry %d', i)
             valid = False
 
         return data, valid
 
-    def upload_to_harvest(self, day):
-        day_file = self.data_file(day)
+    def upload_days_to_harvest(self, days, jobs=1):
+        """Upload the stored days among ``days``, yielding an UploadResult per day in the order given.
+
+        Up to ``jobs`` days are open at once and their entries share a pool of ``jobs``
+        upload workers.
+        """
+        # Stamp uploads a previous, interrupted run didn't get to write
+        self.replay_upload_journal()
+
+        days = [day for day in days if self.day_store.exists(day)]
+        # Days the index knows have nothing left to upload are skipped without reading them
+        days = [day for day in days if self._needs_upload(day)]
+        if not days:
+            return
+
+        self._prime_upload_state()
+
+        with self._batch(), \
+                ThreadPoolExecutor(max_workers=jobs) as uploads, \
+                ThreadPoolExecutor(max_workers=jobs) as day_workers:
+            yield from day_workers.map(
+                lambda day: self._upload_day_to_harvest(day, uploads),
+                days)
+
+        log.info('Harvest resolution cache: %s', self.harvest_resolver.stats())
+
+    def _prime_validation_state(self):
+        # Loaded once per validation worker instead of once per day
+        for name in ('project_mapping', 'harvest_cache'):
+            getattr(self, name)
+
+    def _prime_upload_state(self):
+        # Cached properties aren't thread safe, they have to exist before the upload workers use them
+        for name in ('harvest_api', 'project_mapping', 'harvest_cache'):
+            getattr(self, name)
+
+    def _upload_day_to_harvest(self, day, executor):
+        try:
+            return UploadResult(day=day, messages=self.upload_to_harvest(day, executor), error=None)
+        except InvalidFileError as e:
+            return UploadResult(day=day, messages=[], error=e)
 
-        if not day_file.is_file():
+    def upload_to_harvest(self, day, executor=None):
+        if not self.day_store.exists(day):
             return []
 
+        results = self._upload_results_without_uploading(day)
+        if results is not None:
+            return results
+
+        if executor is None:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                return self.upload_to_harvest(day, executor)
+
         results = []
-        with AtomicFileUpdate(day_file) as file, YAML(output=file.output) as yaml:
+        with self.day_store.update_day(day) as documents:
+            # Parse the whole day before uploading anything from it
+            entries = []
             try:
-                for i, data in enumerate(yaml.load_all(file.input)):
+                for i, data in enumerate(documents):
                     time_log = self.time_log_schema.load(data)
                     data, valid, = self._update_entry(i, data, time_log)
-                    if valid:
-                        data, message = self._upload_entry_to_harvest(day, data, time_log)
-                        results.append(message)
-                    else:
-                        results.append('Entry invalid, skipping')
-                    yaml.dump(data)
-                file.commit()
+                    entries.append((data, time_log, valid))
             except MarshmallowValidationError:
                 raise InvalidFileError(f'{i:02d} entry is not parseable, skipping this file')
 
+            # Uploads still journaled for the day are stamped from the journal instead of posted again
+            journaled = self._journaled_by_fingerprint(
+                record for record in self.upload_journal.records() if record['day'] == day)
+            uploads = [
+                executor.submit(
+                    self._upload_entry_to_harvest, day, data, time_log,
+                    self._take_journaled(journaled, day, time_log),
+                ) if valid else None
+                for data, time_log, valid in entries
+            ]
+
+            for upload in uploads:
+                if upload is not None:
+                    _, message = upload.result()
+                    results.append(message)
+                else:
+                    results.append('Entry invalid, skipping')
+
+        time_logs = [time_log for _, time_log, _ in entries]
+        self._forget_uploads(day, time_logs)
+        self._index_day(day, summarize_day(time_logs))
         return results
 
-    def _upload_entry_to_harvest(self, day, data, time_log):
+    def _upload_entry_to_harvest(self, day, data, time_log, journaled=None):
         if not time_log.is_billable:
             return data, 'Not billable, skipping.'
 
         if time_log.harvest.uploaded is not None:
             return data, 'Already uploaded, skipping.'
 
+        if journaled is not None:
+            self._stamp_uploaded(data, time_log, journaled['time_entry_id'], journaled['uploaded'])
+            return data, 'Already uploaded, stamped from the upload journal.'
+
         entry = HarvestEntry.from_time_log(day, time_log)
         try:
-            self.harvest_api.create_time_entry(entry)
-            data['harvest']['uploaded'] = iso_timestamp(datetime.now())
+            time_entry = self.harvest_api.create_time_entry(entry)
         except HTTPError:
             return data, 'Error uploading to Harvest, skipping.'
 
+        uploaded = iso_timestamp(datetime.now())
+        self.upload_journal.record(day, entry_fingerprint(day, time_log), time_entry['id'], uploaded)
+        self._stamp_uploaded(data, time_log, time_entry['id'], uploaded)
+
         return data, 'Uploaded'
+
+    def _stamp_uploaded(self, data, time_log, time_entry_id, uploaded):
+        data['harvest']['uploaded'] = uploaded
+        data['harvest']['time_entry_id'] = time_entry_id
+        # Keep the loaded TimeLog in step for the day index, as the text written to the day
+        time_log.harvest.uploaded = uploaded
+        time_log.harvest.time_entry_id = time_entry_id
+
+    def _forget_uploads(self, day, time_logs):
+        """Drop the journal records of uploads whose stamps were just written to ``day``."""
+        committed = (day, {
+            time_log.harvest.time_entry_id for time_log in time_logs
+            if time_log.harvest.uploaded is not None
+        })
+        if self._committed_uploads is not None:
+            # Dropped once the batch has written the day
+            self._committed_uploads.append(committed)
+            return
+        self._drop_journal_records([committed])
+
+    def _drop_journal_records(self, committed):
+        stamped = {(day, time_entry_id) for day, time_entry_ids in committed for time_entry_id in time_entry_ids}
+        if not stamped:
+            return
+        records = self.upload_journal.records()
+        kept = [record for record in records if (record['day'], record['time_entry_id']) not in stamped]
+        if len(kept) != len(records):
+            self.upload_journal.rewrite(kept)
+
+    def replay_upload_journal(self):
+        """Write journaled uploads into their day files, then drop them from the journal."""
+        pending = {}
+        for record in self.upload_journal.records():
+            pending.setdefault(record['day'], []).append(record)
+
+        if not pending:
+            return
+
+        unmatched = []
+        for day, records in pending.items():
+            day_unmatched = self._replay_day(day, records)
+            log.info('Replayed %d journaled uploads into %s', len(records) - len(day_unmatched), day)
+            unmatched.extend(day_unmatched)
+
+        for record in unmatched:
+            log.warning('Journaled upload %s for %s matches no entry', record['time_entry_id'], record['day'])
+        self.upload_journal.rewrite(unmatched)
+
+    def _replay_day(self, day, records):
+        if not self.day_store.exists(day):
+            return records
+
+        by_fingerprint = self._journaled_by_fingerprint(records)
+
+        time_logs = []
+        stamped = set()
+        try:
+            with self.day_store.update_day(day) as documents:
+                for data in documents:
+                    time_log = self.time_log_schema.load(data)
+                    time_logs.append(time_log)
+                    if time_log.harvest.uploaded:
+                        # Its stamp was written after all, the record is done with
+                        stamped.add(time_log.harvest.time_entry_id)
+                        continue
+                    record = self._take_journaled(by_fingerprint, day, time_log)
+                    if record is not None:
+                        self._stamp_uploaded(data, time_log, record['time_entry_id'], record['uploaded'])
+        except (MarshmallowValidationError, KeyError):
+            return records  # Leave the day alone, the records stay journaled
+
+        self._index_day(day, summarize_day(time_logs))
+        return [
+            record for matches in by_fingerprint.values() for record in matches
+            if record['time_entry_id'] not in stamped
+        ]
+
+    def _journaled_by_fingerprint(self, records):
+        by_fingerprint = {}
+        for record in records:
+            by_fingerprint.setdefault(record['fingerprint'], []).append(record)
+        return by_fingerprint
+
+    def _take_journaled(self, by_fingerprint, day, time_log):
+        """Claim the journal record of an upload of ``time_log`` that never got stamped, if any."""
+        if not time_log.is_billable or not time_log.time_entries or time_log.harvest.uploaded is not None:
+            return None  # Could not have been uploaded, or is stamped already
+        matches = by_fingerprint.get(entry_fingerprint(day, time_log))
+        return matches.pop(0) if matches else None
+
+
+_worker_app = None
+
+
+def _init_validation_worker(config_dir, harvest_cache_backend, day_store_backend, durability):
+    global _worker_app
+    _worker_app = TogglHarvestApp(
+        config_dir=config_dir,
+        harvest_cache_backend=harvest_cache_backend,
+        day_store_backend=day_store_backend,
+        durability=durability,
+    )
+    _worker_app._prime_validation_state()
+
+
+def _validate_day_in_worker(day):
+    # Hand the day index updates back instead of racing the other workers to write it
+    _worker_app._index_updates = []
+    resolver = _worker_app.harvest_resolver
+    hits, misses = resolver.hits, resolver.misses
+    errors = _worker_app._validate_day(day)
+    return (
+        ValidationResult(day=day, errors=errors),
+        _worker_app._index_updates,
+        (resolver.hits - hits, resolver.misses - misses),
+    )
@@ -0,0 +1,227 @@
+# Standard Library
+import hashlib
+import io
+import json
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+# Third Party Packages
+from ruamel.yaml import YAML
+
+from .emitter import dump_time_logs
+from .exceptions import InvalidFileError
+from .schemas import TimeLogSchema
+from .snapshot import file_digest
+from .utils import AtomicFileUpdate, FsyncBatch, fast_yaml, fsync_directory
+
+
+log = logging.getLogger(__name__)
+
+
+class YamlDayStore:
+    """Time logs kept as one multi-document ``YYYY-MM-DD.yml`` file per day."""
+
+    def __init__(self, data_dir, durability='full'):
+        self.data_dir = data_dir
+        self.durability = durability
+        self._batch = None
+
+    def path(self, day):
+        return Path(self.data_dir, day + '.yml')
+
+    def exists(self, day):
+        path = self.path(day)
+        # A new day file waiting on the batch exists as far as callers are concerned
+        return path.is_file() or (self._batch is not None and self._batch.is_pending(path))
+
+    def _settle(self, day):
+        # A rewrite waiting on the batch has to land before the day is read again
+        if self._batch is not None and self._batch.is_pending(self.path(day)):
+            self._batch.flush()
+
+    def digest(self, day):
+        self._settle(day)
+        return file_digest(self.path(day))
+
+    def signature(self, day):
+        """mtime and size of the day file, they change whenever it's written."""
+        self._settle(day)
+        stat = os.stat(self.path(day))
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def write_day(self, day, time_logs):
+        with AtomicFileUpdate(self.path(day), durability=self.durability, batch=self._batch) as file:
+            file.output.write(dump_time_logs(time_logs))
+            file.commit()
+
+    def read_day(self, day):
+        self._settle(day)
+        with fast_yaml() as yaml:
+            return list(yaml.load_all(self.path(day)))
+
+    @contextmanager
+    def batch(self):
+        """Group commit the day files updated inside the block, see FsyncBatch."""
+        with FsyncBatch(self.durability) as batch:
+            self._batch = batch
+            try:
+                yield
+            finally:
+                self._batch = None
+
+    @contextmanager
+    def update_day(self, day):
+        """Documents of ``day`` to modify or append to, written back if the block doesn't raise."""
+        update = AtomicFileUpdate(self.path(day), durability=self.durability, batch=self._batch)
+        with update as file, YAML(output=file.output) as yaml:
+            # Keep the file's own quoting so an update that changes nothing writes nothing
+            yaml.preserve_quotes = True
+            documents = list(yaml.load_all(file.input))
+            yield documents
+            for data in documents:
+                yaml.dump(data)
+            file.commit()
+
+    def export_day(self, day):
+        self._settle(day)
+        with open(self.path(day), 'r') as f:
+            return f.read()
+
+    def import_day(self, day, text):
+        tmp_path = str(self.path(day)) + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(text)
+            if self.durability != 'none':
+                f.flush()
+                os.fsync(f.fileno())
+        os.rename(tmp_path, self.path(day))
+        if self.durability == 'full':
+            fsync_directory(self.data_dir)
+
+
+SQLITE_SYNCHRONOUS = {
+    'none': 'OFF',
+    'file': 'NORMAL',
+    'full': 'FULL',
+}
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS days (
+    day TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS time_logs (
+    day TEXT NOT NULL REFERENCES days (day),
+    position INTEGER NOT NULL,
+    document TEXT NOT NULL,
+    PRIMARY KEY (day, position)
+);
+"""
+
+
+class SqliteDayStore:
+    """Time logs kept in a SQLite database, one row per time log.
+
+    Updates only rewrite the rows that changed, inside a single transaction per day.
+    Days can be exported to and imported from YAML for editing.
+    """
+
+    def __init__(self, path, durability='full'):
+        self.path = path
+        # Upload workers update different days at once, the lock serializes the connection
+        self.connection = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        self.connection.execute(f'PRAGMA synchronous = {SQLITE_SYNCHRONOUS[durability]}')
+        with self._lock, self.connection:
+            self.connection.executescript(SQLITE_SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def exists(self, day):
+        with self._lock:
+            return self.connection.execute(
+                'SELECT 1 FROM days WHERE day = ?', (day,)).fetchone() is not None
+
+    def signature(self, day):
+        # Nothing cheaper to go by than the digest, which is a query rather than a file read
+        return None
+
+    def digest(self, day):
+        sha256 = hashlib.sha256()
+        for _, document in self._rows(day):
+            sha256.update(document.encode('utf-8') + b'\n')
+        return sha256.hexdigest()
+
+    def write_day(self, day, time_logs):
+        schema = TimeLogSchema()
+        self._replace_day(day, [_encode(schema.dump(time_log)) for time_log in time_logs])
+
+    def _replace_day(self, day, encoded):
+        with self._lock, self.connection:
+            self.connection.execute('DELETE FROM time_logs WHERE day = ?', (day,))
+            self.connection.execute('INSERT OR IGNORE INTO days VALUES (?)', (day,))
+            self.connection.executemany(
+                'INSERT INTO time_logs VALUES (?, ?, ?)',
+                [(day, position, document) for position, document in enumerate(encoded)])
+
+    def _rows(self, day):
+        with self._lock:
+            return self.connection.execute(
+                'SELECT position, document FROM time_logs WHERE day = ? ORDER BY position',
+                (day,)).fetchall()
+
+    def read_day(self, day):
+        return [json.loads(document) for _, document in self._rows(day)]
+
+    @contextmanager
+    def batch(self):
+        # Each day is already written in a single transaction
+        yield
+
+    @contextmanager
+    def update_day(self, day):
+        """Documents of ``day`` to modify or append to, changed rows are saved if the block doesn't raise."""
+        rows = self._rows(day)
+        documents = [json.loads(document) for _, document in rows]
+        yield documents
+
+        changed = [
+            (encoded, day, position)
+            for (position, original), encoded in zip(rows, map(_encode, documents))
+            if encoded != original
+        ]
+        added = [
+            (day, position, _encode(data))
+            for position, data in enumerate(documents[len(rows):], len(rows))
+        ]
+        if changed or added:
+            with self._lock, self.connection:
+                if changed:
+                    self.connection.executemany(
+                        'UPDATE time_logs SET document = ? WHERE day = ? AND position = ?', changed)
+                if added:
+                    self.connection.executemany('INSERT INTO time_logs VALUES (?, ?, ?)', added)
+
+    def export_day(self, day):
+        output = io.StringIO()
+        YAML().dump_all(self.read_day(day), output)
+        return output.getvalue()
+
+    def import_day(self, day, text):
+        # Read like the YAML store reads a day file it updates
+        with YAML() as yaml:
+            documents = list(yaml.load_all(text))
+        try:
+            encoded = [_encode(data) for data in documents]
+        except TypeError as e:
+            raise InvalidFileError(f'{day} has a value that cannot be stored, quote timestamps and dates: {e}')
+        self._replace_day(day, encoded)
+
+
+def _encode(data):
+    # Only JSON's own types, anything else (like an unquoted timestamp) raises TypeError
+    return json.dumps(data)
@@ -0,0 +1,133 @@
+# Standard Library
+from datetime import timezone
+
+
+# Plain scalars that YAML would read back as something other than a string
+RESERVED_WORDS = {
+    'null', '~', 'true', 'false', 'yes', 'no', 'on', 'off', 'y', 'n',
+}
+PLAIN_PUNCTUATION = set(" _-.,/()&'!?%+=;")
+# Printable to Python, but YAML treats them as line breaks or a byte order mark
+UNESCAPED_UNICODE_EXCEPTIONS = set('\x85\u2028\u2029\ufeff')
+
+
+def dump_time_logs(time_logs):
+    """Multi-document YAML for a day of TimeLogs, in the shape TimeLogSchema dumps.
+
+    Writes the text directly instead of going through marshmallow and ruamel's generic
+    representer, the output loads to the same data as the round trip dump.
+    """
+    return '---\n'.join(_time_log(time_log) for time_log in time_logs)
+
+
+def _time_log(time_log):
+    lines = [
+        f'project_code:{_value(_str(time_log.project_code))}',
+        f'description:{_value(_str(time_log.description))}',
+        f'is_billable:{_value(_bool(time_log.is_billable))}',
+    ]
+
+    time_entries = time_log.time_entries
+    if time_entries is None:
+        lines.append('time_entries:')
+    elif len(time_entries) == 0:
+        lines.append('time_entries: []')
+    else:
+        lines.append('time_entries:')
+        for entry in time_entries:
+            lines.append(f'- s:{_value(_local_datetime(entry.start))}')
+            lines.append(f'  e:{_value(_local_datetime(entry.end))}')
+
+    toggl = time_log.toggl
+    lines.extend([
+        'toggl:',
+        f'  client:{_value(_str(toggl.client))}',
+        f'  project:{_value(_str(toggl.project))}',
+        f'  task:{_value(_str(toggl.task))}',
+        f'  is_billable:{_value(_bool(toggl.is_billable))}',
+    ])
+
+    harvest = time_log.harvest
+    lines.extend([
+        'harvest:',
+        f'  project_id:{_value(_int(harvest.project_id))}',
+        f'  task_name:{_value(_str(harvest.task_name))}',
+        f'  task_id:{_value(_int(harvest.task_id))}',
+        f'  uploaded:{_value(_utc_datetime(harvest.uploaded))}',
+    ])
+    return '\n'.join(lines) + '\n'
+
+
+def _str(value):
+    return None if value is None else str(value)
+
+
+def _int(value):
+    return None if value is None else int(value)
+
+
+def _bool(value):
+    return None if value is None else bool(value)
+
+
+def _local_datetime(value):
+    return None if value is None else value.isoformat()
+
+
+def _utc_datetime(value):
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.isoformat()
+
+
+def _value(value):
+    """Scalar with its leading space, or nothing for null like ruamel writes it."""
+    if value is None:
+        return ''
+    if value is True:
+        return ' true'
+    if value is False:
+        return ' false'
+    if isinstance(value, int):
+        return f' {value}'
+    return f' {_scalar(value)}'
+
+
+def _scalar(value):
+    if _is_plain_safe(value):
+        return value
+    return _double_quoted(value)
+
+
+def _is_plain_safe(value):
+    if not value or not value[0].isalpha() or value[-1] == ' ':
+        return False
+    if value.lower() in RESERVED_WORDS:
+        return False
+    return all(char.isalnum() or char in PLAIN_PUNCTUATION for char in value)
+
+
+def _double_quoted(value):
+    chunks = ['"']
+    for char in value:
+        code = ord(char)
+        if char in '"\\':
+            chunks.append('\\' + char)
+        elif 0x20 <= code < 0x7f:
+            chunks.append(char)
+        elif char == '\n':
+            chunks.append('\\n')
+        elif char == '\t':
+            chunks.append('\\t')
+        elif code > 0x7f and char.isprintable() and char not in UNESCAPED_UNICODE_EXCEPTIONS:
+            chunks.append(char)
+        elif code <= 0xff:
+            chunks.append(f'\\x{code:02x}')
+        elif code <= 0xffff:
+            chunks.append(f'\\u{code:04x}')
+        else:
+            chunks.append(f'\\U{code:08x}')
+    chunks.append('"')
+    return ''.join(chunks)
@@ -20,3 +20,7 @@ class InvalidHarvestProject(IncompleteHarvestData):
 
 class InvalidFileError(Exception):
     pass
+
+
+class MissingHarvestCacheError(Exception):
+    pass
@@ -1,15 +1,22 @@
 # Standard Library
 import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 # Third Party Packages
 import requests
-from ruamel.yaml import YAML
+
+from .ratelimit import RateLimiter
+from .utils import fast_yaml
 
 
 log = logging.getLogger(__name__)
 
 HARVEST_API = 'https://api.harvestapp.com/api/v2'
 
+MAX_PER_PAGE = 2000
+DEFAULT_MAX_WORKERS = 4
+
 
 class HarvestCredentials():
 
@@ -20,7 +27,7 @@ class HarvestCredentials():
 
     @classmethod
     def read_from_file(cls, file_path):
-        with YAML() as yaml:
+        with fast_yaml() as yaml:
             credentials_dict = yaml.load(file_path)
 
         if not isinstance(credentials_dict, dict):
@@ -36,7 +43,9 @@ class HarvestCredentials():
 
 class HarvestSession():
 
-    def __init__(self, credentials, session=requests.Session()):
+    def __init__(self, credentials, session=requests.Session(), rate_limiter=None, max_workers=DEFAULT_MAX_WORKERS):
+        self.rate_limiter = rate_limiter or RateLimiter.for_url(HARVEST_API)
+        self.max_workers = max_workers
         self.session = session
         self.session.headers = {
             'Harvest-Account-ID': credentials.account_id,
@@ -44,14 +53,21 @@ class HarvestSession():
             'User-Agent': credentials.user_agent,
         }
 
-    def cache_projects_via_api(self):
-        projects = self.retrieve_projects()
-        task_assignments = self.retrieve_task_assignments()
+    def cache_projects_via_api(self, updated_since=None, cached_projects=()):
+        """Build the project cache, merging changes since ``updated_since`` into ``cached_projects``."""
+        params = {} if updated_since is None else {'updated_since': updated_since}
+        harvest_cache = {p['id']: p for p in cached_projects}
+
+        # Task assignments don't depend on projects, so download both at the same time
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            task_assignments = executor.submit(list, self.iter_list('task_assignments', params=params))
+            projects = list(self.iter_list('projects', params=params))
+            task_assignments = task_assignments.result()
 
-        harvest_cache = {}
         for project in projects:
             p_id = project['id']
             c_id = project['client']['id']
+            cached_tasks = harvest_cache.get(p_id, {}).get('tasks', {})
             harvest_cache[p_id] = {
                 'id': p_id,
                 'name': project['name'],
@@ -61,11 +77,15 @@ class HarvestSession():
                     'name': project['client']['name']
                 },
                 'code': project['code'],
-                'tasks': {},
+                'tasks': cached_tasks,
             }
 
         for task in task_assignments:
-            project_tasks = harvest_cache[task['project']['id']]['tasks']
+            try:
+                project_tasks = harvest_cache[task['project']['id']]['tasks']
+            except KeyError:
+                log.warning('Task assignment %s belongs to an uncached project, skipping', task['id'])
+                continue
             task_id = task['task']['id']
             project_tasks[task_id] = {
                 'name': task['task']['name'],
@@ -84,18 +104,47 @@ class HarvestSession():
         return self._retrieve_list('task_assignments')
 
     def _retrieve_list(self, list_name):
-        objects = []
-        next_url = f'{HARVEST_API}/{list_name}'
+        return list(self.iter_list(list_name))
+
+    def iter_list(self, list_name, params=None):
+        url = f'{HARVEST_API}/{list_name}'
+        params = {**(params or {}), 'per_page': MAX_PER_PAGE}
+
+        first_page = self._retrieve_page(url, params, 1)
+        yield from first_page[list_name]
+
+        total_pages = first_page.get('total_pages')
+        if total_pages is None:
+            yield from self._follow_next_links(list_name, first_page['links']['next'])
+            return
+
+        # The first page says how many pages remain, fetch them concurrently, only running
+        # ahead of the consumer by a page per worker
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pages = deque()
+            for page in range(2, total_pages + 1):
+                pages.append(executor.submit(self._retrieve_page, url, params, page))
+                if len(pages) > self.max_workers:
+                    yield from pages.popleft().result()[list_name]
+            while pages:
+                yield from pages.popleft().result()[list_name]
+
+    def _retrieve_page(self, url, params, page):
+        r = self.rate_limiter.request(self.session.get, url, params={**params, 'page': page})
+        r.raise_for_status()
+        return r.json()
+
+    def _follow_next_links(self, list_name, next_url):
         while next_url is not None:
-            r = self.session.get(next_url)
+            r = self.rate_limiter.request(self.session.get, next_url)
             r.raise_for_status()
             r_json = r.json()
-            objects = objects + r_json[list_name]
+            yield from r_json[list_name]
             next_url = r_json['links']['next']
-        return objects
 
     def create_time_entry(self, entry):
-        r = self.session.post(
+        r = self.rate_limiter.request(
+            self.session.post,
             f'{HARVEST_API}/time_entries',
             json={
                 'project_id': entry.project_id,
@@ -0,0 +1,81 @@
+# Standard Library
+import hashlib
+import json
+import logging
+import os
+import threading
+
+
+log = logging.getLogger(__name__)
+
+
+def entry_fingerprint(day, time_log):
+    """Stable identity of a day file entry, used to match journal records to it.
+
+    Only what the day file stores is used, the Harvest ids may not be resolved yet.
+    """
+    key = json.dumps([
+        day,
+        time_log.project_code,
+        time_log.description,
+        [[entry.start.isoformat(), entry.end.isoformat()] for entry in time_log.time_entries],
+    ])
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+class UploadJournal:
+    """Append only record of successful uploads that haven't reached their day file yet.
+
+    Every record is fsync'd before ``record`` returns, so an upload acknowledged by Harvest
+    survives a crash even when the day file it belongs to was never committed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def record(self, day, fingerprint, time_entry_id, uploaded):
+        line = json.dumps({
+            'day': day,
+            'fingerprint': fingerprint,
+            'time_entry_id': time_entry_id,
+            'uploaded': uploaded,
+        })
+        with self._lock, open(self.path, 'a') as f:
+            f.write(line + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def records(self):
+        try:
+            with open(self.path, 'r') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return []
+
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                # A crash part way through an append leaves a torn final line
+                log.warning('Ignoring unreadable upload journal line: %r', line)
+        return records
+
+    def rewrite(self, records):
+        """Atomically replace the journal with ``records``, removing it when empty."""
+        with self._lock:
+            if not records:
+                try:
+                    os.remove(self.path)
+                except FileNotFoundError:
+                    pass
+                return
+
+            tmp_path = str(self.path) + '.tmp'
+            with open(tmp_path, 'w') as f:
+                for record in records:
+                    f.write(json.dumps(record) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.rename(tmp_path, self.path)
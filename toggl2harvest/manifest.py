@@ -0,0 +1,138 @@
+# Standard Library
+import json
+import logging
+import os
+from collections import namedtuple
+
+from .utils import delta_hours
+
+
+log = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 3
+
+DaySummary = namedtuple(
+    'DaySummary',
+    ' '.join([
+        'entries',
+        'billable_hours',
+        'uploaded',
+        'not_uploaded',
+    ])
+)
+
+DayIndexEntry = namedtuple(
+    'DayIndexEntry',
+    ' '.join([
+        'digest',
+        'signature',
+        'entries',
+        'billable_hours',
+        'uploaded',
+        'not_uploaded',
+        'validation',
+    ])
+)
+
+
+def summarize_day(time_logs):
+    """DaySummary of a day's TimeLogs, counting the billable logs with time entries as uploadable."""
+    billable_hours = 0
+    uploaded = 0
+    not_uploaded = 0
+    for time_log in time_logs:
+        if not time_log.is_billable or not time_log.time_entries:
+            continue
+        billable_hours += delta_hours(time_log.total_time)
+        if time_log.harvest.uploaded is None:
+            not_uploaded += 1
+        else:
+            uploaded += 1
+    return DaySummary(len(time_logs), round(billable_hours, 6), uploaded, not_uploaded)
+
+
+class DayIndex:
+    """Summary of each stored day, and what it was last validated against.
+
+    Entries are keyed by the day's content digest, a day changed since it was indexed has
+    no entry until it's written or checked again. A day whose store signature (a file's
+    mtime and size) is unchanged is taken as unchanged without digesting it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._days = None
+        self._changed = False
+
+    @property
+    def days(self):
+        if self._days is None:
+            self._days = self._load()
+        return self._days
+
+    def _load(self):
+        try:
+            with open(self.path, 'r') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            log.warning('Ignoring unreadable manifest %s: %s', self.path, e)
+            return {}
+
+        if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION:
+            return {}
+        return manifest.get('days', {})
+
+    def get(self, day, signature, digest):
+        """Entry of ``day``, None when it changed since it was indexed.
+
+        Unless ``signature`` matches the indexed one, that's decided by ``digest()``.
+        """
+        entry = self.days.get(day)
+        if entry is None:
+            return None
+        if signature is None or entry['signature'] != signature:
+            # Touched or checked out again, the contents may still be the same
+            if entry['digest'] != digest():
+                return None
+            if signature is not None:
+                entry['signature'] = signature
+                self._changed = True
+        return DayIndexEntry(**entry)
+
+    def record(self, day, digest, signature, summary, validation=None):
+        """Index ``day`` at ``digest``, unchanged contents keep their last validation."""
+        previous = self.days.get(day)
+        if validation is None and previous is not None and previous['digest'] == digest:
+            validation = previous['validation']
+
+        entry = {
+            'digest': digest,
+            'signature': signature,
+            'entries': None,
+            'billable_hours': None,
+            'uploaded': None,
+            'not_uploaded': None,
+            'validation': None if validation is None else list(validation),
+        }
+        if summary is not None:
+            entry.update(summary._asdict())
+        if previous != entry:
+            self.days[day] = entry
+            self._changed = True
+
+    def save(self):
+        if not self._changed:
+            return
+
+        tmp_path = str(self.path) + '.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({'version': MANIFEST_VERSION, 'days': self.days}, f, sort_keys=True)
+            os.rename(tmp_path, self.path)
+        except OSError as e:
+            # Only a speed up, the next run looks at those days again
+            log.debug('Unable to write manifest %s: %s', self.path, e)
+            return
+        self._changed = False
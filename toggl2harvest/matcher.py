@@ -0,0 +1,104 @@
+# Standard Library
+from collections import deque, namedtuple
+
+
+ProjectCodeMatch = namedtuple(
+    'ProjectCodeMatch',
+    ' '.join([
+        'code',
+        'suffix',
+    ])
+)
+
+
+class ProjectCodeMatcher:
+    """Aho-Corasick automaton finding project codes in descriptions.
+
+    Matches are leftmost-longest: the code starting earliest wins and, among codes starting
+    at the same place, the longest one. A ``-NNN`` suffix directly after the code is
+    reported alongside it. The automaton is plain lists and dicts so it pickles cheaply.
+    """
+
+    def __init__(self, codes):
+        self._goto = [{}]
+        self._fail = [0]
+        # (length, code) of every code ending at each state, including via fail links
+        self._outputs = [[]]
+        self._max_length = 0
+
+        for code in codes:
+            self._add(code)
+        self._build_fail_links()
+
+    def _add(self, code):
+        text = str(code)
+        if not text:
+            return
+
+        state = 0
+        for char in text:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+        self._outputs[state].append((len(text), code))
+        self._max_length = max(self._max_length, len(text))
+
+    def _build_fail_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                self._fail[next_state] = fail if fail != next_state else 0
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+
+    def search(self, text):
+        """Leftmost-longest ProjectCodeMatch in ``text``, or None."""
+        if text is None or self._max_length == 0:
+            return None
+
+        best_start = best_length = best_code = None
+        state = 0
+        for i, char in enumerate(text):
+            # Nothing starting at or before the best match can still be found
+            if best_start is not None and i - self._max_length >= best_start:
+                break
+
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+
+            for length, code in self._outputs[state]:
+                start = i - length + 1
+                if best_start is None or (start, -length) < (best_start, -best_length):
+                    best_start, best_length, best_code = start, length, code
+
+        if best_code is None:
+            return None
+
+        end = best_start + best_length
+        return ProjectCodeMatch(code=best_code, suffix=_number_suffix(text, end))
+
+    def find(self, text):
+        match = self.search(text)
+        return match.code if match is not None else None
+
+
+def _number_suffix(text, end):
+    if end >= len(text) or text[end] != '-':
+        return None
+    digits_end = end + 1
+    while digits_end < len(text) and text[digits_end] in '0123456789':
+        digits_end += 1
+    if digits_end == end + 1:
+        return None
+    return text[end:digits_end]
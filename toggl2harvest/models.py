@@ -1,39 +1,28 @@
 # Standard Library
 import logging
-import re
-from datetime import timedelta
+import operator
+from array import array
+from datetime import datetime, timedelta, timezone
 
 from .exceptions import (
+    IncompleteHarvestData,
     InvalidHarvestProject,
     InvalidHarvestTask,
     MissingHarvestProject,
     MissingHarvestTask,
 )
+from .matcher import ProjectCodeMatcher
 from .utils import delta_hours
 
 
 log = logging.getLogger(__name__)
 
 
-# From https://goodcode.io/articles/python-dict-object/
-class objdict(dict):
-    def __getattr__(self, name):
-        if name in self:
-            return self[name]
-        else:
-            raise AttributeError(f'No such attribute: {name}')
-
-    def __setattr__(self, name, value):
-        self[name] = value
-
-    def __delattr__(self, name):
-        if name in self:
-            del self[name]
-        else:
-            raise AttributeError(f'No such attribute: {name}')
-
-
 class TimeEntry:
+    # Backfills and reports load hundreds of thousands of these, the models here use
+    # __slots__ instead of a per instance __dict__
+    __slots__ = ('start', 'end')
+
     def __init__(self, start, end):
         self.start = start
         self.end = end
@@ -46,7 +35,98 @@ class TimeEntry:
         )
 
 
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+NAIVE_EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+SECOND = timedelta(seconds=1)
+# Offset stored for naive datetimes, real UTC offsets are within a day
+NAIVE_OFFSET = -86400
+
+
+class TimeEntries:
+    """A TimeLog's entries with start and end stored as columns of int64 epoch microseconds.
+
+    Behaves like the list of TimeEntry it stands in for, entries are built on access.
+    The total and order check are kept up to date as entries are added, so reading them
+    doesn't loop over the entries.
+    """
+    __slots__ = ('starts', 'ends', 'offsets', '_total', '_in_order')
+
+    _timezones = {}
+
+    def __init__(self, time_entries=()):
+        self.starts = array('q')
+        self.ends = array('q')
+        # UTC offset in seconds of each start and end, in pairs
+        self.offsets = array('l')
+        self._total = 0
+        self._in_order = True
+        self.extend(time_entries)
+
+    @staticmethod
+    def _epoch(value):
+        offset = value.utcoffset()
+        if offset is None:
+            return (value - NAIVE_EPOCH) // MICROSECOND, NAIVE_OFFSET
+        return (value - EPOCH) // MICROSECOND, offset // SECOND
+
+    def _load(self, micros, offset):
+        if offset == NAIVE_OFFSET:
+            return NAIVE_EPOCH + timedelta(microseconds=micros)
+        try:
+            tz = self._timezones[offset]
+        except KeyError:
+            tz = self._timezones[offset] = timezone(timedelta(seconds=offset))
+        return (EPOCH + timedelta(microseconds=micros)).astimezone(tz)
+
+    def append(self, entry):
+        self.append_epoch(*self._epoch(entry.start), *self._epoch(entry.end))
+
+    def append_epoch(self, start, start_offset, end, end_offset):
+        """Add an entry given as epoch microseconds and UTC offsets in seconds."""
+        self.starts.append(start)
+        self.ends.append(end)
+        self.offsets.append(start_offset)
+        self.offsets.append(end_offset)
+        self._total += end - start
+        self._in_order = self._in_order and start < end
+
+    def extend(self, time_entries):
+        for entry in time_entries:
+            self.append(entry)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return TimeEntry(
+            start=self._load(self.starts[index], self.offsets[2 * index]),
+            end=self._load(self.ends[index], self.offsets[2 * index + 1]),
+        )
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def durations(self):
+        """Microseconds of each entry."""
+        return array('q', map(operator.sub, self.ends, self.starts))
+
+    def in_order(self):
+        """Whether every entry starts before it ends."""
+        return self._in_order
+
+    def total_time(self):
+        return timedelta(microseconds=self._total)
+
+
 class TogglReportEntry:
+    __slots__ = ('client', 'project', 'task', 'description', 'is_billable', 'start', 'end', 'tags')
+
     def __init__(
         self, client, project, task, description, is_billable, start, end, tags=[]
     ):
@@ -70,6 +150,8 @@ class TogglReportEntry:
 
 
 class TogglData:
+    __slots__ = ('client', 'project', 'task', 'is_billable', 'description')
+
     def __init__(self, client=None, project=None, task=None, is_billable=None, description=None):
         self.client = client
         self.project = project
@@ -88,14 +170,19 @@ class TogglData:
 
 
 class HarvestData:
-    def __init__(self, project_id=None, task_name=None, task_id=None, uploaded=None):
+    __slots__ = ('project_id', 'task_name', 'task_id', 'uploaded', 'time_entry_id')
+
+    def __init__(self, project_id=None, task_name=None, task_id=None, uploaded=None, time_entry_id=None):
         self.project_id = project_id
         self.task_name = task_name
         self.task_id = task_id
         self.uploaded = uploaded
+        self.time_entry_id = time_entry_id
+
 
+class TimeLog:
+    __slots__ = ('project_code', 'description', 'is_billable', 'time_entries', 'toggl', 'harvest')
 
-class TimeLog(objdict):
     def __init__(
         self, project_code, description, is_billable, time_entries,
         toggl=None, harvest=None
@@ -109,11 +196,11 @@ class TimeLog(objdict):
 
     @property
     def total_time(self):
-        total_time = timedelta()
-        for entry in self.time_entries:
-            assert entry.start < entry.end
-            total_time += entry.end - entry.start
-        return total_time
+        time_entries = self.time_entries
+        if not isinstance(time_entries, TimeEntries):
+            time_entries = TimeEntries(time_entries)
+        assert time_entries.in_order()
+        return time_entries.total_time()
 
     @classmethod
     def build_from_toggl_entry(cls, report_entry):
@@ -121,9 +208,9 @@ class TimeLog(objdict):
             project_code=None,
             description=report_entry.description,
             is_billable=report_entry.is_billable,
-            time_entries=[
+            time_entries=TimeEntries([
                 TimeEntry(report_entry.start, report_entry.end),
-            ],
+            ]),
             toggl=TogglData(
                 client=report_entry.client,
                 project=report_entry.project,
@@ -132,6 +219,16 @@ class TimeLog(objdict):
             )
         )
 
+    def toggl_key(self):
+        """The TogglReportEntry.unique_key of the entries grouped into this log."""
+        return (
+            self.toggl.client,
+            self.toggl.project,
+            self.toggl.task,
+            self.description,
+            self.toggl.is_billable,
+        )
+
     def add_to_time_entries(self, report_entry):
         entry = TimeEntry.build_from_toggl_entry(report_entry)
         self.time_entries.append(entry)
@@ -170,7 +267,12 @@ class TimeLog(objdict):
         except KeyError:
             raise MissingHarvestTask()
 
-    def update_harvest_tasks(self, project_mapping, harvest_cache):
+    def update_harvest_tasks(self, project_mapping, harvest_cache, resolver=None):
+        if resolver is not None:
+            return resolver.resolve(self, project_mapping, harvest_cache)
+        return self._resolve_harvest_tasks(project_mapping, harvest_cache)
+
+    def _resolve_harvest_tasks(self, project_mapping, harvest_cache):
         self.harvest.project_id = self._identify_harvest_project(project_mapping)
 
         if not harvest_cache.project_in_cache(self.harvest.project_id):
@@ -182,6 +284,67 @@ class TimeLog(objdict):
             raise InvalidHarvestTask()
 
 
+class HarvestResolver:
+    """Memoizes TimeLog.update_harvest_tasks for the same mapping and cache.
+
+    Most time logs repeat the same project code, description and task, so their harvest
+    project and task only need to be worked out once. Failures are remembered too and
+    re-raised as the same IncompleteHarvestData subclass.
+    """
+
+    def __init__(self):
+        self.project_mapping = None
+        self.harvest_cache = None
+        self._resolved = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(time_log):
+        return (
+            time_log.harvest.project_id,
+            time_log.harvest.task_id,
+            time_log.harvest.task_name,
+            time_log.project_code,
+            time_log.description,
+            time_log.toggl.task,
+        )
+
+    def resolve(self, time_log, project_mapping, harvest_cache):
+        if project_mapping is not self.project_mapping or harvest_cache is not self.harvest_cache:
+            self.project_mapping = project_mapping
+            self.harvest_cache = harvest_cache
+            self._resolved = {}
+
+        key = self.key(time_log)
+        try:
+            project_id, task_id, error = self._resolved[key]
+            self.hits += 1
+        except KeyError:
+            self.misses += 1
+            error = None
+            try:
+                time_log._resolve_harvest_tasks(project_mapping, harvest_cache)
+            except IncompleteHarvestData as e:
+                error = type(e)
+            # Failures leave the fields either updated or as they were, both captured here
+            project_id, task_id = time_log.harvest.project_id, time_log.harvest.task_id
+            self._resolved[key] = (project_id, task_id, error)
+
+        time_log.harvest.project_id = project_id
+        time_log.harvest.task_id = task_id
+        if error is not None:
+            raise error()
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        return f'{self.hits} hits, {self.misses} misses ({self.hit_rate:.0%} hit rate)'
+
+
 class ProjectMapping:
     def __init__(self, mapping):
         self.mapping = mapping
@@ -199,7 +362,7 @@ class ProjectMapping:
             except KeyError:
                 pass
 
-        self.project_re = re.compile(f'({"|".join(mapping.keys())})(-[0-9]+)?')
+        self.project_matcher = ProjectCodeMatcher(mapping.keys())
 
     def harvest_project(self, project_code):
         try:
@@ -220,15 +383,7 @@ class ProjectMapping:
             return None
 
     def project_in_description(self, description):
-        if description is None:
-            return None
-
-        # regular expression doesn't work if there are no project keys
-        if len(self.mapping) == 0:
-            return None
-
-        for match in self.project_re.finditer(description):
-            return match.groups(0)[0]
+        return self.project_matcher.find(description)
 
 
 class HarvestCache:
@@ -243,6 +398,13 @@ class HarvestCache:
             }
             self.project_tasks[project_id] = set(v['tasks'].keys())
 
+    @classmethod
+    def from_indexes(cls, tasks_by_name, project_tasks):
+        cache = cls([])
+        cache.tasks_by_name = tasks_by_name
+        cache.project_tasks = project_tasks
+        return cache
+
     def project_in_cache(self, proj_id):
         try:
             return self.tasks_by_name[proj_id]
@@ -263,6 +425,8 @@ class HarvestCache:
 
 
 class HarvestEntry:
+    __slots__ = ('project_id', 'task_id', 'spent_date', 'hours', 'notes')
+
     def __init__(self, project_id, task_id, spent_date, hours, notes):
         self.project_id = project_id
         self.task_id = task_id
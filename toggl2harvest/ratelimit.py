@@ -0,0 +1,113 @@
+# Standard Library
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+
+log = logging.getLogger(__name__)
+
+TOO_MANY_REQUESTS = 429
+
+# Published quotas as (requests, per seconds)
+HOST_QUOTAS = {
+    # https://help.getharvest.com/api-v2/introduction/overview/general/#rate-limiting
+    'api.harvestapp.com': (100, 15),
+    # https://github.com/toggl/toggl_api_docs#the-api-format
+    'www.toggl.com': (1, 1),
+    'toggl.com': (1, 1),
+}
+DEFAULT_QUOTA = (1, 1)
+
+
+class TokenBucket:
+    """Thread safe token bucket.
+
+    Tokens are reserved rather than waited for, so concurrent callers queue up behind
+    each other and the bucket is drained at exactly ``rate`` once the burst is spent.
+    """
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._paused_until = self._updated
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = max(now - self._updated, 0)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def reserve(self):
+        """Take a token, returning the number of seconds to wait before using it."""
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+            return max(wait, self._paused_until - now)
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """Hold every caller for ``seconds``, discarding any saved up burst."""
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            self._tokens = min(self._tokens, 0)
+            self._paused_until = max(self._paused_until, now + seconds)
+
+
+class RateLimiter:
+    def __init__(self, rate, capacity, max_retries=8, backoff_base=1, backoff_max=60, clock=time.monotonic):
+        self.bucket = TokenBucket(rate, capacity, clock=clock)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    @classmethod
+    def for_url(cls, url, **kwargs):
+        requests, seconds = HOST_QUOTAS.get(urlparse(url).hostname, DEFAULT_QUOTA)
+        return cls(rate=requests / seconds, capacity=requests, **kwargs)
+
+    def backoff(self, attempt):
+        """Exponential backoff with full jitter."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def request(self, send, *args, **kwargs):
+        """Call ``send(*args, **kwargs)`` within the quota, retrying throttled responses."""
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            r = send(*args, **kwargs)
+            if r.status_code != TOO_MANY_REQUESTS or attempt == self.max_retries:
+                return r
+
+            delay = retry_after(r)
+            if delay is None:
+                delay = self.backoff(attempt)
+            log.debug('Throttled, retrying in %.2fs', delay)
+            self.bucket.pause(delay)  # The next acquire waits out the pause
+        return r
+
+
+def retry_after(response):
+    """Seconds requested by a ``Retry-After`` header, or None."""
+    value = response.headers.get('Retry-After')
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
+        return None
@@ -1,5 +1,10 @@
+# Standard Library
+import re
+from datetime import date
+from functools import lru_cache
+
 # Third Party Packages
-from marshmallow import EXCLUDE, Schema, fields, post_load
+from marshmallow import EXCLUDE, Schema, ValidationError, fields, post_load
 
 from . import models
 
@@ -46,6 +51,7 @@ class HarvestDataSchema(Schema):
     task_name = fields.Str(required=False, allow_none=True)
     task_id = fields.Integer(required=False, allow_none=True)
     uploaded = fields.DateTime(required=False, allow_none=True)
+    time_entry_id = fields.Integer(required=False, allow_none=True, load_only=True)
 
     @post_load
     def make_harvest_data(self, data):
@@ -62,9 +68,157 @@ class TimeLogSchema(Schema):
 
     @post_load
     def make_time_log(self, data):
+        if data.get('time_entries') is not None:
+            data['time_entries'] = models.TimeEntries(data['time_entries'])
         return models.TimeLog(**data)
 
 
+# Time entry timestamps the way the emitter writes them
+DAY_FILE_DATETIME_RE = re.compile(
+    r'(\d{4}-\d{2}-\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\.(\d{6}))?(?:(Z)|([+-])(\d{2}):(\d{2}))', re.ASCII)
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+REQUIRED_TIME_LOG_KEYS = frozenset(['project_code', 'description', 'is_billable', 'time_entries'])
+TIME_LOG_KEYS = frozenset(TimeLogSchema._declared_fields)
+TIME_ENTRY_KEYS = frozenset(TimeEntrySchema._declared_fields)
+TOGGL_DATA_KEYS = frozenset(TogglDataSchema._declared_fields)
+HARVEST_DATA_KEYS = frozenset(HarvestDataSchema._declared_fields)
+UPLOADED_FIELD = fields.DateTime(allow_none=True)
+
+
+class _NotFast(Exception):
+    pass
+
+
+class FastTimeLogSchema(TimeLogSchema):
+    """TimeLogSchema with a hand written load for documents in the shape of the day files.
+
+    Anything else, including every invalid document, is loaded by marshmallow, so results
+    and ValidationErrors are the same either way.
+    """
+
+    def load(self, data, many=None, partial=None, unknown=None):
+        plain = many is None and partial is None and unknown is None
+        if plain and not self.many and self.only is None and not self.exclude:
+            try:
+                return _time_log(data)
+            except _NotFast:
+                pass
+        return super().load(data, many=many, partial=partial, unknown=unknown)
+
+
+def _time_log(data):
+    if not isinstance(data, dict) or not REQUIRED_TIME_LOG_KEYS <= data.keys() <= TIME_LOG_KEYS:
+        raise _NotFast()
+
+    is_billable = data['is_billable']
+    if is_billable is not True and is_billable is not False:
+        raise _NotFast()
+
+    time_entries = data['time_entries']
+    if time_entries is not None:
+        time_entries = _time_entries(time_entries)
+
+    return models.TimeLog(
+        project_code=_str(data['project_code']),
+        description=_str(data['description']),
+        is_billable=is_billable,
+        time_entries=time_entries,
+        toggl=_toggl_data(data['toggl']) if 'toggl' in data else None,
+        harvest=_harvest_data(data['harvest']) if 'harvest' in data else None,
+    )
+
+
+def _toggl_data(data):
+    if not isinstance(data, dict) or not data.keys() <= TOGGL_DATA_KEYS:
+        raise _NotFast()
+    toggl_data = models.TogglData()
+    for key in ('client', 'project', 'task'):
+        if key in data:
+            setattr(toggl_data, key, _str(data[key]))
+    if 'is_billable' in data:
+        is_billable = data['is_billable']
+        if is_billable is not None and is_billable is not True and is_billable is not False:
+            raise _NotFast()
+        toggl_data.is_billable = is_billable
+    return toggl_data
+
+
+def _harvest_data(data):
+    if not isinstance(data, dict) or not data.keys() <= HARVEST_DATA_KEYS:
+        raise _NotFast()
+    harvest_data = models.HarvestData()
+    for key in ('project_id', 'task_id', 'time_entry_id'):
+        if key in data:
+            setattr(harvest_data, key, _int(data[key]))
+    if 'task_name' in data:
+        harvest_data.task_name = _str(data['task_name'])
+    if 'uploaded' in data:
+        try:
+            harvest_data.uploaded = UPLOADED_FIELD.deserialize(data['uploaded'])
+        except ValidationError:
+            raise _NotFast()
+    return harvest_data
+
+
+def _str(value):
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        raise _NotFast()
+    return str(value)
+
+
+def _int(value):
+    if value is None:
+        return None
+    if not isinstance(value, int) or value is True or value is False:
+        raise _NotFast()
+    return int(value)
+
+
+def _time_entries(entries):
+    if not isinstance(entries, list):
+        raise _NotFast()
+    time_entries = models.TimeEntries()
+    for entry in entries:
+        if not isinstance(entry, dict) or entry.keys() != TIME_ENTRY_KEYS:
+            raise _NotFast()
+        time_entries.append_epoch(*_epoch(entry['s']), *_epoch(entry['e']))
+    return time_entries
+
+
+def _epoch(value):
+    """Epoch microseconds and UTC offset seconds of a day file timestamp."""
+    match = DAY_FILE_DATETIME_RE.fullmatch(value) if isinstance(value, str) else None
+    if match is None:
+        raise _NotFast()
+    day, hour, minute, second, microsecond, utc, sign, offset_hours, offset_minutes = match.groups()
+    hour, minute, second = int(hour), int(minute), int(second)
+    if hour > 23 or minute > 59 or second > 59:
+        raise _NotFast()
+
+    offset = 0
+    if utc is None:
+        offset_hours, offset_minutes = int(offset_hours), int(offset_minutes)
+        if offset_hours > 23 or offset_minutes > 59:
+            raise _NotFast()
+        offset = (offset_hours * 60 + offset_minutes) * 60
+        if sign == '-':
+            offset = -offset
+
+    seconds = ((_epoch_day(day) * 24 + hour) * 60 + minute) * 60 + second - offset
+    return seconds * 1000000 + int(microsecond or 0), offset
+
+
+@lru_cache(maxsize=4096)
+def _epoch_day(day):
+    try:
+        return date(int(day[:4]), int(day[5:7]), int(day[8:])).toordinal() - EPOCH_ORDINAL
+    except ValueError:
+        raise _NotFast()
+
+
 class HarvestCacheTaskSchema(Schema):
     name = fields.Str(required=True)
     link_active = fields.Boolean(required=False, allow_none=True)
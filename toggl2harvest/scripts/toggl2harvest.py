@@ -6,9 +6,9 @@ from datetime import datetime
 import click
 from dateutil.parser import parse as parse_date
 
-from toggl2harvest.app import TogglHarvestApp
-from toggl2harvest.exceptions import InvalidFileError
-from toggl2harvest.utils import generate_selected_days
+from toggl2harvest.app import DAY_STORE_BACKENDS, HARVEST_CACHE_BACKENDS, TogglHarvestApp
+from toggl2harvest.exceptions import InvalidFileError, MissingHarvestCacheError
+from toggl2harvest.utils import DURABILITY_LEVELS, configure_logging, generate_selected_days
 
 
 log = logging.getLogger(__name__)
@@ -28,10 +28,24 @@ def parse_start_end(start, end):
 
 @click.group()
 @click.option('--config-dir', type=click.Path(), envvar='TOGGL2HARVEST_CONFIG')
+@click.option('--harvest-cache-backend', type=click.Choice(HARVEST_CACHE_BACKENDS), default='yaml',
+              envvar='TOGGL2HARVEST_HARVEST_CACHE_BACKEND', help='Storage for the Harvest project cache.')
+@click.option('--day-store', type=click.Choice(DAY_STORE_BACKENDS), default='yaml',
+              envvar='TOGGL2HARVEST_DAY_STORE', help='Storage for the downloaded time logs.')
+@click.option('--durability', type=click.Choice(DURABILITY_LEVELS), default='full',
+              envvar='TOGGL2HARVEST_DURABILITY',
+              help='fsync nothing, rewritten files, or rewritten files and their directory.')
+@click.option('--trace', is_flag=True, help='Log everything, including per entry diagnostics.')
 @click.version_option()
 @click.pass_context
-def cli(ctx, config_dir):
-    ctx.obj = TogglHarvestApp(config_dir=config_dir)
+def cli(ctx, config_dir, harvest_cache_backend, day_store, durability, trace):
+    configure_logging(trace=trace)
+    ctx.obj = TogglHarvestApp(
+        config_dir=config_dir,
+        harvest_cache_backend=harvest_cache_backend,
+        day_store_backend=day_store,
+        durability=durability,
+    )
 
 
 @cli.command()
@@ -41,88 +55,146 @@ def info(app):
 
 
 @cli.command()
+@click.option('--full', is_flag=True, help='Rebuild the whole cache instead of fetching changes.')
 @click.pass_obj
-def harvest_cache(app):
-    app.cache_harvest_projects()
+def harvest_cache(app, full):
+    app.cache_harvest_projects(full=full)
     click.echo('cached projects')
 
 
 @cli.command()
 @click.option('--start', default=f'{datetime.today():%Y-%m-%d}')
 @click.option('--end', default=f'{datetime.today():%Y-%m-%d}')
+@click.option('--merge', is_flag=True, help='Add new Toggl entries to days that already exist.')
 @click.pass_obj
-def download_toggl_data(app, start, end):
+def download_toggl_data(app, start, end, merge):
     start_date, end_date = parse_start_end(start, end)
-    _download_toggl_data(app, start_date, end_date)
+    _download_toggl_data(app, start_date, end_date, merge=merge)
 
 
-def _download_toggl_data(app, start_date, end_date):
+def _download_toggl_data(app, start_date, end_date, merge=False):
     time_entries = app.download_toggl_data(start_date, end_date)
-    for result in app.write_time_entries(time_entries):
-        if not result.written:
+    for result in app.write_time_entries(time_entries, merge=merge):
+        if result.written:
+            continue
+        if merge:
+            click.echo(f'{result.day} has no new entries, unchanged.')
+        else:
             click.echo(f'{result.day} already exists, skipped.')
 
 
 @cli.command()
 @click.option('--start', default=f'{datetime.today():%Y-%m-%d}')
 @click.option('--end', default=f'{datetime.today():%Y-%m-%d}')
+@click.option('--jobs', default=1, type=click.IntRange(min=1), help='Number of days validated in parallel.')
 @click.pass_obj
-def validate_time_logs(app, start, end):
+def validate_time_logs(app, start, end, jobs):
     start_date, end_date = parse_start_end(start, end)
     selected_days = generate_selected_days(start_date, end_date)
 
-    _validate_time_logs(app, selected_days)
-
+    _validate_time_logs(app, selected_days, jobs=jobs)
 
-def _validate_time_logs(app, selected_days):
-    for day in selected_days:
-        day_file = app.data_file(day)
-
-        if not day_file.exists():
-            continue
 
-        # Run though and check file, re-edit until it's valid
-        file_valid = False
-        while not file_valid:
-            file_errors = app.validate_file(day_file)
-            file_valid = file_errors == 0
-            message = 'Is valid.' if file_valid else f'Has {file_errors} invalid entries.'
-            click.echo(f'{day} | {message}', nl=file_valid)
-            if not file_valid and click.confirm(' Edit file?'):
-                click.edit(filename=day_file)
+def _validate_time_logs(app, selected_days, jobs=1):
+    invalid_days = []
+    try:
+        for result in app.validate_days(selected_days, jobs=jobs):
+            click.echo(f'{result.day} | {_validation_message(result.errors)}')
+            if result.errors:
+                invalid_days.append(result.day)
+    except MissingHarvestCacheError as e:
+        raise click.ClickException(str(e))
+
+    # Re-edit each invalid day until it's valid or the user moves on
+    for day in invalid_days:
+        while click.confirm(f'{day} | Edit file?'):
+            _edit_day(app, day)
+            file_errors = app.validate_day(day)
+            click.echo(f'{day} | {_validation_message(file_errors)}')
+            if file_errors == 0:
+                break
+
+
+def _validation_message(file_errors):
+    return 'Is valid.' if file_errors == 0 else f'Has {file_errors} invalid entries.'
+
+
+def _edit_day(app, day):
+    if app.day_store_backend == 'yaml':
+        click.edit(filename=app.data_file(day))
+        return
+
+    edited = click.edit(app.day_store.export_day(day), extension='.yml')
+    if edited is not None:
+        try:
+            app.day_store.import_day(day, edited)
+        except InvalidFileError as e:
+            click.echo(f'{e}, the edit was not saved.')
 
 
 @cli.command()
 @click.option('--start', default=f'{datetime.today():%Y-%m-%d}')
 @click.option('--end', default=f'{datetime.today():%Y-%m-%d}')
+@click.option('--jobs', default=1, type=click.IntRange(min=1), help='Number of concurrent uploads.')
 @click.pass_obj
-def upload_to_harvest(app, start, end):
+def upload_to_harvest(app, start, end, jobs):
     start_date, end_date = parse_start_end(start, end)
     selected_days = generate_selected_days(start_date, end_date)
 
-    _upload_to_harvest(app, selected_days)
+    _upload_to_harvest(app, selected_days, jobs=jobs)
 
 
-def _upload_to_harvest(app, selected_days):
-    for day in selected_days:
-        try:
-            messages = app.upload_to_harvest(day)
-            for i, message in enumerate(messages):
-                click.echo(f'{day}#{i:02d}: {message}')
-        except InvalidFileError as e:
-            click.echo(f'{day}#{e.message}')
+def _upload_to_harvest(app, selected_days, jobs=1):
+    try:
+        for result in app.upload_days_to_harvest(selected_days, jobs=jobs):
+            if result.error is not None:
+                click.echo(f'{result.day}#{result.error}')
+            for i, message in enumerate(result.messages):
+                click.echo(f'{result.day}#{i:02d}: {message}')
+    except MissingHarvestCacheError as e:
+        raise click.ClickException(str(e))
 
 
 @cli.command()
 @click.option('--start', default=f'{datetime.today():%Y-%m-%d}')
 @click.option('--end', default=f'{datetime.today():%Y-%m-%d}')
+@click.option('--jobs', default=1, type=click.IntRange(min=1),
+              help='Number of days validated in parallel and concurrent uploads.')
+@click.option('--merge', is_flag=True, help='Add new Toggl entries to days that already exist.')
 @click.pass_obj
-def timesheet(app, start, end):
+def timesheet(app, start, end, jobs, merge):
     start_date, end_date = parse_start_end(start, end)
     selected_days = generate_selected_days(start_date, end_date)
 
-    _download_toggl_data(app, start_date, end_date)
-    _validate_time_logs(app, selected_days)
+    _download_toggl_data(app, start_date, end_date, merge=merge)
+    _validate_time_logs(app, selected_days, jobs=jobs)
 
     if click.confirm(f'Upload data for {start} though {end} to Harvest?'):
-        _upload_to_harvest(app, selected_days)
+        _upload_to_harvest(app, selected_days, jobs=jobs)
+
+
+@cli.command()
+@click.option('--start', default=f'{datetime.today():%Y-%m-%d}')
+@click.option('--end', default=f'{datetime.today():%Y-%m-%d}')
+@click.argument('directory', type=click.Path(exists=True, file_okay=False))
+@click.pass_obj
+def export_time_logs(app, start, end, directory):
+    """Write the stored days to DIRECTORY as YAML day files."""
+    start_date, end_date = parse_start_end(start, end)
+    for day in app.export_days(generate_selected_days(start_date, end_date), directory):
+        click.echo(f'{day} exported.')
+
+
+@cli.command()
+@click.option('--start', default=f'{datetime.today():%Y-%m-%d}')
+@click.option('--end', default=f'{datetime.today():%Y-%m-%d}')
+@click.argument('directory', type=click.Path(exists=True, file_okay=False))
+@click.pass_obj
+def import_time_logs(app, start, end, directory):
+    """Replace the stored days with the YAML day files in DIRECTORY."""
+    start_date, end_date = parse_start_end(start, end)
+    try:
+        for day in app.import_days(generate_selected_days(start_date, end_date), directory):
+            click.echo(f'{day} imported.')
+    except InvalidFileError as e:
+        raise click.ClickException(str(e))
@@ -0,0 +1,77 @@
+# Standard Library
+import hashlib
+import logging
+import os
+import pickle
+from collections import namedtuple
+
+
+log = logging.getLogger(__name__)
+
+# Bump whenever a snapshotted class changes shape, old snapshots are then ignored
+SNAPSHOT_VERSION = 1
+
+SourceSignature = namedtuple(
+    'SourceSignature',
+    ' '.join([
+        'mtime',
+        'size',
+        'sha256',
+    ])
+)
+
+
+def file_digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def source_signature(path):
+    """Signature of ``path``, taken before it is parsed so a concurrent edit can't be missed.
+
+    None when ``path`` can't be read, in which case no snapshot is written.
+    """
+    try:
+        stat = os.stat(path)
+        return SourceSignature(mtime=stat.st_mtime_ns, size=stat.st_size, sha256=file_digest(path))
+    except (OSError, TypeError, ValueError):
+        return None
+
+
+def load_snapshot(source, snapshot_file, kind):
+    """Data snapshotted from ``source``, or None when the snapshot is missing or stale."""
+    try:
+        with open(snapshot_file, 'rb') as f:
+            snapshot = pickle.load(f)
+        stat = os.stat(source)
+    except (OSError, TypeError, ValueError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+
+    if not isinstance(snapshot, dict) or snapshot.get('version') != (kind, SNAPSHOT_VERSION):
+        return None
+
+    signature = snapshot['signature']
+    if (signature.mtime, signature.size) != (stat.st_mtime_ns, stat.st_size):
+        # Touched or checked out again, the contents may still be the same
+        if signature.size != stat.st_size or signature.sha256 != file_digest(source):
+            return None
+
+    return snapshot['data']
+
+
+def write_snapshot(signature, snapshot_file, kind, data):
+    if signature is None:
+        return
+
+    tmp_file = str(snapshot_file) + '.tmp'
+    try:
+        with open(tmp_file, 'wb') as f:
+            pickle.dump({
+                'version': (kind, SNAPSHOT_VERSION),
+                'signature': signature,
+                'data': data,
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.rename(tmp_file, snapshot_file)
+    except OSError as e:
+        # Only a speed up, carry on with the YAML
+        log.debug('Unable to write snapshot %s: %s', snapshot_file, e)
@@ -0,0 +1,120 @@
+# Standard Library
+import logging
+import sqlite3
+import threading
+from functools import lru_cache
+
+
+log = logging.getLogger(__name__)
+
+DEFAULT_LRU_SIZE = 256
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    active INTEGER,
+    client_id INTEGER,
+    client_name TEXT,
+    code TEXT
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    project_id INTEGER NOT NULL,
+    task_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    link_active INTEGER,
+    PRIMARY KEY (project_id, task_id)
+);
+CREATE TABLE IF NOT EXISTS source (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    sha256 TEXT NOT NULL
+);
+"""
+
+
+class SqliteHarvestCache:
+    """HarvestCache answering lookups from a SQLite database instead of in-memory indexes.
+
+    Only the projects a run actually touches are read, through a small LRU in front of the
+    database, so memory and start up time don't grow with the size of the Harvest account.
+    """
+
+    def __init__(self, path, lru_size=DEFAULT_LRU_SIZE):
+        self.path = path
+        # Upload workers share the cache, the lock serializes their use of the connection
+        self.connection = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self.connection:
+            self.connection.executescript(SCHEMA)
+
+        self._project_tasks = lru_cache(maxsize=lru_size)(self._query_project_tasks)
+
+    def close(self):
+        self.connection.close()
+
+    def source_digest(self):
+        """Digest of the harvest_cache.yml the projects were populated from, None when never populated."""
+        with self._lock:
+            row = self.connection.execute('SELECT sha256 FROM source').fetchone()
+        return None if row is None else row[0]
+
+    def populate(self, harvest_cache, source_digest=None):
+        """Replace the cached projects with ``harvest_cache``, as built by cache_projects_via_api.
+
+        ``source_digest`` is the digest of the harvest_cache.yml holding the same projects.
+        """
+        with self._lock, self.connection:
+            self.connection.execute('DELETE FROM tasks')
+            self.connection.execute('DELETE FROM projects')
+            self.connection.execute('DELETE FROM source')
+            if source_digest is not None:
+                self.connection.execute('INSERT INTO source VALUES (1, ?)', (source_digest,))
+            for project in harvest_cache:
+                client = project.get('client') or {}
+                self.connection.execute(
+                    'INSERT INTO projects VALUES (?, ?, ?, ?, ?, ?)',
+                    (
+                        project['id'],
+                        project.get('name'),
+                        project.get('active'),
+                        client.get('id'),
+                        client.get('name'),
+                        project.get('code'),
+                    ))
+                self.connection.executemany(
+                    'INSERT INTO tasks VALUES (?, ?, ?, ?)',
+                    [
+                        (project['id'], task_id, task['name'], task.get('link_active'))
+                        for task_id, task in project['tasks'].items()
+                    ])
+        self._project_tasks.cache_clear()
+
+    def _query_project_tasks(self, proj_id):
+        with self._lock:
+            project = self.connection.execute(
+                'SELECT 1 FROM projects WHERE id = ?', (proj_id,)).fetchone()
+            if project is None:
+                return None
+            # In insertion order, so a repeated task name resolves like it does in HarvestCache
+            rows = self.connection.execute(
+                'SELECT name, task_id FROM tasks WHERE project_id = ? ORDER BY rowid', (proj_id,)).fetchall()
+        tasks_by_name = {name: task_id for name, task_id in rows}
+        return tasks_by_name, frozenset(task_id for _, task_id in rows)
+
+    def project_in_cache(self, proj_id):
+        try:
+            return self._project_tasks(proj_id)[0]
+        except TypeError:
+            return None
+
+    def get_task_id(self, proj_id, task_name):
+        try:
+            return self._project_tasks(proj_id)[0][task_name]
+        except (KeyError, TypeError):
+            return None
+
+    def task_in_project(self, proj_id, task_id):
+        try:
+            return task_id in self._project_tasks(proj_id)[1]
+        except TypeError:
+            return False
@@ -1,6 +1,8 @@
 # Standard Library
 import logging
-import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from math import ceil
 from pathlib import Path
 from pprint import pformat
 
@@ -8,11 +10,11 @@ from pprint import pformat
 import click
 import requests
 from requests.exceptions import HTTPError
-from ruamel.yaml import YAML
 
 from .models import TimeLog
+from .ratelimit import RateLimiter
 from .schemas import TimeLogSchema, TogglReportEntrySchema
-from .utils import iso_date
+from .utils import TRACE, fast_yaml, iso_date
 
 
 log = logging.getLogger(__name__)
@@ -20,6 +22,8 @@ log = logging.getLogger(__name__)
 TIME_API = 'https://www.toggl.com/api/v8'
 REPORTS_API = 'https://toggl.com/reports/api/v2'
 
+DEFAULT_MAX_WORKERS = 4
+
 
 class InvalidCredentialsError(Exception):
     pass
@@ -34,7 +38,7 @@ class TogglCredentials():
 
     @classmethod
     def read_from_file(cls, file_path):
-        with YAML() as yaml:
+        with fast_yaml() as yaml:
             credentials_dict = yaml.load(file_path)
 
         if not isinstance(credentials_dict, dict):
@@ -53,13 +57,18 @@ class TogglCredentials():
 
 
 class TogglSession():
-    def __init__(self, credentials, session=requests.Session()):
+    def __init__(self, credentials, session=requests.Session(), max_workers=DEFAULT_MAX_WORKERS, rate_limiter=None):
         session.auth = credentials.auth
         self.session = session
         self.workspace_id = credentials.workspace_id
         self.user_agent = credentials.user_agent
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter or RateLimiter.for_url(REPORTS_API)
 
     def retrieve_time_entries(self, start_date, end_date, params={}):
+        return list(self.iter_time_entries(start_date, end_date, params=params))
+
+    def iter_time_entries(self, start_date, end_date, params={}):
         url = f'{REPORTS_API}/details'
         params = {
             **params,
@@ -67,34 +76,44 @@ class TogglSession():
             'since': iso_date(start_date),
             'until': iso_date(end_date),
             'user_agent': self.user_agent,
-            'page': 1,
+            # Oldest first, so the entries can be grouped into days as they stream in
+            'order_field': 'date',
+            'order_desc': 'off',
         }
-        time_entries = []
-        first_call = True
         try:
-            while True:
-                r = self.session.get(url, params=params)
-                r.raise_for_status()
-                time_entries_r = r.json()
-                time_entries = time_entries + time_entries_r['data']
-
-                first_call = False  # Made the first api call
-
-                if len(time_entries) >= time_entries_r['total_count']:
-                    break
-                else:
-                    params['page'] += 1
-                    if not first_call:
-                        time.sleep(1)
+            first_page = self._retrieve_page(url, params, 1)
+            first_entries = first_page['data']
+            yield from first_entries
+
+            total_count = first_page['total_count']
+            per_page = first_page.get('per_page') or len(first_entries)
+            if len(first_entries) >= total_count or per_page == 0:
+                return
+
+            # The first page tells us how many pages remain, fetch them concurrently, only
+            # running ahead of the consumer by a page per worker
+            last_page = ceil(total_count / per_page)
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                pages = deque()
+                for page in range(2, last_page + 1):
+                    pages.append(executor.submit(self._retrieve_page, url, params, page))
+                    if len(pages) > self.max_workers:
+                        yield from pages.popleft().result()['data']
+                while pages:
+                    yield from pages.popleft().result()['data']
         except HTTPError as e:
             if e.response.status_code == 401:
                 raise InvalidCredentialsError()
             raise
-        return time_entries
+
+    def _retrieve_page(self, url, params, page):
+        r = self.rate_limiter.request(self.session.get, url, params={**params, 'page': page})
+        r.raise_for_status()
+        return r.json()
 
     def toggl_download_params(self, cred_file):
         try:
-            with YAML() as yaml:
+            with fast_yaml() as yaml:
                 creds = yaml.load(cred_file)
         except TypeError:
             return {}
@@ -111,37 +130,60 @@ class TogglSession():
         return params
 
     def create_time_entries(self, report_data):
-        schema = TogglReportEntrySchema(many=True)
-        report_entries = schema.load(report_data)
-        report_entries.sort(key=lambda x: x.start)
-
-        daily_time_entries = {}
-        for toggl_entry in report_entries:
-            start_date = toggl_entry.start.date()
-            while True:
-                try:
-                    days_entries = daily_time_entries[start_date]['entries']
-                    days_unqiue_map = daily_time_entries[start_date]['unique_map']
-                except KeyError:
-                    log.debug('create new day')
-                    daily_time_entries[start_date] = {
-                        'entries': [],
-                        'unique_map': {},
-                    }
-                    continue
-                break
-
-            toggl_key = toggl_entry.unique_key()
-
-            try:
-                log.debug(f'days_unqiue_map\n{pformat(days_unqiue_map)}')
-                time_log = days_unqiue_map[toggl_key]
-                time_log.add_to_time_entries(toggl_entry)
-            except KeyError as e:
-                log.debug(type(e))
-                log.debug('Creating a new entry')
-                time_log = TimeLog.build_from_toggl_entry(toggl_entry)
-                days_unqiue_map[toggl_key] = time_log
-                days_entries.append(time_log)
-
-        return {k: v['entries'] for k, v in daily_time_entries.items()}
+        """TimeLogs per day of a whole report, in any order."""
+        schema = TogglReportEntrySchema()
+        report_entries = sorted(
+            (schema.load(entry) for entry in report_data),
+            key=lambda x: x.start)
+        return dict(iter_days(report_entries))
+
+    def stream_time_entries(self, report_data):
+        """``(date, time_logs)`` per day of a report ordered by start, see iter_days."""
+        schema = TogglReportEntrySchema()
+        return iter_days(schema.load(entry) for entry in report_data)
+
+
+def iter_days(report_entries):
+    """Group TogglReportEntries ordered by start into ``(date, time_logs)`` per day.
+
+    Each day is yielded as soon as the entries move past it, so only one day is held at a time.
+    """
+    day = None
+    day_entries = []
+    for toggl_entry in report_entries:
+        start_date = toggl_entry.start.date()
+        if start_date != day:
+            if day is not None:
+                if start_date < day:
+                    raise ValueError(f'Toggl report is not ordered by start, {start_date} came after {day}')
+                yield day, group_day(day_entries)
+            day = start_date
+            day_entries = []
+        day_entries.append(toggl_entry)
+
+    if day is not None:
+        yield day, group_day(day_entries)
+
+
+def group_day(report_entries):
+    """TimeLogs of one day's TogglReportEntries, collapsing the entries with the same unique_key."""
+    log.debug('Grouping %d entries into a new day', len(report_entries))
+    # Checked once, pretty printing the map per entry is quadratic in the size of the day
+    trace = log.isEnabledFor(TRACE)
+    days_entries = []
+    days_unqiue_map = {}
+    for toggl_entry in sorted(report_entries, key=lambda x: x.start):
+        toggl_key = toggl_entry.unique_key()
+        if trace:
+            log.log(TRACE, 'days_unqiue_map\n%s', pformat(days_unqiue_map))
+
+        time_log = days_unqiue_map.get(toggl_key)
+        if time_log is not None:
+            time_log.add_to_time_entries(toggl_entry)
+        else:
+            log.log(TRACE, 'Creating a new entry for %s', toggl_key)
+            time_log = TimeLog.build_from_toggl_entry(toggl_entry)
+            days_unqiue_map[toggl_key] = time_log
+            days_entries.append(time_log)
+
+    return days_entries
@@ -1,6 +1,8 @@
 # Standard Library
+import io
 import logging
 import os
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -11,6 +13,18 @@ from ruamel.yaml import YAML
 
 log = logging.getLogger(__name__)
 
+# Below DEBUG, for diagnostics written per report entry
+TRACE = 5
+logging.addLevelName(TRACE, 'TRACE')
+
+
+def configure_logging(trace=False):
+    """Log to stderr, down to TRACE when ``trace`` is set."""
+    logging.basicConfig(
+        level=TRACE if trace else logging.WARNING,
+        format='%(asctime)s %(levelname)s %(name)s: %(message)s',
+    )
+
 
 def iso_date(time_value):
     return time_value.strftime('%Y-%m-%d')
@@ -68,6 +82,15 @@ def generate_selected_days(start, end):
     return selected_days
 
 
+def fast_yaml():
+    """YAML for read only passes, backed by libyaml when ruamel.yaml.clib is installed.
+
+    Comments and formatting are not kept, so use the default round trip YAML() wherever
+    the file is written back.
+    """
+    return YAML(typ='safe')
+
+
 def operate_on_day_data(input, output, operate, **kwargs):
     ctx = {}
     with YAML(output=output) as yaml:
@@ -77,34 +100,114 @@ def operate_on_day_data(input, output, operate, **kwargs):
     return ctx
 
 
+DURABILITY_LEVELS = ('none', 'file', 'full')
+
+
+def fsync_directory(directory):
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class FsyncBatch():
+    """Group commit for AtomicFileUpdates.
+
+    Committed files are renamed into place when the batch ends, after one fsync per file,
+    followed by one fsync per directory.
+    """
+
+    def __init__(self, durability='full'):
+        self.durability = durability
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.flush()
+
+    def add(self, tmp_filename, filename):
+        with self._lock:
+            self._pending[str(filename)] = tmp_filename
+
+    def is_pending(self, filename):
+        with self._lock:
+            return str(filename) in self._pending
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        if self.durability != 'none':
+            for tmp_filename in pending.values():
+                with open(tmp_filename, 'r') as f:
+                    os.fsync(f.fileno())
+        for filename, tmp_filename in pending.items():
+            os.rename(tmp_filename, filename)
+        if self.durability == 'full':
+            for directory in {os.path.dirname(os.path.abspath(filename)) for filename in pending}:
+                fsync_directory(directory)
+
+
 class AtomicFileUpdate():
+    """Rewrite a file by renaming a temporary copy over it on commit.
+
+    Output identical to the input leaves the file untouched. ``durability`` is 'none' for no
+    fsync, 'file' to fsync the new contents before the rename or 'full' to also fsync the
+    directory after it. With a ``batch`` the fsyncs and rename wait for the batch to end.
+    A missing file starts out empty and is created on commit.
+    """
 
-    def __init__(self, filename):
+    def __init__(self, filename, durability='full', batch=None):
         self.filename = filename
+        self.durability = durability
+        self.batch = batch
         self._commit = False
 
     def __enter__(self):
-        self.input = open(self.filename, 'r')
+        if self.batch is not None and self.batch.is_pending(self.filename):
+            # Read what the batch is about to write, not what it's replacing
+            self.batch.flush()
+
+        try:
+            with open(self.filename, 'r') as f:
+                self._original = f.read()
+        except FileNotFoundError:
+            self._original = None
+        self.input = io.StringIO(self._original or '')
+        self.output = io.StringIO()
         if isinstance(self.filename, Path):
             self.tmp_filename = Path(
                 self.filename.parent,
                 self.filename.name + '.tmp')
         else:
             self.tmp_filename = self.filename + '.tmp'
-        self.output = open(self.tmp_filename, 'w')
         return self
 
     def __exit__(self, *args):
-        self.input.close()
-
-        self.output.flush()
-        os.fsync(self.output.fileno())
-        self.output.close()
-
-        if self._commit:
-            os.rename(self.tmp_filename, self.filename)
-        else:
-            os.remove(self.tmp_filename)
+        if not self._commit:
+            return
+
+        contents = self.output.getvalue()
+        if contents == self._original:
+            return  # Nothing changed, skip the write and its fsyncs
+
+        with open(self.tmp_filename, 'w') as f:
+            f.write(contents)
+            if self.batch is None and self.durability != 'none':
+                f.flush()
+                os.fsync(f.fileno())
+
+        if self.batch is not None:
+            self.batch.add(self.tmp_filename, self.filename)
+            return
+
+        os.rename(self.tmp_filename, self.filename)
+        if self.durability == 'full':
+            fsync_directory(os.path.dirname(os.path.abspath(self.filename)))
 
     def commit(self):
         self._commit = True